@@ -0,0 +1,148 @@
+"""Benchmark of the ratio and throughput of the payload compression codecs.
+
+Uses a generated sphere mesh as ASCII and binary STL, a slicer config and a console log,
+or the given files instead:
+
+    python benchmarks/compression.py [--stl PATH] [--config PATH] [--repeat N]
+"""
+import argparse
+import math
+import pathlib
+import random
+import struct
+import sys
+import time
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from packages import (  # noqa: E402
+    CompressedPackage, ConsolePackage, get_package, LZMA, SlicerConfigFilePackage, STLPackage, ZLIB
+)
+
+CODECS = [("zlib", ZLIB, 1), ("zlib", ZLIB, 6), ("zlib", ZLIB, 9), ("lzma", LZMA, 0), ("lzma", LZMA, 6)]
+
+
+def sphere(rings: int = 120, segments: int = 240) -> list[tuple[tuple[float, float, float], ...]]:
+    """Returns the facets of a UV sphere with a radius of 25 mm as normal and three vertices.
+
+    The vertices are jittered slightly, like those of a scanned or exported mesh.
+    """
+    jitter = random.Random(0)
+    points = {}
+
+    def point(ring: int, segment: int) -> tuple[float, float, float]:
+        if (ring, segment % segments) not in points:
+            theta = math.pi * ring / rings
+            phi = 2 * math.pi * segment / segments
+            radius = 25 + jitter.uniform(-0.01, 0.01)
+            points[ring, segment % segments] = (
+                radius * math.sin(theta) * math.cos(phi),
+                radius * math.sin(theta) * math.sin(phi),
+                radius * math.cos(theta)
+            )
+
+        return points[ring, segment % segments]
+
+    facets = []
+    for ring in range(rings):
+        for segment in range(segments):
+            corners = (point(ring, segment), point(ring + 1, segment), point(ring + 1, segment + 1),
+                       point(ring, segment + 1))
+
+            for first, second, third in ((corners[0], corners[1], corners[2]), (corners[0], corners[2], corners[3])):
+                center = [sum(axis) / 3 for axis in zip(first, second, third)]
+                length = math.hypot(*center) or 1.0
+                facets.append((tuple(axis / length for axis in center), first, second, third))
+
+    return facets
+
+
+def ascii_stl(facets) -> bytes:
+    """Formats facets as an ASCII STL file."""
+    lines = ["solid sphere"]
+    for normal, *vertices in facets:
+        lines += ["  facet normal {:e} {:e} {:e}".format(*normal), "    outer loop"]
+        lines += [f"      vertex {x:e} {y:e} {z:e}" for x, y, z in vertices]
+        lines += ["    endloop", "  endfacet"]
+    lines.append("endsolid sphere")
+
+    return "\n".join(lines).encode("ascii")
+
+
+def binary_stl(facets) -> bytes:
+    """Formats facets as a binary STL file."""
+    facet = struct.Struct("<12fH")
+
+    return b"\0" * 80 + struct.pack("<I", len(facets)) + b"".join(
+        facet.pack(*normal, *first, *second, *third, 0) for normal, first, second, third in facets
+    )
+
+
+def slicer_config() -> str:
+    """Returns a slicer config with the size and shape of a typical slicer_config.ini."""
+    sections = []
+    for section in ("print", "filament", "printer", "support", "infill", "speed", "cooling", "retraction"):
+        options = [f"{section}_option_{index} = {index * 0.05:.2f}" for index in range(60)]
+        options += [f"{section}_gcode_{index} = G1 X{index} Y{index} F1500\\nM400" for index in range(20)]
+        sections.append(f"[{section}]\n" + "\n".join(options))
+
+    return "\n\n".join(sections) + "\n"
+
+
+def console_log() -> str:
+    """Returns a burst of console output of a running print."""
+    return "".join(
+        f"[{index * 0.02:10.2f}] G1 X{10 + index % 50:.3f} Y{20 + index % 70:.3f} Z0.200 "
+        f"E{index * 0.0123:.5f} F1500 ok\n"
+        for index in range(20000)
+    )
+
+
+def measure(package, codec: int, level: int, repeat: int) -> tuple[float, float, float]:
+    """Returns the ratio and the compress and decompress throughput in MB/s of the best run."""
+    size = sum(memoryview(buffer).nbytes for buffer in package.to_buffers())
+    compress_time = decompress_time = math.inf
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = CompressedPackage(package, codec, level).to_bytes()
+        compress_time = min(compress_time, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        get_package(data)
+        decompress_time = min(decompress_time, time.perf_counter() - start)
+
+    return size / len(data), size / compress_time / 1e6, size / decompress_time / 1e6
+
+
+def main():
+    """Prints the ratio and throughput of every codec for every sample."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stl", type=pathlib.Path, help="an STL file to use instead of the generated ones")
+    parser.add_argument("--config", type=pathlib.Path, help="a slicer_config.ini to use instead of the generated one")
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    if arguments.stl:
+        samples = {arguments.stl.name: STLPackage(stl=arguments.stl.read_bytes())}
+    else:
+        facets = sphere()
+        samples = {"ascii stl": STLPackage(stl=ascii_stl(facets)), "binary stl": STLPackage(stl=binary_stl(facets))}
+
+    config = arguments.config.read_text("utf-8") if arguments.config else slicer_config()
+    samples["slicer config"] = SlicerConfigFilePackage(config_content=config)
+    samples["console log"] = ConsolePackage(console_msg=console_log())
+
+    print(f"{'sample':16} {'size':>10} {'codec':>8} {'ratio':>7} {'compress MB/s':>14} {'decompress MB/s':>16}")
+    for name, package in samples.items():
+        size = sum(memoryview(buffer).nbytes for buffer in package.to_buffers())
+
+        for codec_name, codec, level in CODECS:
+            ratio, compress_speed, decompress_speed = measure(package, codec, level, arguments.repeat)
+            print(f"{name:16} {size:>10} {f'{codec_name}-{level}':>8} {ratio:>7.2f} "
+                  f"{compress_speed:>14.1f} {decompress_speed:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
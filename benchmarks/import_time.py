@@ -0,0 +1,79 @@
+"""Import-time benchmark of ``import packages`` and of the first use of lazily imported names.
+
+Every statement runs in a fresh interpreter, which times the whole statement, including
+the modules the registry imports on demand. Compares the working tree against the
+``packages`` directory of a git revision, by default the root commit. With --max-ms it
+exits with status 1 when import packages is slower in the working tree, so it can guard
+against regressions in CI:
+
+    python benchmarks/import_time.py [--baseline REV] [--repeat N] [--max-ms MS]
+"""
+import argparse
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+from package_codecs import export_revision, ROOT
+
+# Runs a statement in the child interpreter and prints how long it took in nanoseconds
+TIMER = "import time\nstart = time.perf_counter_ns()\nexec({statement!r})\nprint(time.perf_counter_ns() - start)"
+
+
+def import_time(directory: pathlib.Path, statement: str, repeat: int) -> float:
+    """Returns the best time of a statement in a fresh interpreter in milliseconds.
+
+    :param directory: The directory that contains the packages directory.
+    :param statement: The statement to run, it must import packages.
+    :param repeat: The number of fresh interpreters to measure.
+    """
+    best = float("inf")
+
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            cwd=directory, check=True, capture_output=True, text=True
+        ).stdout
+
+        best = min(best, int(output.split()[-1]) / 1e6)
+
+    return best
+
+
+def main():
+    """Prints the import times of the baseline and the working tree."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", help="git revision to compare against (default: root commit)")
+    parser.add_argument("--repeat", type=int, default=20, help="interpreters started per measurement")
+    parser.add_argument("--max-ms", type=float, help="fail when import packages takes longer in the working tree")
+    arguments = parser.parse_args()
+
+    baseline_revision = arguments.baseline or subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout.split()[0]
+
+    statements = {
+        "import packages": "import packages",
+        "one package type": "import packages; packages.TemperaturePackage",
+        "decode one frame": "import packages; packages.get_package(b'\\0\\0\\0\\x11\\x01' + bytes(12))",
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = export_revision(baseline_revision, pathlib.Path(directory)).parent
+
+        print(f"{'statement':<20}{'baseline ms':>12}{'current ms':>12}")
+        for name, statement in statements.items():
+            old = import_time(baseline, statement, arguments.repeat)
+            new = import_time(ROOT, statement, arguments.repeat)
+            print(f"{name:<20}{old:>12.2f}{new:>12.2f}")
+
+            if name == "import packages":
+                current = new
+
+    if arguments.max_ms is not None and current > arguments.max_ms:
+        print(f"import packages took {current:.2f} ms, more than the allowed {arguments.max_ms:.2f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
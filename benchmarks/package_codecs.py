@@ -0,0 +1,119 @@
+"""Microbenchmark for the encode and decode paths of every package type.
+
+Compares the working tree against the ``packages`` directory of a git revision,
+by default the root commit:
+
+    python benchmarks/package_codecs.py [--baseline REV] [--number N] [--repeat N]
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import pathlib
+import subprocess
+import sys
+import tarfile
+import tempfile
+import timeit
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+SAMPLES = {
+    "TemperaturePackage": {"timestamp": 1762330645, "temperature": 43.8},
+    "ProgressPackage": {"timestamp": 1762330645, "progress": 43.8},
+    "RollPackage": {"timestamp": 1762330645, "degrees": -90},
+    "ConfirmationPackage": {"timestamp": 1762330645, "confirmed_request_id": 8, "confirmed_request_timestamp": 1},
+    "RequestRobotListPackage": {"timestamp": 1762330645},
+    "ButtonPackage": {"timestamp": 1762330645, "button_name": "emergency_stop"},
+    "SelectedRobotPackage": {"timestamp": 1762330645, "model_brand": "Meca500 Mecademic"},
+    "ConsolePackage": {"timestamp": 1762330645, "console_msg": "G1 X10 Y10 Z0.2 F1500"},
+    "STLPackage": {"timestamp": 1762330645, "stl": bytes(4096)},
+    "SlicerConfigFilePackage": {"timestamp": 1762330645, "config_content": "[print]\nlayer_height = 0.2\n" * 32},
+    "SlicerSettingPackage": {"timestamp": 1762330645, "action": "set", "key": "layer_height", "value": "0.2"},
+    "ConfigPackage": {"timestamp": 1762330645, "section": "server", "option": "host", "value": "127.0.0.1"},
+    "RobotDataPackage": {
+        "timestamp": 1762330645, "model": "Meca500", "brand": "Mecademic", "material": "PLA",
+        "axis": 6, "reach": 330, "payload": 1, "weight": 5, "accuracy": 0.01
+    },
+}
+
+
+def load_packages(name: str, path: pathlib.Path):
+    """Imports the packages directory at the given path under another module name."""
+    spec = importlib.util.spec_from_file_location(name, path / "__init__.py", submodule_search_locations=[str(path)])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def export_revision(revision: str, destination: pathlib.Path) -> pathlib.Path:
+    """Extracts the packages directory of a git revision and returns its path."""
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", revision, "packages"],
+        cwd=ROOT, check=True, capture_output=True
+    ).stdout
+
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(destination, filter="data")
+
+    return destination / "packages"
+
+
+def measure(modules: list, name: str, number: int, repeat: int) -> list[tuple[float, float]]:
+    """Returns the to_bytes and get_package time per call in microseconds for each module.
+
+    The modules are timed in an interleaved order and the best run is kept, so that
+    background noise affects every implementation equally. Output of the packages, such
+    as the debug print in the decoder of the original ConfigPackage, is discarded.
+    """
+    calls = []
+    for module in modules:
+        package_type = getattr(module, name)
+        package = package_type(**SAMPLES[name])
+        data = package.to_bytes()
+        calls.append((package.to_bytes, lambda get_package=module.get_package, data=data: get_package(data)))
+
+    best = [[float("inf"), float("inf")] for _ in modules]
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            for timings, (encode, decode) in zip(best, calls):
+                timings[0] = min(timings[0], timeit.timeit(encode, number=number))
+                timings[1] = min(timings[1], timeit.timeit(decode, number=number))
+
+    return [(encode / number * 1e6, decode / number * 1e6) for encode, decode in best]
+
+
+def main():
+    """Runs the benchmark and prints a table per package type."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", help="git revision to compare against (default: root commit)")
+    parser.add_argument("--number", type=int, default=5000, help="calls per timing run")
+    parser.add_argument("--repeat", type=int, default=20, help="timing runs per implementation")
+    arguments = parser.parse_args()
+
+    baseline_revision = arguments.baseline or subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"], cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout.split()[0]
+
+    with tempfile.TemporaryDirectory() as directory:
+        baseline = load_packages("baseline_packages", export_revision(baseline_revision, pathlib.Path(directory)))
+        current = load_packages("current_packages", ROOT / "packages")
+
+        print(f"{'package':<26}{'encode us':>22}{'speedup':>9}{'decode us':>22}{'speedup':>9}")
+        for name in SAMPLES:
+            (old_encode, old_decode), (new_encode, new_decode) = measure(
+                [baseline, current], name, arguments.number, arguments.repeat
+            )
+
+            print(
+                f"{name:<26}"
+                f"{old_encode:>10.3f} -> {new_encode:<8.3f}{old_encode / new_encode:>8.2f}x"
+                f"{old_decode:>10.3f} -> {new_decode:<8.3f}{old_decode / new_decode:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
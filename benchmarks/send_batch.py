@@ -0,0 +1,86 @@
+"""Benchmark of sending batches of small packages over a socket pair.
+
+Compares joining the to_bytes of every package before sendall with a PackageWriter that
+packs the batch into its reused buffer, by time and by the peak memory allocated per batch:
+
+    python benchmarks/send_batch.py [--batch N] [--repeat N]
+"""
+import argparse
+import pathlib
+import socket
+import sys
+import threading
+import time
+import tracemalloc
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from packages import PackageWriter, RollPackage, TemperaturePackage  # noqa: E402
+
+
+def drain(sock: socket.socket):
+    """Reads from a socket into one buffer until the peer closes it, so reading does not allocate."""
+    buffer = bytearray(1 << 20)
+
+    while sock.recv_into(buffer):
+        pass
+
+
+def send_joined(sock: socket.socket, packages: list):
+    """Sends a batch the way a sender without a writer does."""
+    sock.sendall(b"".join(package.to_bytes() for package in packages))
+
+
+def send_writer(sock: socket.socket, packages: list, writer: PackageWriter):
+    """Sends a batch through a reused writer."""
+    writer.add_many(packages)
+    writer.send(sock)
+
+
+def measure(send, packages: list, repeat: int) -> tuple[float, float]:
+    """Returns the time per package in microseconds and the peak allocated bytes per batch."""
+    sender, receiver = socket.socketpair()
+    reader = threading.Thread(target=drain, args=(receiver,))
+    reader.start()
+
+    with sender:
+        send(sender, packages)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            send(sender, packages)
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        send(sender, packages)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    reader.join()
+    receiver.close()
+
+    return elapsed / repeat / len(packages) * 1e6, peak
+
+
+def main():
+    """Prints the time and allocations of both ways of sending."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=10000, help="packages per batch")
+    parser.add_argument("--repeat", type=int, default=50, help="batches per timing run")
+    arguments = parser.parse_args()
+
+    packages = [
+        RollPackage(1762330645, index % 360) if index % 2 else TemperaturePackage(1762330645, 20 + index / 100)
+        for index in range(arguments.batch)
+    ]
+    writer = PackageWriter()
+
+    print(f"{'method':<12}{'us/package':>12}{'peak bytes':>14}")
+    for name, send in (("joined", send_joined), ("writer", lambda sock, batch: send_writer(sock, batch, writer))):
+        per_package, peak = measure(send, packages, arguments.repeat)
+        print(f"{name:<12}{per_package:>12.3f}{peak:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,45 +1,187 @@
-from .button_package import ButtonPackage
-from .config_package import ConfigPackage
-from .confirmation_package import ConfirmationPackage
-from .console_package import ConsolePackage
-from .package import Package
-from .progress_package import ProgressPackage
-from .request_robot_list_package import RequestRobotListPackage
-from .robot_data_package import RobotDataPackage
-from .roll_package import RollPackage
-from .selected_robot_package import SelectedRobotPackage
-from .slicer_config_file_package import SlicerConfigFilePackage
-from .slicer_setting_package import SlicerSettingPackage
-from .stl_package import STLPackage
-from .temperature_package import TemperaturePackage
-
-PACKAGES = {
-    TemperaturePackage().identifier: TemperaturePackage,
-    ProgressPackage().identifier: ProgressPackage,
-    STLPackage().identifier: STLPackage,
-    ConfigPackage().identifier: ConfigPackage,
-    RobotDataPackage().identifier: RobotDataPackage,
-    SelectedRobotPackage().identifier: SelectedRobotPackage,
-    RequestRobotListPackage().identifier: RequestRobotListPackage,
-    ConfirmationPackage().identifier: ConfirmationPackage,
-    ButtonPackage().identifier: ButtonPackage,
-    RollPackage().identifier: RollPackage,
-    ConsolePackage().identifier: ConsolePackage,
-    SlicerConfigFilePackage().identifier: SlicerConfigFilePackage,
-    SlicerSettingPackage().identifier: SlicerSettingPackage
+"""Packages of the robot control protocol.
+
+The package classes and helpers are imported on first access, so ``import packages`` stays
+cheap for tools that only need a few of them. Decoding imports package modules on demand.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+from .package import FrozenPackage, Package, set_clock
+from .registry import get_identifier, get_package, load_packages, PACKAGES, register_package
+
+if TYPE_CHECKING:
+    from .broadcast import BroadcastHub
+    from .button_package import ButtonPackage
+    from .coalescing import CoalescingQueue
+    from .codec import Codec
+    from .compressed_package import compress, CompressedPackage, LZMA, ZLIB
+    from .config_package import ConfigPackage
+    from .config_store import ConfigSnapshot, ConfigStore
+    from .confirmation_package import ConfirmationPackage
+    from .console_package import ConsolePackage
+    from .fragment_package import FragmentPackage
+    from .frame_decoder import PackageFrameDecoder
+    from .handshake_package import HandshakePackage
+    from .latency import LatencyTracker
+    from .package_stream import PackageStream, PackageStreamPool
+    from .pool import PackagePool
+    from .progress_package import ProgressPackage
+    from .request_robot_list_package import RequestRobotListPackage
+    from .robot_data_package import RobotDataPackage
+    from .robot_list_package import RobotListPackage
+    from .roll_package import RollPackage
+    from .scheduler import FragmentReassembler, SendScheduler
+    from .selected_robot_package import SelectedRobotPackage
+    from .sequenced_confirmation_package import SequencedConfirmationPackage
+    from .slicer_config_delta_package import SlicerConfigDeltaPackage
+    from .slicer_config_file_package import SlicerConfigFilePackage
+    from .slicer_config_sync import SlicerConfigReceiver, SlicerConfigSender
+    from .slicer_setting_batch_package import SlicerSettingBatchPackage
+    from .slicer_setting_package import SlicerSettingPackage
+    from .stl_chunk_ack_package import STLChunkAckPackage
+    from .stl_chunk_package import STLChunkPackage
+    from .stl_offer_package import STLOfferPackage
+    from .stl_offer_reply_package import STLOfferReplyPackage
+    from .stl_package import STLPackage
+    from .stl_store import send_stl, STLStore
+    from .stl_transfer import STLTransferReceiver, STLTransferSender
+    from .temperature_package import TemperaturePackage
+    from .traced_package import TracedPackage
+    from .transport import PackageWriter, send_buffers, send_package
+    from .window import send_windowed, WindowReceiver, WindowSender
+
+# The module of every lazily imported name
+_LAZY = {
+    "BroadcastHub": "broadcast",
+    "ButtonPackage": "button_package",
+    "CoalescingQueue": "coalescing",
+    "Codec": "codec",
+    "compress": "compressed_package",
+    "CompressedPackage": "compressed_package",
+    "LZMA": "compressed_package",
+    "ZLIB": "compressed_package",
+    "ConfigPackage": "config_package",
+    "ConfigSnapshot": "config_store",
+    "ConfigStore": "config_store",
+    "ConfirmationPackage": "confirmation_package",
+    "ConsolePackage": "console_package",
+    "FragmentPackage": "fragment_package",
+    "PackageFrameDecoder": "frame_decoder",
+    "HandshakePackage": "handshake_package",
+    "LatencyTracker": "latency",
+    "PackageStream": "package_stream",
+    "PackageStreamPool": "package_stream",
+    "PackagePool": "pool",
+    "ProgressPackage": "progress_package",
+    "RequestRobotListPackage": "request_robot_list_package",
+    "RobotDataPackage": "robot_data_package",
+    "RobotListPackage": "robot_list_package",
+    "RollPackage": "roll_package",
+    "FragmentReassembler": "scheduler",
+    "SendScheduler": "scheduler",
+    "SelectedRobotPackage": "selected_robot_package",
+    "SequencedConfirmationPackage": "sequenced_confirmation_package",
+    "SlicerConfigDeltaPackage": "slicer_config_delta_package",
+    "SlicerConfigFilePackage": "slicer_config_file_package",
+    "SlicerConfigReceiver": "slicer_config_sync",
+    "SlicerConfigSender": "slicer_config_sync",
+    "SlicerSettingBatchPackage": "slicer_setting_batch_package",
+    "SlicerSettingPackage": "slicer_setting_package",
+    "STLChunkAckPackage": "stl_chunk_ack_package",
+    "STLChunkPackage": "stl_chunk_package",
+    "STLOfferPackage": "stl_offer_package",
+    "STLOfferReplyPackage": "stl_offer_reply_package",
+    "STLPackage": "stl_package",
+    "send_stl": "stl_store",
+    "STLStore": "stl_store",
+    "STLTransferReceiver": "stl_transfer",
+    "STLTransferSender": "stl_transfer",
+    "TemperaturePackage": "temperature_package",
+    "TracedPackage": "traced_package",
+    "PackageWriter": "transport",
+    "send_buffers": "transport",
+    "send_package": "transport",
+    "send_windowed": "window",
+    "WindowReceiver": "window",
+    "WindowSender": "window",
 }
 
+__all__ = [
+    "BroadcastHub",
+    "ButtonPackage",
+    "CoalescingQueue",
+    "Codec",
+    "CompressedPackage",
+    "ConfigPackage",
+    "ConfigSnapshot",
+    "ConfigStore",
+    "ConfirmationPackage",
+    "ConsolePackage",
+    "FragmentPackage",
+    "FragmentReassembler",
+    "FrozenPackage",
+    "HandshakePackage",
+    "LatencyTracker",
+    "LZMA",
+    "Package",
+    "PackageFrameDecoder",
+    "PackagePool",
+    "PACKAGES",
+    "PackageStream",
+    "PackageStreamPool",
+    "PackageWriter",
+    "ProgressPackage",
+    "RequestRobotListPackage",
+    "RobotDataPackage",
+    "RobotListPackage",
+    "RollPackage",
+    "SelectedRobotPackage",
+    "SendScheduler",
+    "SequencedConfirmationPackage",
+    "SlicerConfigDeltaPackage",
+    "SlicerConfigFilePackage",
+    "SlicerConfigReceiver",
+    "SlicerConfigSender",
+    "SlicerSettingBatchPackage",
+    "SlicerSettingPackage",
+    "STLChunkAckPackage",
+    "STLChunkPackage",
+    "STLOfferPackage",
+    "STLOfferReplyPackage",
+    "STLPackage",
+    "STLStore",
+    "STLTransferReceiver",
+    "STLTransferSender",
+    "TemperaturePackage",
+    "TracedPackage",
+    "WindowReceiver",
+    "WindowSender",
+    "ZLIB",
+    "compress",
+    "get_identifier",
+    "get_package",
+    "load_packages",
+    "register_package",
+    "send_buffers",
+    "send_package",
+    "send_stl",
+    "send_windowed",
+    "set_clock",
+]
+
+
+def __getattr__(name: str):
+    """Imports a package class or helper on first access."""
+    module = _LAZY.get(name)
 
-def get_package(data: bytes) -> Package:
-    """Finds the correct package from the bytes object and returns it."""
-    identifier = data[4]
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-    if identifier not in PACKAGES.keys():
-        raise ValueError(f"No package found for data with identifier {identifier}")
+    value = globals()[name] = getattr(importlib.import_module(f".{module}", __name__), name)
 
-    return PACKAGES[identifier]().to_package(data)
+    return value
 
 
-def get_identifier(package_type: type[Package]) -> int:
-    """Finds the correct package identifier and returns it."""
-    return package_type().identifier
+def __dir__() -> list[str]:
+    """Lists the public names including the ones that are not imported yet."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,84 @@
+from typing import Mapping
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("packages.batch requires numpy, install it with 'pip install numpy'") from error
+
+from .confirmation_package import ConfirmationPackage
+from .package import Package
+from .progress_package import ProgressPackage
+from .roll_package import RollPackage
+from .temperature_package import TemperaturePackage
+
+# Big-endian numpy types for the struct format characters of fixed-size packages
+_TYPES = {"B": "u1", "I": ">u4", "L": ">u4", "l": ">i4", "f": ">f4", "d": ">f8"}
+
+# The field names of every fixed-size package, in the order of its struct format
+FIELDS = {
+    TemperaturePackage: ("size", "identifier", "timestamp", "temperature"),
+    ProgressPackage: ("size", "identifier", "timestamp", "progress"),
+    RollPackage: ("size", "identifier", "timestamp", "degrees"),
+    ConfirmationPackage: (
+        "size", "identifier", "timestamp", "confirmed_request_id", "confirmed_request_timestamp"
+    ),
+}
+
+_dtypes: dict[type[Package], np.dtype] = {}
+
+
+def dtype(package_type: type[Package]) -> np.dtype:
+    """Returns the packed, big-endian structured dtype of a fixed-size package type.
+
+    :param package_type: One of the package types in FIELDS.
+    :return: The dtype of a single frame.
+    """
+    if package_type not in _dtypes:
+        if package_type not in FIELDS:
+            raise ValueError(f"{package_type.__name__} does not have a fixed size")
+
+        struct_format = package_type.format.lstrip("!")
+        _dtypes[package_type] = np.dtype([
+            (name, _TYPES[character]) for name, character in zip(FIELDS[package_type], struct_format, strict=True)
+        ])
+
+    return _dtypes[package_type]
+
+
+def decode_many(package_type: type[Package], data: bytes | bytearray | memoryview) -> np.ndarray:
+    """Decodes a buffer of consecutive frames of one package type into a structured array.
+
+    The array is a view of data, so no values are copied.
+
+    :param package_type: The type of every frame in data.
+    :param data: The frames, for example the output of encode_many.
+    :return: A structured array with one record per frame.
+    """
+    frame_dtype = dtype(package_type)
+    frames = np.frombuffer(data, dtype=frame_dtype)
+
+    if np.any(frames["identifier"] != package_type.identifier) or np.any(frames["size"] != frame_dtype.itemsize):
+        raise ValueError(f"Not all frames are {package_type.__name__} frames of size {frame_dtype.itemsize}")
+
+    return frames
+
+
+def encode_many(package_type: type[Package], values: np.ndarray | Mapping[str, np.ndarray]) -> bytes:
+    """Encodes many packages of one type into consecutive frames.
+
+    :param package_type: The type of the packages.
+    :param values: A structured array or a mapping with one column per field of the package,
+        the size and identifier fields are filled in automatically.
+    :return: The frames as a single bytes object.
+    """
+    frame_dtype = dtype(package_type)
+    columns = FIELDS[package_type][2:]
+
+    frames = np.empty(len(values[columns[0]]), dtype=frame_dtype)
+    frames["size"] = frame_dtype.itemsize
+    frames["identifier"] = package_type.identifier
+
+    for name in columns:
+        frames[name] = values[name]
+
+    return frames.tobytes()
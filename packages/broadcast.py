@@ -0,0 +1,63 @@
+from .package import Package
+from .package_stream import PackageStream
+
+
+class BroadcastHub:
+    """Sends the same packages to every subscribed stream and encodes each package only once.
+
+    Writes do not wait for the peers. A subscriber whose unsent data exceeds the high-water
+    mark is too slow: it misses the package, or it is disconnected when disconnect_slow is set.
+    """
+
+    def __init__(self, high_water: int = 1 << 20, disconnect_slow: bool = False):
+        """Creates a hub without subscribers.
+
+        :param high_water: The number of unsent bytes per subscriber at which it counts as slow.
+        :param disconnect_slow: Whether slow subscribers are disconnected instead of skipped.
+        """
+        self.high_water = high_water
+        self.disconnect_slow = disconnect_slow
+        self.disconnected = 0
+
+        self._subscribers: dict[PackageStream, int] = {}
+
+    def __len__(self) -> int:
+        """The number of subscribers."""
+        return len(self._subscribers)
+
+    def subscribe(self, stream: PackageStream):
+        """Adds a stream that receives every following broadcast."""
+        self._subscribers.setdefault(stream, 0)
+
+    def unsubscribe(self, stream: PackageStream):
+        """Removes a stream, it keeps its connection."""
+        self._subscribers.pop(stream, None)
+
+    def dropped(self, stream: PackageStream) -> int:
+        """The number of packages a subscriber missed because it was too slow."""
+        return self._subscribers.get(stream, 0)
+
+    def broadcast(self, package: Package) -> int:
+        """Encodes a package once and writes it to every subscriber.
+
+        :param package: The package to send, a FrozenPackage is not encoded again.
+        :return: The number of subscribers the package was written to.
+        """
+        data = package.to_bytes()
+        delivered = 0
+
+        for stream in list(self._subscribers):
+            if stream.closed:
+                del self._subscribers[stream]
+            elif stream.writer.transport.get_write_buffer_size() >= self.high_water:
+                if self.disconnect_slow:
+                    del self._subscribers[stream]
+                    stream.writer.close()
+                    self.disconnected += 1
+                else:
+                    self._subscribers[stream] += 1
+            else:
+                stream.writer.write(data)
+                delivered += 1
+
+        return delivered
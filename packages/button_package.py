@@ -1,49 +1,16 @@
-import struct
-import time
-
+from .fields import STR
 from .package import Package
+from .registry import register_package
 
 
-class ButtonPackage(Package):
+@register_package
+class ButtonPackage(Package, identifier=0x08, fields={"button_name": STR}):
     """A package for transferring button press information."""
 
-    def __init__(self, timestamp: int = time.time(), button_name: str = ""):
+    __slots__ = ("button_name",)
+
+    def __init__(self, timestamp: float | None = None, button_name: str = ""):
         """Creates the button package."""
-        # Using 0x08 as the identifier
-        super().__init__(0x08, "!IBLI")
+        super().__init__(timestamp)
 
-        self.timestamp = timestamp
         self.button_name = button_name
-
-    def to_bytes(self) -> bytes:
-        """Converts the current package to a bytes object."""
-        package_format = self.format + f"{len(self.button_name)}s"
-        name_bytes = self.button_name.encode("utf-8")
-
-        return struct.pack(
-            package_format,
-            struct.calcsize(package_format),  # Item 1: Size (I)
-            self.identifier,                  # Item 2: ID (B)
-            int(self.timestamp),              # Item 3: Timestamp (L)
-            len(name_bytes),                  # Item 4: Length (I) - This was missing in the format!
-            name_bytes                        # Item 5: String (s)
-        )
-
-    def to_package(self, data: bytes):
-        """Convert a bytes object into a ButtonPackage."""
-        identifier = data[4]
-
-        if identifier != self.identifier:
-            raise ValueError(f"Package identifier for {__name__} "
-                             f"must be {self.identifier}. Found {identifier}")
-
-        # Read the fixed header size
-        header_size = struct.calcsize(self.format)
-        package = struct.unpack(self.format, data[0:header_size])
-
-        timestamp = package[2]
-
-        # Read the rest of the data as the string
-        button_name = data[header_size:].decode("utf-8")
-
-        return ButtonPackage(timestamp=timestamp, button_name=button_name)
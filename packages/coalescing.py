@@ -0,0 +1,148 @@
+import asyncio
+import itertools
+import math
+import time
+from typing import Callable, Iterable, Mapping
+
+from .package import Package
+from .package_stream import PackageStream
+from .progress_package import ProgressPackage
+from .roll_package import RollPackage
+from .temperature_package import TemperaturePackage
+
+# The field that holds the state of every package type a deadband can apply to
+VALUE_FIELDS: dict[type[Package], str] = {
+    ProgressPackage: "progress",
+    RollPackage: "degrees",
+    TemperaturePackage: "temperature",
+}
+
+
+class CoalescingQueue:
+    """A send queue that only keeps the latest pending state update per package identifier.
+
+    State updates such as progress, temperature and roll replace the pending update with the
+    same identifier, so the queue never holds more than one of them per identifier however
+    slow the consumer is. Changes within the deadband of the last sent value are dropped, and
+    an identifier is sent at most max_rate times per second. Other packages are sent in order.
+    """
+
+    def __init__(
+            self,
+            deadbands: Mapping[type[Package], float] | None = None,
+            max_rate: float | None = None,
+            coalesce: Iterable[type[Package]] = (ProgressPackage, RollPackage, TemperaturePackage),
+            clock: Callable[[], float] = time.monotonic
+    ):
+        """Creates an empty queue.
+
+        :param deadbands: The minimum change of the value field per package type worth sending,
+            for example {TemperaturePackage: 0.1}. See VALUE_FIELDS for the value fields.
+        :param max_rate: The maximum number of updates per second and identifier, unlimited by default.
+        :param coalesce: The package types whose pending update is replaced by a newer one.
+        :param clock: A monotonic clock in seconds.
+        """
+        self.deadbands = dict(deadbands or {})
+        self.interval = 1 / max_rate if max_rate else 0.0
+        self.coalesce = frozenset(package_type.identifier for package_type in coalesce)
+        self.clock = clock
+
+        # Counters of updates dropped by a deadband, replaced while pending and sent
+        self.dropped = 0
+        self.merged = 0
+        self.sent = 0
+
+        # State updates are keyed by identifier, other packages by a negative counter to keep them apart
+        self._pending: dict[int, Package] = {}
+        self._keys = itertools.count(-1, -1)
+        self._last_values: dict[int, float] = {}
+        self._last_sent: dict[int, float] = {}
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        """The number of pending packages."""
+        return len(self._pending)
+
+    def put(self, package: Package) -> bool:
+        """Queues a package, replacing the pending state update with the same identifier.
+
+        :param package: The package to send.
+        :return: Whether the package was queued, False when a deadband dropped it.
+        """
+        identifier = package.identifier
+
+        if identifier not in self.coalesce:
+            self._pending[next(self._keys)] = package
+        else:
+            deadband = self.deadbands.get(package.package_type)
+            last_value = self._last_values.get(identifier)
+
+            if deadband is not None and last_value is not None:
+                if abs(getattr(package, VALUE_FIELDS[package.package_type]) - last_value) < deadband:
+                    # The receiver already has a value close enough to the latest one
+                    self.dropped += 1 + (self._pending.pop(identifier, None) is not None)
+                    return False
+
+            if identifier in self._pending:
+                self.merged += 1
+
+            self._pending[identifier] = package
+
+        self._changed.set()
+
+        return True
+
+    def get_nowait(self) -> Package | None:
+        """Returns the oldest pending package that the rate limit allows to send now, if any."""
+        now = self.clock()
+
+        for key in self._pending:
+            if key < 0 or now >= self._last_sent.get(key, -math.inf) + self.interval:
+                break
+        else:
+            return None
+
+        package = self._pending.pop(key)
+        self.sent += 1
+
+        if key >= 0:
+            self._last_sent[key] = now
+
+            if package.package_type in VALUE_FIELDS:
+                self._last_values[key] = getattr(package, VALUE_FIELDS[package.package_type])
+
+        return package
+
+    def next_ready(self) -> float | None:
+        """The number of seconds until a pending package may be sent, None when nothing is pending."""
+        if not self._pending:
+            return None
+
+        now = self.clock()
+
+        return max(min(
+            0.0 if key < 0 else self._last_sent.get(key, -math.inf) + self.interval - now
+            for key in self._pending
+        ), 0.0)
+
+    async def get(self) -> Package:
+        """Waits until a pending package may be sent and returns it."""
+        while True:
+            package = self.get_nowait()
+            if package is not None:
+                return package
+
+            self._changed.clear()
+
+            try:
+                await asyncio.wait_for(self._changed.wait(), self.next_ready())
+            except asyncio.TimeoutError:
+                pass
+
+    async def send_to(self, stream: PackageStream):
+        """Sends the queued packages over a stream until the task is cancelled.
+
+        A slow peer makes stream.send wait, meanwhile newer state updates replace the pending ones.
+        """
+        while True:
+            await stream.send(await self.get())
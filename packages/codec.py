@@ -0,0 +1,135 @@
+import asyncio
+import functools
+
+from .compressed_package import compress, CompressedPackage, LZMA, ZLIB
+from .fragment_package import FragmentPackage
+from .handshake_package import HandshakePackage
+from .package import MAX_FRAME_SIZE, Package
+from .registry import get_package
+from .traced_package import TracedPackage
+
+# The version of peers that do not send a handshake, they only know the original byte layout
+LEGACY_VERSION = 0
+PROTOCOL_VERSION = 1
+
+# The capability bits of a handshake, every bit is a frame type a peer can decode
+TRACING = 1 << 0  # TracedPackage with high-resolution send times
+ZLIB_COMPRESSION = 1 << 1  # CompressedPackage with zlib
+LZMA_COMPRESSION = 1 << 2  # CompressedPackage with lzma
+FRAGMENTS = 1 << 3  # FragmentPackage of a SendScheduler
+
+# The capabilities of this implementation
+CAPABILITIES = TRACING | ZLIB_COMPRESSION | LZMA_COMPRESSION | FRAGMENTS
+
+# The capability of every compression codec byte of a CompressedPackage
+COMPRESSION_CAPABILITIES = {ZLIB: ZLIB_COMPRESSION, LZMA: LZMA_COMPRESSION}
+
+# The capability of every other package type a peer only decodes after negotiating it
+ENVELOPE_CAPABILITIES = {TracedPackage.identifier: TRACING, FragmentPackage.identifier: FRAGMENTS}
+
+
+class Codec:
+    """The wire format of one connection, limited to the capabilities both peers support.
+
+    The default codec keeps the original byte layout, it is used with peers that do not
+    send a handshake. Frames name their own package type, so decoding only has to refuse
+    compressed frames the peers did not agree on.
+    """
+
+    def __init__(
+            self,
+            version: int = LEGACY_VERSION,
+            capabilities: int = 0,
+            compress_threshold: int = 4096,
+            compress_limit: int = 1 << 18
+    ):
+        """Creates a codec.
+
+        :param version: The protocol version both peers support.
+        :param capabilities: The capabilities both peers support.
+        :param compress_threshold: The minimum frame size in bytes worth compressing.
+        :param compress_limit: The maximum frame size in bytes compressed on the event loop, larger
+            frames such as mapped STL files are compressed in a worker thread by encode_async.
+        """
+        self.version = version
+        self.capabilities = capabilities
+        self.compress_threshold = compress_threshold
+        self.compress_limit = compress_limit
+
+        # zlib is much faster than lzma, so lzma is only used when the peer has nothing else
+        if capabilities & ZLIB_COMPRESSION:
+            self.compression = ZLIB
+        elif capabilities & LZMA_COMPRESSION:
+            self.compression = LZMA
+        else:
+            self.compression = None
+
+    @classmethod
+    def negotiate(cls, handshake: HandshakePackage, capabilities: int = CAPABILITIES, **kwargs) -> "Codec":
+        """Returns the codec for a peer from its handshake.
+
+        :param handshake: The handshake the peer sent.
+        :param capabilities: The capabilities of this peer.
+        :param kwargs: Extra arguments of the codec.
+        :return: The codec with the lower version and the common capabilities.
+        """
+        return cls(min(handshake.version, PROTOCOL_VERSION), handshake.capabilities & capabilities, **kwargs)
+
+    def supports(self, capability: int) -> bool:
+        """Whether both peers support a capability."""
+        return self.capabilities & capability == capability
+
+    def encode(self, package: Package) -> Package:
+        """Returns the package to send instead of a package in the format of the connection.
+
+        Packages from compress_threshold up to compress_limit bytes are compressed when both
+        peers support compression, other packages are returned unchanged.
+        """
+        if self.compression is None or package.size_hint() > self.compress_limit:
+            return package
+
+        return compress(package, self.compression, self.compress_threshold)
+
+    async def encode_async(self, package: Package) -> Package:
+        """Returns the package to send like encode, but also compresses packages above compress_limit.
+
+        Large frames are compressed in a worker thread of the event loop, zlib and lzma release
+        the GIL while they compress, so other connections keep being served meanwhile.
+        """
+        if self.compression is None or package.size_hint() <= self.compress_limit:
+            return self.encode(package)
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, compress, package, self.compression, self.compress_threshold
+        )
+
+    def decode(self, data: bytes | memoryview, max_frame_size: int = MAX_FRAME_SIZE) -> Package:
+        """Decodes a frame like get_package, refusing envelopes the peers did not negotiate.
+
+        The frames inside traced and compressed frames are decoded by the codec too, so they
+        are checked at any depth.
+
+        :param data: The received frame.
+        :param max_frame_size: The largest decompressed frame accepted, usually the frame limit of the receiver.
+        :raises ValueError: When the frame or a frame inside it is a traced, compressed or fragment
+            frame not both peers support.
+        """
+        identifier = data[4]
+
+        if identifier == CompressedPackage.identifier:
+            capability = COMPRESSION_CAPABILITIES.get(data[5]) if len(data) > 5 else None
+        else:
+            capability = ENVELOPE_CAPABILITIES.get(identifier, 0)
+
+        if capability is None or not self.supports(capability):
+            raise ValueError(f"Received a frame of type 0x{identifier:02X}, but the connection did not negotiate it")
+
+        if identifier not in (CompressedPackage.identifier, TracedPackage.identifier):
+            return get_package(data)
+
+        decoder = functools.partial(self.decode, max_frame_size=max_frame_size)
+
+        if identifier == CompressedPackage.identifier:
+            return CompressedPackage.to_package(data, decoder, max_frame_size)
+
+        return TracedPackage.to_package(data, decoder)
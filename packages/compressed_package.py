@@ -0,0 +1,194 @@
+import lzma
+from typing import Callable
+import zlib
+
+from .package import MAX_FRAME_SIZE, Package
+from .registry import get_package, register_package
+from .traced_package import TracedPackage
+
+# The codecs a compressed frame can use
+ZLIB = 1
+LZMA = 2
+
+# The number of compressed bytes decompressed at once
+BLOCK_SIZE = 1 << 16
+
+
+# Format: ! (Network), I (Size), B (ID), B (Codec), Q (Size of the wrapped frame), followed by the compressed frame
+@register_package
+class CompressedPackage(Package, identifier=0x16, struct_format="!IBBQ"):
+    """An envelope that sends another package compressed with zlib or lzma.
+
+    Decoding a compressed frame returns the wrapped package, so receivers handle it like an
+    uncompressed one. Only send it to peers that know the envelope, see compress.
+    """
+
+    __slots__ = ("package", "codec", "level", "_compressed")
+
+    def __init__(self, package: Package, codec: int = ZLIB, level: int | None = None):
+        """Creates a compressed package.
+
+        :param package: The package to compress.
+        :param codec: ZLIB or LZMA.
+        :param level: The compression level of zlib or the preset of lzma, defaults to the codec default.
+        """
+        if codec not in (ZLIB, LZMA):
+            raise ValueError(f"Unknown compression codec {codec}")
+
+        super().__init__()
+
+        self.package = package
+        self.codec = codec
+        self.level = level
+        self._compressed: list[bytes] | None = None
+
+    @property
+    def compressed(self) -> list[bytes]:
+        """The compressed frame of the wrapped package, compressed on first access."""
+        if self._compressed is None:
+            if self.codec == ZLIB:
+                compressor = zlib.compressobj(-1 if self.level is None else self.level)
+            else:
+                compressor = lzma.LZMACompressor(preset=self.level)
+
+            # The buffers of the wrapped package are compressed one by one without joining them
+            self._compressed = [compressor.compress(buffer) for buffer in self.package.to_buffers()]
+            self._compressed.append(compressor.flush())
+
+        return self._compressed
+
+    @property
+    def compressed_size(self) -> int:
+        """The size of the complete compressed frame in bytes."""
+        return self._header.size + sum(len(chunk) for chunk in self.compressed)
+
+    def to_buffers(self) -> list[bytes | memoryview]:
+        """Converts the current package to its header and the compressed chunks."""
+        compressed = self.compressed
+
+        return [
+            self._header.pack(
+                self._header.size + sum(len(chunk) for chunk in compressed),
+                self.identifier,
+                self.codec,
+                sum(memoryview(buffer).nbytes for buffer in self.package.to_buffers())
+            ),
+            *(chunk for chunk in compressed if chunk)
+        ]
+
+    def to_bytes(self) -> bytes:
+        """Converts the current package to a bytes object."""
+        return b"".join(self.to_buffers())
+
+    @classmethod
+    def to_package(
+            cls,
+            data: bytes,
+            decoder: Callable[[bytearray], Package] = get_package,
+            max_frame_size: int = MAX_FRAME_SIZE
+    ):
+        """Convert a bytes object into the package it wraps.
+
+        The wrapped frame is decompressed block by block into a buffer that grows with the
+        output, so a forged size does not allocate anything. Variable-length payloads of the
+        returned package reference that buffer.
+
+        :param data: The data package
+        :param decoder: The function that converts the wrapped frame into a package, defaults to get_package.
+        :param max_frame_size: The largest wrapped frame accepted, usually the frame limit of the receiver.
+        :return: The decompressed package
+        :raises ValueError: When the wrapped frame is larger than announced or max_frame_size, or is
+            itself compressed at any depth.
+        """
+        identifier = data[4]
+
+        # Check if identifier matches this package
+        if identifier != cls.identifier:
+            raise ValueError(f"Package identifier for {__name__} "
+                             f"must be {cls.identifier}. Found {identifier}")
+
+        package = cls._header.unpack_from(data)
+
+        # The announced size comes from the peer, so it only limits the output
+        if package[3] > max_frame_size:
+            raise ValueError(f"Compressed frame announces {package[3]} bytes, more than {max_frame_size}")
+
+        frame = _decompress(package[2], memoryview(data)[cls._header.size:package[0]], package[3])
+
+        if len(frame) != package[3]:
+            raise ValueError(f"Compressed frame has {len(frame)} bytes instead of the announced {package[3]}")
+
+        if _contains_compressed(frame):
+            raise ValueError("Compressed frames must not contain compressed frames")
+
+        return decoder(frame)
+
+
+def _decompress(codec: int, data: memoryview, size: int) -> bytearray:
+    """Decompresses data block by block into a buffer that grows with the output.
+
+    Every call of the decompressor returns at most one block, and at most one byte more
+    than size in total, so a frame that inflates beyond its announced size is rejected
+    without producing more than that.
+    """
+    if codec == ZLIB:
+        decompressor = zlib.decompressobj()
+    elif codec == LZMA:
+        decompressor = lzma.LZMADecompressor()
+    else:
+        raise ValueError(f"Unknown compression codec {codec}")
+
+    frame = bytearray()
+
+    for start in range(0, len(data), BLOCK_SIZE):
+        block = data[start:start + BLOCK_SIZE]
+
+        while True:
+            limit = min(size - len(frame) + 1, BLOCK_SIZE)
+            output = decompressor.decompress(block, limit)
+            frame += output
+
+            if len(frame) > size:
+                raise ValueError(f"Compressed frame is larger than the announced {size} bytes")
+
+            # Input the output limit left over is kept by zlib in unconsumed_tail and by lzma internally
+            if codec == ZLIB:
+                block = decompressor.unconsumed_tail
+
+                if not block and len(output) < limit:
+                    break
+            elif decompressor.eof or decompressor.needs_input:
+                break
+            else:
+                block = b""
+
+    return frame
+
+
+def _contains_compressed(frame: bytearray) -> bool:
+    """Checks if a frame is a compressed frame, also behind any number of TracedPackage headers."""
+    offset = 0
+
+    while len(frame) > offset + 4 and frame[offset + 4] == TracedPackage.identifier:
+        offset += TracedPackage._header.size
+
+    return len(frame) > offset + 4 and frame[offset + 4] == CompressedPackage.identifier
+
+
+def compress(package: Package, codec: int = ZLIB, threshold: int = 4096, level: int | None = None) -> Package:
+    """Compresses a package when its frame is large enough and compression makes it smaller.
+
+    :param package: The package to send.
+    :param codec: ZLIB or LZMA.
+    :param threshold: The minimum frame size in bytes worth compressing.
+    :param level: The compression level of zlib or the preset of lzma.
+    :return: A CompressedPackage, or the package itself when it is small or incompressible.
+    """
+    size = package.size_hint()
+
+    if size < threshold:
+        return package
+
+    compressed = CompressedPackage(package, codec, level)
+
+    return compressed if compressed.compressed_size < size else package
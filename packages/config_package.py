@@ -1,96 +1,139 @@
-import struct
-import time
+from .package import frame_struct, Package
+from .registry import register_package
 
-from .package import Package
+# The struct format of every value type that is not sent as UTF-8 text
+VALUE_FORMATS: dict[type, str] = {
+    int: "!l",
+    float: "!f",
+    bool: "!?",
+}
 
 
-class ConfigPackage(Package):
-    """A data package for transferring config information."""
+@register_package
+class ConfigPackage(Package, identifier=0x04, struct_format="!IBLIII"):
+    """A data package for transferring config information.
+
+    The frame does not say which type the value has, so a received value is kept as bytes.
+    It is read as text through value, or as its actual type through typed_value.
+    """
+
+    __slots__ = ("section", "option", "_value")
 
     def __init__(
             self,
-            timestamp: int = time.time(),
+            timestamp: float | None = None,
             section: str = "",
             option: str = "",
             value: int | str | bool | float = ""
     ):
         """Creates a config package."""
-        super().__init__(0x04, "!IBLIII")
+        super().__init__(timestamp)
 
-        self.timestamp = timestamp
         self.section = section
         self.option = option
         self.value = value
 
+    @property
+    def value(self) -> int | str | bool | float | bytes:
+        """The value, a received value is decoded as UTF-8 text and returned as bytes when it is not valid UTF-8.
+
+        Received numbers may also be valid UTF-8 by chance, so read anything but text through
+        typed_value or a ConfigStore.
+        """
+        if isinstance(self._value, memoryview):
+            try:
+                return str(self._value, "utf-8")
+            except UnicodeDecodeError:
+                return bytes(self._value)
+
+        return self._value
+
+    @value.setter
+    def value(self, value: int | str | bool | float):
+        """Sets the value."""
+        self._value = value
+
+    def typed_value(self, value_type: type = str) -> int | str | bool | float:
+        """Returns the value as the given type.
+
+        :param value_type: The type the sender used, int, float, bool or str, or bytes for the
+            raw value. Only used for received values, a value set locally is returned as it is.
+        :return: The value, floats are sent with single precision.
+        :raises ValueError: When the received value does not have the size of the type.
+        """
+        value = self._value
+
+        if not isinstance(value, memoryview):
+            return value
+
+        if value_type is str:
+            return str(value, "utf-8")
+
+        if value_type is bytes:
+            return bytes(value)
+
+        value_struct = frame_struct(VALUE_FORMATS[value_type])
+        if value.nbytes != value_struct.size:
+            raise ValueError(f"Value of {self.section}.{self.option} has {value.nbytes} bytes, "
+                             f"{value_type.__name__} needs {value_struct.size}")
+
+        return value_struct.unpack(value)[0]
+
     def to_bytes(self) -> bytes:
         """Converts the current package to a bytes object."""
-        package_format = (
-            self.format + f"{len(self.section)}s{len(self.option)}s{len(self.value)}s" if type(self.value) is str else
-            self.format + f"{len(self.section)}s{len(self.option)}sl" if type(self.value) is int else
-            self.format + f"{len(self.section)}s{len(self.option)}sf" if type(self.value) is float else
-            self.format + f"{len(self.section)}s{len(self.option)}s?"
+        section_bytes = self.section.encode("utf-8")
+        option_bytes = self.option.encode("utf-8")
+        value = (
+            bytes(self._value) if type(self._value) is memoryview else
+            self._value.encode("utf-8") if type(self._value) is str else
+            self._value
+        )
+
+        value_format = (
+            len(value) if type(value) is bytes else
+            "l" if type(value) is int else
+            "f" if type(value) is float else
+            "?"
         )
+        package_struct = frame_struct(self.format, len(section_bytes), len(option_bytes), value_format)
 
-        return struct.pack(
-            package_format,
-            struct.calcsize(package_format),
+        return package_struct.pack(
+            package_struct.size,
             self.identifier,
             int(self.timestamp),
-            len(self.section),
-            len(self.option),
-            len(self.value) if type(self.value) is str else 1 if type(self.value) is bool else 4,
-            self.section.encode("utf-8"),
-            self.option.encode("utf-8"),
-            self.value.encode("utf-8") if type(self.value) is str else self.value
+            len(section_bytes),
+            len(option_bytes),
+            len(value) if type(value) is bytes else 1 if type(value) is bool else 4,
+            section_bytes,
+            option_bytes,
+            value
         )
 
-    def to_package(self, data: bytes):
+    @classmethod
+    def to_package(cls, data: bytes):
         """Convert a bytes object into a ConfigPackage.
 
+        The value is a memoryview into data until it is read, so data must not change while the
+        package is in use.
+
         :param data: The data package
         :return: The bytes object as a ConfigPackage
         """
         identifier = data[4]
 
         # Check if identifier matches this package
-        if identifier != self.identifier:
+        if identifier != cls.identifier:
             raise ValueError(f"Package identifier for {__name__} "
-                             f"must be {self.identifier}. Found {identifier}")
-
-        header_size = struct.calcsize(self.format)
-
-        package = struct.unpack(self.format, data[0:header_size])
-
-        # Convert bytes to correct data
-        timestamp = package[2]
-        section_size = package[3]
-        option_size = package[4]
-        value_size = package[5]
-
-        print(data[header_size:header_size + section_size])
-
-        section = struct.unpack(
-            f"{section_size}s",
-            data[
-                header_size:header_size + section_size
-            ])
-
-        option = struct.unpack(
-            f"{option_size}s",
-            data[
-                header_size + section_size:
-                header_size + section_size + option_size
-            ])
-
-        value = struct.unpack(
-            f"{value_size}s",
-            data[
-                header_size + section_size + option_size:
-            ])
-
-        return ConfigPackage(
-            timestamp=timestamp,
-            section=section[0].decode("utf-8"),
-            option=option[0].decode("utf-8"),
-            value=value[0].decode("utf-8")
-        )
+                             f"must be {cls.identifier}. Found {identifier}")
+
+        package = cls._header.unpack_from(data)
+
+        section, option = frame_struct("!", package[3], package[4]).unpack_from(data, cls._header.size)
+
+        config = cls(timestamp=package[2], section=section.decode("utf-8"), option=option.decode("utf-8"))
+
+        # Keep the value undecoded, only the receiver knows its type
+        value_offset = cls._header.size + package[3] + package[4]
+        config.value = memoryview(data)[value_offset:value_offset + package[5]]
+
+        return config
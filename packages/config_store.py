@@ -0,0 +1,155 @@
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping
+
+from .config_package import ConfigPackage
+
+ConfigValue = int | str | bool | float | bytes
+
+# Called with the section and its changed options and their new values
+Subscriber = Callable[[str, Mapping[str, ConfigValue]], None]
+
+
+class ConfigSnapshot:
+    """An immutable view of a ConfigStore at one version."""
+
+    __slots__ = ("version", "_sections")
+
+    def __init__(self, version: int, sections: Mapping[str, Mapping[str, ConfigValue]]):
+        """Creates a snapshot.
+
+        :param version: The version of the store the snapshot was taken at.
+        :param sections: The options and values of every section, they must not change anymore.
+        """
+        self.version = version
+        self._sections = sections
+
+    def __contains__(self, section: str) -> bool:
+        """Whether the section has any options."""
+        return section in self._sections
+
+    def __getitem__(self, section: str) -> Mapping[str, ConfigValue]:
+        """The read-only options and values of a section."""
+        return MappingProxyType(self._sections[section])
+
+    def sections(self) -> list[str]:
+        """The names of all sections."""
+        return list(self._sections)
+
+    def get(self, section: str, option: str, default: ConfigValue | None = None) -> ConfigValue | None:
+        """Returns the value of an option, or the default when it is not set."""
+        options = self._sections.get(section)
+
+        return default if options is None else options.get(option, default)
+
+
+class ConfigStore:
+    """Applies ConfigPackage updates to a section -> option -> typed value index.
+
+    Values are decoded once when they are applied, as the type of the schema, else as the
+    type of the current value. A received value of an option with neither is kept as bytes,
+    since the frame does not say whether it is text or a number. Reading a value is a
+    dictionary lookup. Every apply increments the version, and subscribers of a section are
+    called once per apply with the options that changed.
+    """
+
+    def __init__(self, schema: Mapping[str, Mapping[str, type]] | None = None):
+        """Creates an empty store.
+
+        :param schema: The value type of options by section, for example {"server": {"port": int}}.
+        """
+        self.schema = {section: dict(options) for section, options in (schema or {}).items()}
+        self.version = 0
+
+        self._sections: dict[str, dict[str, ConfigValue]] = {}
+        self._subscribers: dict[str, list[Subscriber]] = {}
+
+        # Sections shared with a snapshot, they are copied before the next change
+        self._shared: set[str] = set()
+
+    def __contains__(self, section: str) -> bool:
+        """Whether the section has any options."""
+        return section in self._sections
+
+    def __getitem__(self, section: str) -> Mapping[str, ConfigValue]:
+        """The read-only options and values of a section."""
+        return MappingProxyType(self._sections[section])
+
+    def get(self, section: str, option: str, default: ConfigValue | None = None) -> ConfigValue | None:
+        """Returns the value of an option, or the default when it is not set."""
+        options = self._sections.get(section)
+
+        return default if options is None else options.get(option, default)
+
+    def subscribe(self, section: str, subscriber: Subscriber):
+        """Calls the subscriber with the changed options whenever a section changes."""
+        self._subscribers.setdefault(section, []).append(subscriber)
+
+    def unsubscribe(self, section: str, subscriber: Subscriber):
+        """Stops calling the subscriber on changes of a section."""
+        subscribers = self._subscribers.get(section, [])
+
+        if subscriber in subscribers:
+            subscribers.remove(subscriber)
+
+    def apply(self, package: ConfigPackage) -> bool:
+        """Applies a single update.
+
+        :param package: The received or local config package.
+        :return: Whether the value changed.
+        """
+        return bool(self.apply_many((package,)))
+
+    def apply_many(self, packages: Iterable[ConfigPackage]) -> dict[str, dict[str, ConfigValue]]:
+        """Applies many updates as one version and notifies every changed section once.
+
+        :param packages: The config packages in the order they were received.
+        :return: The changed options and their new values by section.
+        :raises ValueError: When a value does not have the size of its type, nothing is applied then.
+        """
+        # Every value is decoded before anything changes, so a batch applies fully or not at all
+        updates: dict[str, dict[str, ConfigValue]] = {}
+
+        for package in packages:
+            section, option = package.section, package.option
+            value_type = self.schema.get(section, {}).get(option)
+
+            if value_type is None:
+                pending = updates.get(section, {})
+                current = pending[option] if option in pending else self.get(section, option)
+                value_type = bytes if current is None else type(current)
+
+            updates.setdefault(section, {})[option] = package.typed_value(value_type)
+
+        changes: dict[str, dict[str, ConfigValue]] = {}
+
+        for section, values in updates.items():
+            options = self._sections.get(section)
+
+            if options is None:
+                options = self._sections[section] = {}
+            elif section in self._shared:
+                options = self._sections[section] = dict(options)
+                self._shared.discard(section)
+
+            for option, value in values.items():
+                if option not in options or options[option] != value:
+                    options[option] = value
+                    changes.setdefault(section, {})[option] = value
+
+        if changes:
+            self.version += 1
+
+            for section, changed in changes.items():
+                for subscriber in list(self._subscribers.get(section, ())):
+                    subscriber(section, MappingProxyType(changed))
+
+        return changes
+
+    def snapshot(self) -> ConfigSnapshot:
+        """Returns an immutable view of the current version.
+
+        Taking a snapshot does not copy the values, a section is copied on its next change.
+        """
+        self._shared.update(self._sections)
+
+        return ConfigSnapshot(self.version, dict(self._sections))
@@ -1,60 +1,24 @@
-import struct
-import time
+from .fields import BYTES
+from .package import Package, payload_view
+from .registry import register_package
 
-from .package import Package
 
-
-class ConsolePackage(Package):
+@register_package
+class ConsolePackage(Package, identifier=0x0B, fields={"console_msg": BYTES}):
     """A data package for transferring console_msg information."""
 
-    def __init__(self, timestamp: int = time.time(), console_msg: str = ""):
+    __slots__ = ("console_msg",)
+
+    def __init__(self, timestamp: float | None = None, console_msg: str | bytes | memoryview = ""):
         """Creates a console_msg package.
 
-        :param console_msg: The binary content of the console_msg file.
+        :param console_msg: The content of the console_msg. Any bytes-like object is sent without copying it.
         """
-        super().__init__(0x09, "!IBLI")
+        super().__init__(timestamp)
 
-        self.timestamp = timestamp
         self.console_msg = console_msg
 
-    def to_bytes(self) -> bytes:
-        """Converts the current package to a bytes object."""
-        # Ensure console_msg is bytes
-        if isinstance(self.console_msg, str):
-            console_msg_bytes = self.console_msg.encode("utf-8")
-        else:
-            console_msg_bytes = self.console_msg
-
-        package_format = self.format + f"{len(console_msg_bytes)}s"
-
-        return struct.pack(
-            package_format,
-            struct.calcsize(package_format),
-            self.identifier,
-            int(self.timestamp),
-            len(console_msg_bytes),
-            console_msg_bytes
-        )
-
-    def to_package(self, data: bytes):
-        """Convert a bytes object into a console_msgPackage.
-
-        :param data: The data package
-        :return: The bytes object as a console_msgPackage
-        """
-        identifier = data[4]
-
-        # Check if identifier matches this package
-        if identifier != self.identifier:
-            raise ValueError(f"Package identifier for {__name__} "
-                             f"must be {self.identifier}. Found {identifier}")
-
-        package = struct.unpack(self.format, data[0:struct.calcsize(self.format)])
-
-        # Convert bytes to correct data
-        timestamp = package[2]
-
-        # Extract the remaining data as bytes (do not decode)
-        console_msg_data = data[struct.calcsize(self.format):]
-
-        return ConsolePackage(timestamp=timestamp, console_msg=console_msg_data)
+    @property
+    def payload(self) -> memoryview:
+        """The console_msg as a flat byte view."""
+        return payload_view(self.console_msg)
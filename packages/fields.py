@@ -0,0 +1,171 @@
+import struct
+from typing import Mapping
+
+# The start of every frame: ! (Network), I (Size), B (ID), L (Timestamp)
+HEADER_FORMAT = "!IBL"
+
+
+class Field:
+    """The wire type of a declared package field.
+
+    Fixed-size fields are one struct format code in the header. Variable-size fields put
+    their length as I into the header and their content behind the header, in the order
+    the fields are declared.
+    """
+
+    __slots__ = ("code", "kind")
+
+    def __init__(self, code: str, kind: str = "fixed"):
+        """Creates a field type.
+
+        :param code: The struct format code of the field, or of its length for variable-size fields.
+        :param kind: 'fixed', 'str' for UTF-8 text or 'bytes' for any bytes-like content.
+        """
+        self.code = code
+        self.kind = kind
+
+    def __repr__(self) -> str:
+        """The field type for debugging."""
+        return f"Field({self.code!r}, {self.kind!r})"
+
+
+U8 = Field("B")
+U32 = Field("I")
+I32 = Field("l")
+U64 = Field("Q")
+F32 = Field("f")
+F64 = Field("d")
+BOOL = Field("?")
+
+# Text is decoded to str. Bytes are sent without copying and received as a memoryview into the
+# frame, so the frame must not change while the package is in use
+STR = Field("I", "str")
+BYTES = Field("I", "bytes")
+
+
+def fixed_bytes(size: int) -> Field:
+    """Returns the type of a byte string that always has the given size, such as a digest."""
+    return Field(f"{size}s")
+
+
+def generate_codec(identifier: int, fields: Mapping[str, Field], module: str) -> dict[str, object]:
+    """Generates the encode and decode functions of a package type from its fields.
+
+    The functions are straight-line code with the identifier, the header size and the offsets
+    of the first variable-size field as constants. The header including every fixed-size field
+    and length is packed and unpacked with a single struct call.
+
+    :param identifier: The identifier of the package type.
+    :param fields: The attribute names and types of the fields in wire order, after the timestamp.
+    :param module: The module of the package type, for error messages.
+    :return: The struct format, the header struct and the functions to_bytes, to_buffers,
+        pack_into, size_hint, to_package and decode_into. to_buffers is None when there are no bytes fields.
+    """
+    header = struct.Struct(HEADER_FORMAT + "".join(field.code for field in fields.values()))
+    names = [f"field_{index}" for index in range(len(fields))]
+    variable_fields = [
+        (name, local, field) for (name, field), local in zip(fields.items(), names) if field.kind != "fixed"
+    ]
+    locals_list = ", ".join(local for _, local, _ in variable_fields)
+    buffers = any(field.kind == "bytes" for _, _, field in variable_fields)
+
+    # Encoding: convert the variable-size fields, then pack the header with their lengths
+    convert = []
+
+    for name, local, field in variable_fields:
+        if field.kind == "str":
+            convert.append(f"    {local} = self.{name}.encode('utf-8')")
+        else:
+            # bytes are used as they are, only text and other buffers are converted
+            convert.append(f"    {local} = self.{name}")
+            convert.append(f"    if type({local}) is str:")
+            convert.append(f"        {local} = {local}.encode('utf-8')")
+            convert.append(f"    elif type({local}) is not bytes:")
+            convert.append(f"        {local} = _view({local}).cast('B')")
+
+    size = " + ".join([str(header.size)] + [f"len({local})" for _, local, _ in variable_fields])
+    values = ", ".join([size, str(identifier), "int(self.timestamp)"] + [
+        f"self.{name}" if field.kind == "fixed" else f"len({local})"
+        for (name, field), local in zip(fields.items(), names)
+    ])
+
+    pack = ["def to_bytes(self):", *convert, f"    header = _header.pack({values})"]
+
+    if variable_fields:
+        pack.append(f"    return b''.join((header, {locals_list}))")
+    else:
+        pack.append("    return header")
+
+    # Types with bytes fields can also return the header and the payloads without joining them
+    if buffers:
+        pack += ["", "def to_buffers(self):", *convert, f"    return [_header.pack({values}), {locals_list}]"]
+
+    # Packing into a buffer: the same header, then the variable-size fields are copied behind it
+    pack_into = ["def pack_into(self, buffer, offset):", *convert, f"    _header.pack_into(buffer, offset, {values})"]
+    pack_into.append(f"    end = offset + {header.size}")
+
+    for _, local, _ in variable_fields:
+        pack_into.append(f"    start, end = end, end + len({local})")
+        pack_into.append(f"    buffer[start:end] = {local}")
+
+    pack_into.append("    return end")
+
+    size_hint = ["def size_hint(self):", "    return " + " + ".join([str(header.size)] + [
+        f"_text_size(self.{name})" if field.kind == "str" else f"_bytes_size(self.{name})"
+        for name, _, field in variable_fields
+    ])]
+
+    # Decoding: unpack the header, then slice the variable-size fields out of the frame. to_package
+    # assigns the fields to a new package, decode_into to an existing one
+    decode = [
+        f"    if data[4] != {identifier}:",
+        f"        raise ValueError(f'Package identifier for {module} must be {identifier}. Found {{data[4]}}')",
+        f"    _, _, timestamp, {''.join(local + ', ' for local in names)}= _header.unpack_from(data)",
+        "    package.timestamp = timestamp",
+    ]
+    decode += [f"    package.{name} = {local}" for (name, field), local in zip(fields.items(), names)
+               if field.kind == "fixed"]
+
+    if variable_fields:
+        decode += ["    view = _view(data)", f"    end = {header.size}"]
+
+    for name, local, field in variable_fields:
+        decode.append(f"    start, end = end, end + {local}")
+        decode.append(f"    package.{name} = " + (
+            "str(view[start:end], 'utf-8')" if field.kind == "str" else "view[start:end]"
+        ))
+
+    decode.append("    return package")
+
+    unpack = ["def to_package(cls, data):", "    package = _new(cls)", *decode]
+    decode_into = ["def decode_into(cls, package, data):", *decode]
+
+    namespace: dict[str, object] = {
+        "_header": header,
+        "_new": object.__new__,
+        "_view": memoryview,
+        "_text_size": _text_size,
+        "_bytes_size": _bytes_size,
+    }
+    exec("\n".join(pack + [""] + pack_into + [""] + size_hint + [""] + unpack + [""] + decode_into), namespace)
+
+    return {
+        "format": header.format,
+        "header": header,
+        "to_bytes": namespace["to_bytes"],
+        "to_buffers": namespace.get("to_buffers"),
+        "pack_into": namespace["pack_into"],
+        "size_hint": namespace["size_hint"],
+        "to_package": namespace["to_package"],
+        "decode_into": namespace["decode_into"],
+    }
+
+
+def _text_size(text: str) -> int:
+    """The number of bytes of a text in UTF-8, without encoding ASCII text."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _bytes_size(value: str | bytes | memoryview) -> int:
+    """The number of bytes of the content of a bytes field."""
+    return _text_size(value) if type(value) is str else memoryview(value).nbytes
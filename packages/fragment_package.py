@@ -0,0 +1,46 @@
+from .fields import BYTES, U32, U64
+from .package import Package, payload_view
+from .registry import register_package
+
+
+@register_package
+class FragmentPackage(Package, identifier=0x1C, fields={
+    "message_id": U32,
+    "offset": U64,
+    "total_size": U64,
+    "fragment": BYTES,
+}):
+    """A package that carries a part of the frame of a larger package.
+
+    The SendScheduler splits large frames into fragments, so urgent packages can be sent
+    between them, and a FragmentReassembler restores the original package from them.
+    """
+
+    __slots__ = ("message_id", "offset", "total_size", "fragment")
+
+    def __init__(
+            self,
+            timestamp: float | None = None,
+            message_id: int = 0,
+            offset: int = 0,
+            total_size: int = 0,
+            fragment: bytes | memoryview = b""
+    ):
+        """Creates a fragment package.
+
+        :param message_id: The identifier of the split frame on its connection.
+        :param offset: The position of the fragment in the split frame.
+        :param total_size: The size of the complete split frame.
+        :param fragment: The content of the fragment. Any bytes-like object is sent without copying it.
+        """
+        super().__init__(timestamp)
+
+        self.message_id = message_id
+        self.offset = offset
+        self.total_size = total_size
+        self.fragment = fragment
+
+    @property
+    def payload(self) -> memoryview:
+        """The content of the fragment as a flat byte view."""
+        return payload_view(self.fragment)
@@ -0,0 +1,132 @@
+import socket
+import struct
+from typing import Callable, Iterator
+
+from .package import MAX_FRAME_SIZE, Package
+from .registry import get_package
+
+
+class PackageFrameDecoder:
+    """Turns arbitrary chunks of a byte stream into decoded packages.
+
+    Every package starts with its total size as a 4 byte unsigned integer. Received bytes
+    are kept in one buffer, complete frames are handed to the decoder as
+    memoryview slices of that buffer. When the buffer is full, the pending bytes move to a
+    new one, so decoded packages keep referencing the old buffer. A frame is only reserved
+    in full once its size prefix passed the max_frame_size check.
+    """
+
+    _size = struct.Struct("!I")
+
+    # The minimum number of bytes reserved for reads of unknown frames
+    _chunk = 1 << 16
+
+    def __init__(self, decoder: Callable[[memoryview], Package] | None = None, max_frame_size: int = MAX_FRAME_SIZE):
+        """Creates a frame decoder.
+
+        :param decoder: The function that converts a single frame into a package,
+            defaults to get_package.
+        :param max_frame_size: The largest frame accepted, a larger size prefix raises ValueError.
+        """
+        self._decode = decoder or get_package
+        self.max_frame_size = max_frame_size
+        self._buffer = bytearray()
+        self._start = 0
+        self._end = 0
+
+    @property
+    def pending(self) -> int:
+        """The number of received bytes that do not form a complete package yet."""
+        return self._end - self._start
+
+    def feed(self, data: bytes | bytearray | memoryview) -> Iterator[Package]:
+        """Adds a chunk of received bytes and returns an iterator over all complete packages.
+
+        :param data: Any number of received bytes.
+        :return: An iterator over the packages that were completed.
+        """
+        size = memoryview(data).nbytes
+        self._reserve(size)
+
+        self._buffer[self._end:self._end + size] = data
+        self._end += size
+
+        return self._frames()
+
+    def receive(self, sock: socket.socket, size: int = 65536) -> Iterator[Package]:
+        """Receives up to size bytes directly into the buffer and returns the completed packages.
+
+        :param sock: A connected stream socket.
+        :param size: The maximum number of bytes to receive at once.
+        :return: An iterator over the packages that were completed.
+        """
+        self._reserve(size, partial=True)
+
+        with memoryview(self._buffer) as view, view[self._end:self._end + size] as target:
+            received = sock.recv_into(target)
+
+        if received == 0:
+            raise ConnectionError("Connection closed by peer")
+
+        self._end += received
+
+        return self._frames()
+
+    def _reserve(self, size: int, partial: bool = False):
+        """Makes room for size more bytes at the end of the buffer.
+
+        Once the size prefix of the pending frame passed the max_frame_size check, a new buffer
+        holds at least the rest of that frame, so a large frame is allocated once at its final
+        size. Otherwise at least one chunk is reserved, so small reads do not reallocate every time.
+
+        :param size: The number of bytes to store.
+        :param partial: Whether room for the rest of the pending frame is enough, for reads of up to size bytes.
+        """
+        pending = self.pending
+        remaining = 0
+
+        if pending >= self._size.size:
+            frame_size = self._size.unpack_from(self._buffer, self._start)[0]
+
+            if frame_size <= self.max_frame_size:
+                remaining = frame_size - pending
+
+        if partial and remaining:
+            size = min(size, remaining)
+
+        if len(self._buffer) - self._end < size:
+            self._reallocate(pending + max(size, remaining, self._chunk))
+
+    def _reallocate(self, capacity: int):
+        """Moves the pending bytes to the start of a new buffer of the given capacity."""
+        buffer = bytearray(capacity)
+
+        with memoryview(self._buffer) as view:
+            buffer[:self.pending] = view[self._start:self._end]
+
+        self._buffer = buffer
+        self._end -= self._start
+        self._start = 0
+
+    def _frames(self) -> Iterator[Package]:
+        """Yields every complete package in the buffer."""
+        buffer = self._buffer
+
+        with memoryview(buffer) as view:
+            # A newer feed replaces the buffer when this iterator is not exhausted
+            while buffer is self._buffer and self._end - self._start >= self._size.size:
+                size = self._size.unpack_from(view, self._start)[0]
+
+                if size <= self._size.size:
+                    raise ValueError(f"Invalid package size {size}")
+
+                if size > self.max_frame_size:
+                    raise ValueError(f"Package size {size} exceeds the maximum frame size {self.max_frame_size}")
+
+                if self._end - self._start < size:
+                    break
+
+                frame = view[self._start:self._start + size]
+                self._start += size
+
+                yield self._decode(frame)
@@ -0,0 +1,25 @@
+from .fields import U32, U64
+from .package import Package
+from .registry import register_package
+
+
+@register_package
+class HandshakePackage(Package, identifier=0x1D, fields={"version": U32, "capabilities": U64}):
+    """A package that announces the protocol version and capabilities of a peer when it connects.
+
+    The connecting peer sends it first and the accepting peer answers with its own, then both
+    use the features they have in common, see packages.codec.
+    """
+
+    __slots__ = ("version", "capabilities")
+
+    def __init__(self, timestamp: float | None = None, version: int = 0, capabilities: int = 0):
+        """Creates a handshake package.
+
+        :param version: The protocol version of the peer.
+        :param capabilities: The bitmap of the capabilities the peer supports.
+        """
+        super().__init__(timestamp)
+
+        self.version = version
+        self.capabilities = capabilities
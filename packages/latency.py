@@ -0,0 +1,133 @@
+import collections
+import math
+import time
+from typing import Callable, Deque, Iterable
+
+from .confirmation_package import ConfirmationPackage
+from .package import Package
+from .traced_package import TracedPackage
+
+
+def nearest_rank(samples: Iterable[int], percentiles: Iterable[float]) -> dict[float, int]:
+    """Returns the nearest-rank percentiles of samples, such as latencies or queue wait times.
+
+    :param samples: The samples in any order.
+    :param percentiles: The percentiles to return, between 0 and 100.
+    :return: The sample at every requested percentile, empty without samples.
+    """
+    ordered = sorted(samples)
+
+    if not ordered:
+        return {}
+
+    return {
+        percentile: ordered[max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)]
+        for percentile in percentiles
+    }
+
+
+class LatencyTracker:
+    """Records one-way and round-trip latencies of the packages on one connection.
+
+    One-way latencies come from the send time of received TracedPackages and assume the
+    clocks of both peers are synchronized, for example with NTP or PTP. Round trips are
+    measured from sending a package until the ConfirmationPackage for its identifier and
+    timestamp arrives, so they only need the local clock.
+    """
+
+    def __init__(self, clock: Callable[[], int] = time.time_ns, samples: int = 1024):
+        """Creates a tracker for one connection.
+
+        :param clock: A callable returning the current time in nanoseconds since the epoch.
+        :param samples: The number of most recent samples kept per package type.
+        """
+        self.clock = clock
+        self.samples = samples
+        self.sequence = 0
+
+        self._one_way: dict[int, Deque[int]] = {}
+        self._round_trip: dict[int, Deque[int]] = {}
+        self._pending: dict[tuple[int, int], Deque[int]] = {}
+
+    def trace(self, package: Package) -> TracedPackage:
+        """Wraps a package with the next sequence number and the current time for sending.
+
+        :param package: The package to send.
+        :return: The traced package to send instead.
+        """
+        traced = TracedPackage(package, sequence=self.sequence, send_ns=self.clock())
+        self.sequence += 1
+
+        self.sent(package, traced.send_ns)
+
+        return traced
+
+    def sent(self, package: Package, send_ns: int | None = None):
+        """Remembers when a package was sent, so its confirmation yields a round trip.
+
+        :param package: The sent package.
+        :param send_ns: The send time in nanoseconds, defaults to now.
+        """
+        key = (package.identifier, int(package.timestamp))
+        pending = self._pending.get(key)
+
+        # Unconfirmed sends of one key are bounded too, the oldest are dropped first
+        if pending is None:
+            pending = self._pending[key] = collections.deque(maxlen=self.samples)
+
+        pending.append(self.clock() if send_ns is None else send_ns)
+
+        # Forget the oldest unconfirmed packages, most package types are never confirmed
+        if len(self._pending) > self.samples:
+            del self._pending[next(iter(self._pending))]
+
+    def received(self, package: Package) -> Package:
+        """Records the latencies of a received package and returns it without its extension.
+
+        :param package: The received package, traced or not.
+        :return: The received package, unwrapped when it was traced.
+        """
+        now = self.clock()
+
+        if isinstance(package, TracedPackage):
+            self._record(self._one_way, package.package.identifier, now - package.send_ns)
+            package = package.package
+
+        if isinstance(package, ConfirmationPackage):
+            key = (package.confirmed_request_id, package.confirmed_request_timestamp)
+            pending = self._pending.get(key)
+
+            # Timestamps only have a resolution of seconds, so confirmations match the oldest send
+            if pending:
+                self._record(self._round_trip, package.confirmed_request_id, now - pending.popleft())
+
+                if not pending:
+                    del self._pending[key]
+
+        return package
+
+    def one_way(self, identifier: int, percentiles: Iterable[float] = (50, 90, 99)) -> dict[float, int]:
+        """Returns percentiles of the one-way latency of a package type in nanoseconds.
+
+        :param identifier: The identifier of the package type.
+        :param percentiles: The percentiles to return, between 0 and 100.
+        :return: The latency for every requested percentile, empty without samples.
+        """
+        return nearest_rank(self._one_way.get(identifier, ()), percentiles)
+
+    def round_trip(self, identifier: int, percentiles: Iterable[float] = (50, 90, 99)) -> dict[float, int]:
+        """Returns percentiles of the round-trip time of a package type in nanoseconds.
+
+        :param identifier: The identifier of the package type.
+        :param percentiles: The percentiles to return, between 0 and 100.
+        :return: The round-trip time for every requested percentile, empty without samples.
+        """
+        return nearest_rank(self._round_trip.get(identifier, ()), percentiles)
+
+    def _record(self, latencies: dict[int, Deque[int]], identifier: int, latency: int):
+        """Adds a sample, dropping the oldest one of the package type when the window is full."""
+        samples = latencies.get(identifier)
+        if samples is None:
+            samples = latencies[identifier] = collections.deque(maxlen=self.samples)
+
+        samples.append(latency)
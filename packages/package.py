@@ -1,6 +1,252 @@
+import functools
+import struct
+import time
+from typing import Callable, Mapping
+
+from .fields import Field, generate_codec
+
+# The largest frame a receiver accepts by default, sizes announced by a peer are checked against it
+MAX_FRAME_SIZE = 1 << 30
+
+# The clock that timestamps packages created without an explicit timestamp
+_clock: Callable[[], float] = time.time
+
+
+@functools.lru_cache(maxsize=256)
+def frame_struct(header_format: str, *tail: int | str) -> struct.Struct:
+    """Returns a precompiled struct for a header followed by a variable-length tail.
+
+    Integers in the tail are byte string lengths, strings are plain struct format codes.
+    The number of distinct tails is small in practice, so the bounded cache keeps
+    format parsing out of the encode and decode paths.
+
+    :param header_format: The struct format of the fixed part, including the byte order.
+    :param tail: The lengths or format codes of the variable-length fields.
+    :return: The compiled struct.
+    """
+    return struct.Struct(header_format + "".join(
+        f"{field}s" if isinstance(field, int) else field for field in tail
+    ))
+
+
+def set_clock(clock: Callable[[], float]) -> Callable[[], float]:
+    """Replaces the clock that timestamps new packages, for example with a simulated or synchronized clock.
+
+    :param clock: A callable returning the current time in seconds since the epoch.
+    :return: The previous clock, so it can be restored.
+    """
+    global _clock
+
+    previous, _clock = _clock, clock
+
+    return previous
+
+
+def payload_view(payload: str | bytes | bytearray | memoryview) -> memoryview:
+    """Returns a payload as a flat byte view, strings are encoded as UTF-8.
+
+    Bytes-like payloads such as memoryview, bytearray and mmap objects are not copied.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+
+    return memoryview(payload).cast("B")
+
+
 class Package:
-    """The base class for all other packages."""
-    def __init__(self, identifier: int = 0, struct_format: str = ""):
-        """Initializes all generic attributes of a package."""
-        self.identifier = identifier
-        self.format = struct_format
+    """The base class for all other packages.
+
+    Subclasses pass their identifier and fields as class keywords. The fields are the
+    attributes after the timestamp in wire order, and the encoding and decoding methods
+    are generated from them when the class is defined:
+
+        class ButtonPackage(Package, identifier=0x08, fields={"button_name": STR}):
+
+    Fields of a base class come first. Methods defined in the class body are kept, the
+    generated ones stay available as _pack and _unpack, a to_package in the class body is
+    also used by decode_into. Package types with a layout the
+    fields can not describe pass their header as struct_format and implement to_bytes
+    and to_package themselves.
+
+    The identifier and format are class constants, so instances only hold their own
+    fields. Every subclass lists these fields in __slots__ to keep the packages small.
+    """
+    __slots__ = ("timestamp",)
+
+    identifier: int = 0
+    format: str = ""  # noqa: VNE003 - the struct format, named after struct.Struct.format
+    fields: dict[str, Field] | None = None
+
+    def __init_subclass__(
+            cls,
+            identifier: int | None = None,
+            struct_format: str | None = None,
+            fields: Mapping[str, Field] | None = None,
+            **kwargs
+    ):
+        """Stores the class-level identifier and struct format of a package type, or generates them from fields."""
+        super().__init_subclass__(**kwargs)
+
+        if identifier is not None:
+            cls.identifier = identifier
+
+        if struct_format is not None:
+            cls.format = struct_format
+            cls._header = struct.Struct(struct_format)
+            cls.fields = None
+        elif fields is not None or cls.fields is not None:
+            cls.fields = {**(cls.fields or {}), **(fields or {})}
+            cls._generate_codec()
+
+    @classmethod
+    def _generate_codec(cls):
+        """Generates the methods of a package type from its fields."""
+        codec = generate_codec(cls.identifier, cls.fields, cls.__module__)
+
+        cls.format = codec["format"]
+        cls._header = codec["header"]
+        cls._pack = codec["to_bytes"]
+        cls._unpack = classmethod(codec["to_package"])
+
+        # A to_package in the class body may post-process the fields, so decode_into must go through it
+        if "to_package" in cls.__dict__ and "decode_into" not in cls.__dict__:
+            codec["decode_into"] = Package.decode_into.__func__
+
+        for name in ("to_bytes", "to_buffers", "pack_into", "size_hint", "to_package", "decode_into"):
+            if codec[name] is not None and name not in cls.__dict__:
+                setattr(cls, name, classmethod(codec[name]) if name in ("to_package", "decode_into") else codec[name])
+
+    def __init__(self, timestamp: float | None = None):
+        """Initializes all generic attributes of a package.
+
+        :param timestamp: The time the package was created in seconds since the epoch,
+            defaults to the current time of the package clock.
+        """
+        self.timestamp = _clock() if timestamp is None else timestamp
+
+    def to_buffers(self) -> list[bytes | memoryview]:
+        """Converts the current package to a list of buffers that together form its bytes.
+
+        The list can be passed to socket.sendmsg, so large payloads are sent without copying.
+        """
+        return [self.to_bytes()]
+
+    def size_hint(self) -> int:
+        """Returns the number of bytes of the encoded package.
+
+        Package types with declared fields compute it without encoding the package.
+        """
+        return sum(memoryview(buffer).nbytes for buffer in self.to_buffers())
+
+    def pack_into(self, buffer: bytearray | memoryview, offset: int) -> int:
+        """Encodes the package into a writable buffer.
+
+        Package types with declared fields pack their header in place and copy only the
+        variable-size fields, so no frame is allocated.
+
+        :param buffer: The buffer to write to, it needs size_hint() bytes from offset on.
+        :param offset: The position of the first byte of the package in the buffer.
+        :return: The position behind the last byte of the package.
+        """
+        for data in self.to_buffers():
+            view = memoryview(data).cast("B")
+            buffer[offset:offset + view.nbytes] = view
+            offset += view.nbytes
+
+        return offset
+
+    @classmethod
+    def decode_into(cls, package: "Package", data: bytes | memoryview) -> "Package":
+        """Decodes a frame into an existing package of this type instead of creating a new one.
+
+        Package types with declared fields assign the fields directly, other types decode a
+        new package and copy its fields. Like to_package, bytes fields of the package refer to
+        the frame afterwards.
+
+        :param package: The package to overwrite, every field of it is replaced.
+        :param data: The frame of a package of this type.
+        :return: The given package.
+        """
+        decoded = cls.to_package(data)
+
+        for package_type in type(decoded).__mro__:
+            for name in getattr(package_type, "__slots__", ()):
+                setattr(package, name, getattr(decoded, name))
+
+        return package
+
+    @property
+    def package_type(self) -> type["Package"]:
+        """The type of the package, look up per-type settings with it instead of type(package)."""
+        return type(self)
+
+    def freeze(self) -> "FrozenPackage":
+        """Returns an immutable snapshot of the package that is encoded only once."""
+        return FrozenPackage(self)
+
+
+class FrozenPackage(Package):
+    """An immutable snapshot of a package that encodes it once and reuses the bytes.
+
+    Fields of the wrapped package can be read through the snapshot. Send the same snapshot
+    to many peers instead of encoding the package for every one of them.
+    """
+
+    __slots__ = ("package", "data")
+
+    def __init__(self, package: Package):
+        """Creates the snapshot and encodes the package.
+
+        :param package: The package to freeze, it must not be changed afterwards.
+        """
+        super().__init__(package.timestamp)
+
+        self.package = package
+        self.data = package.to_bytes()
+
+    @property
+    def identifier(self) -> int:
+        """The identifier of the wrapped package."""
+        return self.package.identifier
+
+    @property
+    def package_type(self) -> type[Package]:
+        """The type of the wrapped package."""
+        return self.package.package_type
+
+    def __getattr__(self, name: str):
+        """Reads the fields of the wrapped package."""
+        if name in FrozenPackage.__slots__:
+            raise AttributeError(name)
+
+        return getattr(self.package, name)
+
+    def __setattr__(self, name: str, value):
+        """Rejects changes once the package is encoded."""
+        if hasattr(self, "data"):
+            raise AttributeError(f"{type(self).__name__} is immutable")
+
+        super().__setattr__(name, value)
+
+    def freeze(self) -> "FrozenPackage":
+        """Returns the snapshot itself."""
+        return self
+
+    def to_bytes(self) -> bytes:
+        """Returns the encoded package."""
+        return self.data
+
+    def to_buffers(self) -> list[bytes | memoryview]:
+        """Returns the encoded package as a single buffer."""
+        return [self.data]
+
+    def size_hint(self) -> int:
+        """Returns the number of bytes of the encoded package."""
+        return len(self.data)
+
+    def pack_into(self, buffer: bytearray | memoryview, offset: int) -> int:
+        """Copies the encoded package into a writable buffer and returns the position behind it."""
+        end = offset + len(self.data)
+        buffer[offset:end] = self.data
+
+        return end
@@ -0,0 +1,280 @@
+import asyncio
+import itertools
+from typing import Awaitable, Callable, Iterable
+
+from .codec import CAPABILITIES, Codec, PROTOCOL_VERSION, TRACING
+from .frame_decoder import PackageFrameDecoder
+from .handshake_package import HandshakePackage
+from .latency import LatencyTracker
+from .package import MAX_FRAME_SIZE, Package
+from .transport import PackageWriter
+
+
+class PackageStream:
+    """Sends and receives packages over one persistent asyncio connection.
+
+    Incoming packages are read with ``async for package in stream``, outgoing packages are
+    written with send and send_many, which wait for the writer to drain its buffer. Outgoing
+    packages are encoded with the codec of the stream, which a handshake selects.
+    """
+
+    def __init__(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+            read_size: int = 65536,
+            tracker: LatencyTracker | None = None,
+            max_frame_size: int = MAX_FRAME_SIZE
+    ):
+        """Creates a package stream from an open connection.
+
+        :param reader: The reader of the connection.
+        :param writer: The writer of the connection.
+        :param read_size: The maximum number of bytes to read at once.
+        :param tracker: Traces sent packages and measures the latency of received ones. Sent
+            packages are only traced when the handshake negotiated TRACING.
+        :param max_frame_size: The largest received frame accepted, before and after decompression.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.read_size = read_size
+        self.tracker = tracker
+
+        self.codec = Codec()
+
+        self._decoder = PackageFrameDecoder(decoder=self._decode, max_frame_size=max_frame_size)
+        self._packages = iter(())
+        self._batch = PackageWriter()
+
+    @classmethod
+    async def connect(
+            cls,
+            host: str,
+            port: int,
+            tracker: LatencyTracker | None = None,
+            capabilities: int | None = None,
+            **kwargs
+    ) -> "PackageStream":
+        """Opens a connection to a peer and returns it as a package stream.
+
+        :param capabilities: When given, a handshake with these capabilities selects the codec.
+            Only use it with peers that know the HandshakePackage.
+        """
+        reader, writer = await asyncio.open_connection(host, port, **kwargs)
+        stream = cls(reader, writer, tracker=tracker)
+
+        if capabilities is not None:
+            await stream.handshake(capabilities)
+
+        return stream
+
+    @classmethod
+    async def start_server(
+            cls,
+            handler: Callable[["PackageStream"], Awaitable[None]],
+            host: str | None = None,
+            port: int | None = None,
+            capabilities: int | None = None,
+            **kwargs
+    ) -> asyncio.Server:
+        """Starts a server that calls the handler with a package stream for every connection.
+
+        :param capabilities: When given, the handshake of every connecting peer is answered with
+            these capabilities before the handler is called, see accept_handshake.
+        """
+        async def accept(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            async with cls(reader, writer) as stream:
+                if capabilities is not None:
+                    try:
+                        await stream.accept_handshake(capabilities)
+                    except (EOFError, asyncio.IncompleteReadError, ConnectionError):
+                        # The peer closed the connection before it sent anything useful
+                        return
+
+                await handler(stream)
+
+        return await asyncio.start_server(accept, host, port, **kwargs)
+
+    def __aiter__(self) -> "PackageStream":
+        """Returns the stream itself as an asynchronous iterator over received packages."""
+        return self
+
+    async def __anext__(self) -> Package:
+        """Returns the next received package, reading from the connection when needed."""
+        package = await self._next_package()
+
+        if self.tracker is not None:
+            return self.tracker.received(package)
+
+        return package
+
+    def _decode(self, frame: memoryview) -> Package:
+        """Decodes a received frame with the current codec of the stream."""
+        return self.codec.decode(frame, self._decoder.max_frame_size)
+
+    async def _next_package(self) -> Package:
+        """Returns the next decoded package, raises StopAsyncIteration when the peer closed the connection."""
+        package = next(self._packages, None)
+
+        while package is None:
+            data = await self.reader.read(self.read_size)
+
+            if not data:
+                if self._decoder.pending:
+                    raise asyncio.IncompleteReadError(b"", self._decoder.pending)
+
+                raise StopAsyncIteration
+
+            self._packages = self._decoder.feed(data)
+            package = next(self._packages, None)
+
+        return package
+
+    async def receive(self) -> Package:
+        """Returns the next received package, raises EOFError when the peer closed the connection."""
+        try:
+            return await self.__anext__()
+        except StopAsyncIteration:
+            raise EOFError("Connection closed by peer") from None
+
+    async def handshake(self, capabilities: int = CAPABILITIES, timeout: float = 5.0) -> Codec:
+        """Exchanges handshakes as the connecting peer and selects the codec of the stream.
+
+        Only use it with peers that know the HandshakePackage, older peers can not decode it.
+
+        :param capabilities: The capabilities of this peer.
+        :param timeout: The number of seconds to wait for the answer.
+        :return: The selected codec.
+        :raises ValueError: When the peer answers with another package.
+        """
+        self.writer.write(HandshakePackage(version=PROTOCOL_VERSION, capabilities=capabilities).to_bytes())
+
+        try:
+            reply = await asyncio.wait_for(self._next_package(), timeout)
+        except StopAsyncIteration:
+            raise EOFError("Connection closed by peer") from None
+
+        if not isinstance(reply, HandshakePackage):
+            raise ValueError(f"Expected a handshake from the peer, received {type(reply).__name__}")
+
+        self.codec = Codec.negotiate(reply, capabilities)
+
+        return self.codec
+
+    async def accept_handshake(self, capabilities: int = CAPABILITIES, timeout: float = 1.0) -> Codec:
+        """Answers the handshake of the connecting peer and selects the codec of the stream.
+
+        A peer that sends another package first or nothing within the timeout does not know
+        the handshake, so the stream keeps the original byte layout and the package it sent
+        is received as usual.
+
+        :param capabilities: The capabilities of this peer.
+        :param timeout: The number of seconds to wait for the handshake.
+        :return: The selected codec.
+        """
+        try:
+            package = await asyncio.wait_for(self._next_package(), timeout)
+        except asyncio.TimeoutError:
+            return self.codec
+        except StopAsyncIteration:
+            raise EOFError("Connection closed by peer") from None
+
+        if not isinstance(package, HandshakePackage):
+            self._packages = itertools.chain((package,), self._packages)
+            return self.codec
+
+        self.writer.write(HandshakePackage(version=PROTOCOL_VERSION, capabilities=capabilities).to_bytes())
+        self.codec = Codec.negotiate(package, capabilities)
+
+        await self.writer.drain()
+
+        return self.codec
+
+    async def send(self, package: Package):
+        """Sends a single package and waits until the writer is below its high-water mark."""
+        if self.tracker is not None and self.codec.supports(TRACING):
+            package = self.tracker.trace(package)
+
+        package = await self.codec.encode_async(package)
+
+        self.writer.writelines(package.to_buffers())
+        await self.writer.drain()
+
+    async def send_many(self, packages: Iterable[Package]):
+        """Sends many packages packed into one reused buffer and waits until the writer has drained."""
+        if self.tracker is not None and self.codec.supports(TRACING):
+            packages = [self.tracker.trace(package) for package in packages]
+
+        encode = self.codec.encode_async
+        packages = [await encode(package) for package in packages]
+
+        batch = self._batch
+        batch.clear()
+        batch.add_many(packages)
+
+        for buffer in batch.buffers():
+            self.writer.write(buffer)
+
+        # Data the transport could not send yet may still refer to the buffer of the batch
+        if self.writer.transport.get_write_buffer_size():
+            batch.detach()
+
+        await self.writer.drain()
+
+    @property
+    def closed(self) -> bool:
+        """Whether the connection is closed or closing."""
+        return self.writer.is_closing()
+
+    async def close(self):
+        """Closes the connection."""
+        self.writer.close()
+
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def __aenter__(self) -> "PackageStream":
+        """Returns the stream for use in an async with block."""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Closes the connection at the end of an async with block."""
+        await self.close()
+
+
+class PackageStreamPool:
+    """Keeps one persistent package stream per peer."""
+
+    def __init__(self, **kwargs):
+        """Creates an empty pool.
+
+        :param kwargs: Extra arguments for every asyncio.open_connection call.
+        """
+        self._kwargs = kwargs
+        self._streams: dict[tuple[str, int], PackageStream] = {}
+        self._locks: dict[tuple[str, int], asyncio.Lock] = {}
+
+    async def get(self, host: str, port: int) -> PackageStream:
+        """Returns the open stream to the peer, connecting only when there is none."""
+        peer = (host, port)
+
+        async with self._locks.setdefault(peer, asyncio.Lock()):
+            stream = self._streams.get(peer)
+
+            if stream is None or stream.closed:
+                stream = self._streams[peer] = await PackageStream.connect(host, port, **self._kwargs)
+
+        return stream
+
+    async def send(self, host: str, port: int, package: Package):
+        """Sends a package to the peer over its persistent stream."""
+        await (await self.get(host, port)).send(package)
+
+    async def close(self):
+        """Closes every stream in the pool."""
+        streams = list(self._streams.values())
+        self._streams.clear()
+
+        await asyncio.gather(*(stream.close() for stream in streams))
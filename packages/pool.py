@@ -0,0 +1,66 @@
+from typing import Iterable
+
+from .package import Package
+from .registry import get_package
+
+
+class PackagePool:
+    """Decodes frames of hot package types into reused instances instead of new ones.
+
+    Every pooled package type keeps a list of free instances. Frames of a pooled type are
+    decoded into a free instance with decode_into, and a new instance is created only when
+    none is free. Frames of other types are decoded with get_package. decode can be passed
+    as the decoder of a PackageFrameDecoder.
+
+    Ownership: a package returned by decode belongs to the caller until the caller passes
+    it to release. Afterwards the pool overwrites it with the next frame of its type, so
+    neither the package nor values read from its bytes fields may be used after release.
+    Packages that are never released are simply garbage collected, and at most size
+    instances per type are kept. A package must be released only once.
+    """
+
+    def __init__(self, package_types: Iterable[type[Package]], size: int = 64):
+        """Creates a pool without instances, they are created by the first frames.
+
+        :param package_types: The package types to pool, for example TemperaturePackage.
+        :param size: The maximum number of free instances kept per package type.
+        """
+        self.size = size
+
+        # The number of packages of pooled types created because no instance was free
+        self.created = 0
+
+        # One slot per possible identifier, like the registry, so decoding is a single list lookup
+        self._types: list[type[Package] | None] = [None] * 256
+        self._free: list[list[Package] | None] = [None] * 256
+
+        for package_type in package_types:
+            self._types[package_type.identifier] = package_type
+            self._free[package_type.identifier] = []
+
+    def decode(self, data: bytes | memoryview) -> Package:
+        """Decodes a frame, into a free instance when its package type is pooled.
+
+        :param data: The frame of a package.
+        :return: The decoded package, owned by the caller until it is released.
+        """
+        free = self._free[data[4]]
+
+        if free:
+            return self._types[data[4]].decode_into(free.pop(), data)
+
+        if free is not None:
+            self.created += 1
+
+        return get_package(data)
+
+    def release(self, package: Package):
+        """Returns a package from decode to the pool, the caller must not use it afterwards.
+
+        Packages of types that are not pooled are ignored, so every decoded package can be released.
+        """
+        identifier = package.identifier
+        free = self._free[identifier]
+
+        if free is not None and type(package) is self._types[identifier] and len(free) < self.size:
+            free.append(package)
@@ -0,0 +1,101 @@
+import importlib
+
+from .package import Package
+
+# One slot per possible identifier, so decoding is a single list lookup
+PACKAGES: list[type[Package] | None] = [None] * 256
+
+# The module of every built-in package type, it is imported when its identifier is first decoded
+MODULES: dict[int, str] = {
+    0x01: "progress_package",
+    0x02: "temperature_package",
+    0x03: "stl_package",
+    0x04: "config_package",
+    0x05: "robot_data_package",
+    0x06: "request_robot_list_package",
+    0x07: "confirmation_package",
+    0x08: "button_package",
+    0x09: "slicer_config_file_package",
+    0x0A: "slicer_setting_package",
+    0x0B: "console_package",
+    0x10: "selected_robot_package",
+    0x11: "roll_package",
+    0x12: "stl_chunk_package",
+    0x13: "stl_chunk_ack_package",
+    0x14: "traced_package",
+    0x15: "sequenced_confirmation_package",
+    0x16: "compressed_package",
+    0x17: "robot_list_package",
+    0x18: "slicer_setting_batch_package",
+    0x19: "slicer_config_delta_package",
+    0x1A: "stl_offer_package",
+    0x1B: "stl_offer_reply_package",
+    0x1C: "fragment_package",
+    0x1D: "handshake_package",
+}
+
+
+def register_package(package_type: type[Package]) -> type[Package]:
+    """Registers a package type under its identifier, can be used as a class decorator.
+
+    :param package_type: The package type to register.
+    :return: The registered package type.
+    :raises ValueError: When another package type already uses the identifier.
+    """
+    registered = PACKAGES[package_type.identifier]
+
+    if registered is not None and registered is not package_type:
+        raise ValueError(f"Package identifier {package_type.identifier:#04x} of {package_type.__name__} "
+                         f"is already used by {registered.__name__}")
+
+    # Built-in identifiers are reserved even before their module is imported
+    module = MODULES.get(package_type.identifier)
+    if module is not None and package_type.__module__ != f"{__package__}.{module}":
+        raise ValueError(f"Package identifier {package_type.identifier:#04x} of {package_type.__name__} "
+                         f"is reserved for {__package__}.{module}")
+
+    PACKAGES[package_type.identifier] = package_type
+
+    return package_type
+
+
+def load_package(identifier: int) -> type[Package]:
+    """Returns the package type of an identifier, importing its module on first use.
+
+    :param identifier: The identifier of the package type.
+    :return: The registered package type.
+    :raises ValueError: When no package type uses the identifier.
+    """
+    package_type = PACKAGES[identifier]
+
+    if package_type is None and identifier in MODULES:
+        importlib.import_module(f".{MODULES[identifier]}", __package__)
+        package_type = PACKAGES[identifier]
+
+    if package_type is None:
+        raise ValueError(f"No package found for data with identifier {identifier}")
+
+    return package_type
+
+
+def load_packages() -> list[type[Package] | None]:
+    """Imports every built-in package type and returns the filled registry."""
+    for identifier in MODULES:
+        load_package(identifier)
+
+    return PACKAGES
+
+
+def get_package(data: bytes) -> Package:
+    """Finds the correct package from the bytes object and returns it."""
+    package_type = PACKAGES[data[4]]
+
+    if package_type is None:
+        package_type = load_package(data[4])
+
+    return package_type.to_package(data)
+
+
+def get_identifier(package_type: type[Package]) -> int:
+    """Finds the correct package identifier and returns it."""
+    return package_type.identifier
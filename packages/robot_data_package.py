@@ -1,16 +1,27 @@
-import struct
-import time
-
+from .fields import F32, STR, U32
 from .package import Package
+from .registry import register_package
 from .robot import Robot
 
 
-class RobotDataPackage(Package):
+@register_package
+class RobotDataPackage(Package, identifier=0x05, fields={
+    "model": STR,
+    "brand": STR,
+    "material": STR,
+    "axis": U32,
+    "reach": U32,
+    "payload": U32,
+    "weight": U32,
+    "accuracy": F32,
+}):
     """A data package for transferring robot information."""
 
+    __slots__ = ("model", "brand", "material", "axis", "reach", "payload", "weight", "accuracy")
+
     def __init__(
             self,
-            timestamp: int = time.time(),
+            timestamp: float | None = None,
             model: str = "",
             brand: str = "",
             material: str = "",
@@ -22,9 +33,8 @@ class RobotDataPackage(Package):
 
     ):
         """Creates a robot package."""
-        super().__init__(0x05, "!IBLLLLLLLLf")
+        super().__init__(timestamp)
 
-        self.timestamp = timestamp
         self.model = model
         self.brand = brand
         self.material = material
@@ -62,79 +72,16 @@ class RobotDataPackage(Package):
 
         return robot
 
-    def to_bytes(self) -> bytes:
-        """Converts the current package to a bytes object."""
-        package_format = self.format + f"{len(self.model)}s" + f"{len(self.brand)}s" + f"{len(self.material)}s"
-
-        return struct.pack(
-            package_format,
-            struct.calcsize(package_format),
-            self.identifier,
-            int(self.timestamp),
-            len(self.model),
-            len(self.brand),
-            len(self.material),
-            self.axis,
-            self.reach,
-            self.payload,
-            self.weight,
-            self.accuracy,
-            self.model.encode("utf-8"),
-            self.brand.encode("utf-8"),
-            self.material.encode("utf-8")
-        )
-
-    def to_package(self, data: bytes):
+    @classmethod
+    def to_package(cls, data: bytes):
         """Convert a bytes object into a RobotDataPackage.
 
         :param data: The data package
         :return: The bytes object as a RobotDataPackage
         """
-        identifier = data[4]
-
-        # Check if identifier matches this package
-        if identifier != self.identifier:
-            raise ValueError(f"Package identifier for {__name__} "
-                             f"must be {self.identifier}. Found {identifier}")
-
-        header_size = struct.calcsize(self.format)
+        package = cls._unpack(data)
 
-        package = struct.unpack(self.format, data[0:header_size])
+        # The accuracy is sent with single precision
+        package.accuracy = round(package.accuracy, 2)
 
-        # Convert bytes to correct data
-        timestamp = package[2]
-        model_size = package[3]
-        brand_size = package[4]
-        material_size = package[5]
-
-        name = struct.unpack(
-            f"{model_size}s",
-            data[
-                header_size:header_size + model_size
-            ])
-
-        manufacturer = struct.unpack(
-            f"{brand_size}s",
-            data[
-                header_size + model_size:
-                header_size + model_size + brand_size
-            ])
-
-        filament = struct.unpack(
-            f"{material_size}s",
-            data[
-                header_size + model_size + brand_size:
-                header_size + model_size + brand_size + material_size
-            ])
-
-        return RobotDataPackage(
-            timestamp=timestamp,
-            model=name[0].decode("utf-8"),
-            brand=manufacturer[0].decode("utf-8"),
-            material=filament[0].decode("utf-8"),
-            axis=package[6],
-            reach=package[7],
-            payload=package[8],
-            weight=package[9],
-            accuracy=round(package[10], 2)
-        )
+        return package
@@ -0,0 +1,149 @@
+from typing import Iterable, Iterator
+
+from .package import frame_struct, Package
+from .registry import register_package
+from .robot import Robot
+
+
+# Format: ! (Network), I (Size), B (ID), L (Timestamp), I (Robot count), I (String count), followed by
+# the columns I (Model, Brand and Material string index), L (Axis, Reach, Payload, Weight) and f (Accuracy)
+# with one value per robot each, I (Length) per string and the UTF-8 encoded strings
+@register_package
+class RobotListPackage(Package, identifier=0x17, struct_format="!IBLII"):
+    """A package for transferring the whole robot catalog in a single frame.
+
+    Robots are stored in columns, and model, brand and material refer to a table in which
+    every distinct string is stored once. Received robots are created on access.
+    """
+
+    __slots__ = ("_count", "_columns", "_strings", "_table")
+
+    def __init__(self, timestamp: float | None = None, robots: Iterable[Robot] = ()):
+        """Creates a robot list package.
+
+        :param robots: The robots of the catalog.
+        """
+        super().__init__(timestamp)
+
+        robots = list(robots)
+        strings: dict[str, int] = {}
+
+        def intern(value: str) -> int:
+            return strings.setdefault(value, len(strings))
+
+        self._count = len(robots)
+        self._columns = [
+            intern(getattr(robot, name)) for name in ("model", "brand", "material") for robot in robots
+        ]
+        self._columns += [
+            getattr(robot, name) for name in ("axis", "reach", "payload", "weight", "accuracy") for robot in robots
+        ]
+        self._strings: list[str] | None = list(strings)
+        self._table: tuple[memoryview, tuple[int, ...]] | None = None
+
+    @property
+    def strings(self) -> list[str]:
+        """The distinct model, brand and material strings, decoded on first access when received."""
+        if self._strings is None:
+            view, lengths = self._table
+            strings = []
+            offset = 0
+
+            for length in lengths:
+                strings.append(str(view[offset:offset + length], "utf-8"))
+                offset += length
+
+            self._strings = strings
+            self._table = None
+
+        return self._strings
+
+    def __len__(self) -> int:
+        """The number of robots."""
+        return self._count
+
+    def __getitem__(self, index: int) -> Robot:
+        """Creates the robot at an index of the catalog."""
+        index = range(self._count)[index]
+        count = self._count
+        columns = self._columns
+        strings = self.strings
+
+        robot = Robot()
+        robot.model = strings[columns[index]]
+        robot.brand = strings[columns[count + index]]
+        robot.material = strings[columns[2 * count + index]]
+        robot.axis = columns[3 * count + index]
+        robot.reach = columns[4 * count + index]
+        robot.payload = columns[5 * count + index]
+        robot.weight = columns[6 * count + index]
+        robot.accuracy = round(columns[7 * count + index], 2)
+
+        return robot
+
+    def __iter__(self) -> Iterator[Robot]:
+        """Creates the robots of the catalog one by one."""
+        return (self[index] for index in range(self._count))
+
+    def to_bytes(self) -> bytes:
+        """Converts the current package to a bytes object."""
+        count = self._count
+        encoded = [string.encode("utf-8") for string in self.strings]
+
+        package_struct = frame_struct(
+            self.format, f"{3 * count}I{4 * count}L{count}f{len(encoded)}I", sum(map(len, encoded))
+        )
+
+        return package_struct.pack(
+            package_struct.size,
+            self.identifier,
+            int(self.timestamp),
+            count,
+            len(encoded),
+            *self._columns,
+            *map(len, encoded),
+            b"".join(encoded)
+        )
+
+    @classmethod
+    def to_package(cls, data: bytes):
+        """Convert a bytes object into a RobotListPackage.
+
+        The string table is decoded on first access and references data until then.
+
+        :param data: The data package
+        :return: The bytes object as a RobotListPackage
+        :raises ValueError: When the robot or string counts do not fit the frame.
+        """
+        identifier = data[4]
+
+        # Check if identifier matches this package
+        if identifier != cls.identifier:
+            raise ValueError(f"Package identifier for {__name__} "
+                             f"must be {cls.identifier}. Found {identifier}")
+
+        package = cls._header.unpack_from(data)
+        count = package[3]
+
+        # The counts come from the peer, so the columns must fit the frame before a struct is built for them
+        payload_size = min(package[0], len(data)) - cls._header.size
+        if 32 * count + 4 * package[4] > payload_size:
+            raise ValueError(f"Robot list of {count} robots and {package[4]} strings does not fit "
+                             f"its {payload_size} byte payload")
+
+        columns_struct = frame_struct("!", f"{3 * count}I{4 * count}L{count}f{package[4]}I")
+        columns = columns_struct.unpack_from(data, cls._header.size)
+
+        if sum(columns[8 * count:]) > payload_size - columns_struct.size:
+            raise ValueError(f"Robot list strings exceed the {payload_size - columns_struct.size} bytes of its table")
+
+        robot_list = cls(timestamp=package[2])
+        robot_list._count = count
+        robot_list._columns = columns[:8 * count]
+        robot_list._strings = None
+        robot_list._table = (
+            memoryview(data)[cls._header.size + columns_struct.size:package[0]],
+            columns[8 * count:]
+        )
+
+        return robot_list
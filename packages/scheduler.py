@@ -0,0 +1,262 @@
+import asyncio
+import collections
+import itertools
+import time
+from typing import Callable, Deque, Iterable, Iterator, Mapping
+
+from .codec import FRAGMENTS
+from .fragment_package import FragmentPackage
+from .latency import nearest_rank
+from .package import MAX_FRAME_SIZE, Package
+from .package_stream import PackageStream
+from .registry import get_package
+
+# The priority classes, a lower class is always sent first
+CONTROL = 0
+NORMAL = 1
+BULK = 2
+
+# The priority class of every built-in package type that is not NORMAL
+PRIORITIES: dict[int, int] = {
+    0x03: BULK,  # STLPackage
+    0x07: CONTROL,  # ConfirmationPackage
+    0x08: CONTROL,  # ButtonPackage
+    0x09: BULK,  # SlicerConfigFilePackage
+    0x11: CONTROL,  # RollPackage
+    0x12: BULK,  # STLChunkPackage
+    0x13: CONTROL,  # STLChunkAckPackage
+    0x15: CONTROL,  # SequencedConfirmationPackage
+}
+
+
+class SendScheduler:
+    """An outbound queue that sends packages by priority class and splits large frames into fragments.
+
+    Every package type belongs to one of the classes CONTROL, NORMAL and BULK, and a queued
+    package of a lower class is always sent first. While fragmenting is enabled, frames larger
+    than fragment_size are sent as FragmentPackages that are created one at a time, so a
+    control package queued while a large STLPackage is sent waits for at most one fragment.
+    Packages of the same class are sent in order. The peer restores split packages with a
+    FragmentReassembler, send_to only fragments when the handshake negotiated FRAGMENTS.
+
+    The queue depth and the time from put until a package, or the first fragment of it,
+    is sent are recorded per class.
+    """
+
+    def __init__(
+            self,
+            priorities: Mapping[int, int] | None = None,
+            fragment_size: int = 1 << 14,
+            samples: int = 1024,
+            clock: Callable[[], int] = time.monotonic_ns
+    ):
+        """Creates an empty scheduler.
+
+        :param priorities: The priority class per package identifier, defaults to PRIORITIES.
+            Identifiers that are missing are NORMAL.
+        :param fragment_size: The maximum number of bytes of a frame sent in one piece.
+        :param samples: The number of most recent wait times kept per class.
+        :param clock: A monotonic clock in nanoseconds.
+        """
+        self.priorities = dict(PRIORITIES if priorities is None else priorities)
+        self.fragment_size = fragment_size
+        self.fragmenting = True
+        self.clock = clock
+
+        # The number of packages and fragments sent per class
+        self.sent = [0, 0, 0]
+
+        # Every entry is the put time and a package or the iterator over the fragments of one
+        self._queues: list[Deque[tuple[int, Package | Iterator[tuple[FragmentPackage, bool]]]]] = [
+            collections.deque() for _ in range(BULK + 1)
+        ]
+        self._waits: list[Deque[int]] = [collections.deque(maxlen=samples) for _ in range(BULK + 1)]
+        self._message_ids = itertools.count()
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        """The number of queued packages, a partly sent package counts as one."""
+        return sum(len(queue) for queue in self._queues)
+
+    def put(self, package: Package):
+        """Queues a package in the class of its identifier."""
+        self._queues[self.priorities.get(package.identifier, NORMAL)].append((self.clock(), package))
+        self._changed.set()
+
+    def get_nowait(self) -> Package | None:
+        """Returns the next package or fragment to send, if any."""
+        priority = next((priority for priority, queue in enumerate(self._queues) if queue), None)
+
+        if priority is None:
+            return None
+
+        queue = self._queues[priority]
+        put_ns, entry = queue[0]
+
+        # A package is split when it reaches the head of its queue, so send_to can still disable fragmenting
+        if isinstance(entry, Package) and self.fragmenting and entry.size_hint() > self.fragment_size:
+            entry = self._fragments(entry)
+            queue[0] = (put_ns, entry)
+
+        if isinstance(entry, Package):
+            queue.popleft()
+            self._waits[priority].append(self.clock() - put_ns)
+        else:
+            package, last = next(entry)
+
+            if package.offset == 0:
+                self._waits[priority].append(self.clock() - put_ns)
+            if last:
+                queue.popleft()
+
+            entry = package
+
+        self.sent[priority] += 1
+
+        return entry
+
+    async def get(self) -> Package:
+        """Waits until a package or fragment is queued and returns it."""
+        while True:
+            package = self.get_nowait()
+            if package is not None:
+                return package
+
+            self._changed.clear()
+            await self._changed.wait()
+
+    async def send_to(self, stream: PackageStream):
+        """Sends the queued packages over a stream until the task is cancelled.
+
+        Packages are only fragmented when the codec of the stream supports FRAGMENTS. The
+        write buffer limit of the stream is lowered to one fragment, otherwise the transport
+        could hold more bulk data than that ahead of a control package.
+        """
+        self.fragmenting = stream.codec.supports(FRAGMENTS)
+        stream.writer.transport.set_write_buffer_limits(high=self.fragment_size)
+
+        while True:
+            await stream.send(await self.get())
+
+    def depth(self, priority: int) -> int:
+        """Returns the number of queued packages of a priority class."""
+        return len(self._queues[priority])
+
+    def wait(self, priority: int, percentiles: Iterable[float] = (50, 90, 99)) -> dict[float, int]:
+        """Returns percentiles of the time packages of a priority class were queued in nanoseconds.
+
+        :param priority: CONTROL, NORMAL or BULK.
+        :param percentiles: The percentiles to return, between 0 and 100.
+        :return: The wait time for every requested percentile, empty without samples.
+        """
+        return nearest_rank(self._waits[priority], percentiles)
+
+    def _fragments(self, package: Package) -> Iterator[tuple[FragmentPackage, bool]]:
+        """Yields the fragments of a package and whether each is the last one, without copying the frame."""
+        message_id = next(self._message_ids) & 0xFFFFFFFF
+        buffers = [memoryview(buffer).cast("B") for buffer in package.to_buffers()]
+        total_size = sum(buffer.nbytes for buffer in buffers)
+        offset = 0
+
+        for buffer in buffers:
+            for start in range(0, buffer.nbytes, self.fragment_size):
+                fragment = buffer[start:start + self.fragment_size]
+
+                yield FragmentPackage(
+                    package.timestamp, message_id, offset, total_size, fragment
+                ), offset + fragment.nbytes == total_size
+
+                offset += fragment.nbytes
+
+
+class FragmentReassembler:
+    """Restores the packages a SendScheduler split into FragmentPackages.
+
+    The fragments of one package arrive in order, but fragments of different packages and
+    other packages may arrive between them. The frame of a pending package grows with its
+    received fragments, never with the size they announce. A package whose fragments stopped
+    arriving is dropped once max_messages newer packages are pending, or when the pending
+    frames would exceed max_pending bytes.
+    """
+
+    def __init__(
+            self,
+            decoder: Callable[[bytearray], Package] | None = None,
+            max_size: int = MAX_FRAME_SIZE,
+            max_messages: int = 16,
+            max_pending: int = MAX_FRAME_SIZE
+    ):
+        """Creates a reassembler without pending packages.
+
+        :param decoder: The function that converts a restored frame into a package, defaults to
+            get_package. Pass the decode method of the codec of the connection, so the frame is
+            checked against the negotiated capabilities like any other received frame.
+        :param max_size: The largest split frame accepted, like the frame limit of a PackageFrameDecoder.
+        :param max_messages: The maximum number of pending packages, the one that received no
+            fragment for the longest time is dropped first.
+        :param max_pending: The maximum number of received bytes of all pending packages together.
+        """
+        self.decoder = decoder or get_package
+        self.max_size = max_size
+        self.max_messages = max_messages
+        self.max_pending = max_pending
+
+        # The number of pending packages dropped to stay within max_messages and max_pending
+        self.evicted = 0
+
+        # The announced size and the received bytes per message identifier, the least recently received first
+        self._messages: dict[int, tuple[int, bytearray]] = {}
+
+    @property
+    def pending(self) -> int:
+        """The number of packages that are not complete yet."""
+        return len(self._messages)
+
+    @property
+    def pending_bytes(self) -> int:
+        """The number of received bytes of the packages that are not complete yet."""
+        return sum(len(frame) for _, frame in self._messages.values())
+
+    def receive(self, package: Package) -> Package | None:
+        """Adds a received package and returns the package that is complete with it.
+
+        :param package: Any received package.
+        :return: The package itself when it is not a fragment, the restored package after its
+            last fragment and None after any other fragment.
+        :raises ValueError: When a fragment is out of order or the frame is larger than max_size
+            or max_pending.
+        """
+        if not isinstance(package, FragmentPackage):
+            return package
+
+        fragment = package.payload
+        total_size, frame = self._messages.pop(package.message_id, (package.total_size, None))
+
+        if frame is None:
+            limit = min(self.max_size, self.max_pending)
+
+            if total_size > limit:
+                raise ValueError(f"Split frame of {total_size} bytes exceeds {limit} bytes")
+
+            frame = bytearray()
+
+        out_of_order = package.offset != len(frame) or package.total_size != total_size
+
+        if out_of_order or len(frame) + fragment.nbytes > total_size:
+            raise ValueError(f"Fragment at {package.offset} of message {package.message_id} does not follow "
+                             f"the {len(frame)} received bytes")
+
+        frame += fragment
+
+        if len(frame) < total_size:
+            # The packages that received no fragment for the longest time make room
+            while self._messages and (
+                    len(self._messages) >= self.max_messages or self.pending_bytes + len(frame) > self.max_pending
+            ):
+                del self._messages[next(iter(self._messages))]
+                self.evicted += 1
+
+            self._messages[package.message_id] = (total_size, frame)
+            return None
+
+        return self.decoder(frame)
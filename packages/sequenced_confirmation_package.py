@@ -0,0 +1,33 @@
+from .confirmation_package import ConfirmationPackage
+from .fields import U64
+from .registry import register_package
+
+
+@register_package
+class SequencedConfirmationPackage(ConfirmationPackage, identifier=0x15, fields={"sequence": U64, "cumulative": U64}):
+    """A confirmation that also carries the sequence number of the confirmed request.
+
+    Requests are numbered by the TracedPackage they are sent in. Besides the request it
+    confirms, the package confirms every request below the cumulative sequence number,
+    so a lost confirmation is repaired by the next one.
+    """
+
+    __slots__ = ("sequence", "cumulative")
+
+    def __init__(
+            self,
+            timestamp: float | None = None,
+            confirmed_request_id: int = 1,
+            confirmed_request_timestamp: int = 0,
+            sequence: int = 0,
+            cumulative: int = 0
+    ):
+        """Creates a sequenced confirmation package.
+
+        :param sequence: The sequence number of the confirmed request.
+        :param cumulative: The sequence number below which all requests are confirmed.
+        """
+        super().__init__(timestamp, confirmed_request_id, confirmed_request_timestamp)
+
+        self.sequence = sequence
+        self.cumulative = cumulative
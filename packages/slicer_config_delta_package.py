@@ -0,0 +1,98 @@
+from typing import Mapping
+
+from .package import frame_struct, Package
+from .registry import register_package
+
+
+# Format: ! (Network), I (Size), B (ID), L (Timestamp), Q (Base hash), Q (Target hash), I (Section count),
+# followed by I (Name length) and i (Content length, -1 for a removed section) per section and the
+# UTF-8 encoded names and contents
+@register_package
+class SlicerConfigDeltaPackage(Package, identifier=0x19, struct_format="!IBLQQI"):
+    """A package for transferring the sections of slicer_config.ini that changed since a version.
+
+    Versions are identified by the hash of their content, see packages.slicer_config_sync. The
+    receiver applies the sections to the version with the base hash and must end up with the
+    target hash. A package without sections whose hashes are equal acknowledges a version.
+    """
+
+    __slots__ = ("base_hash", "target_hash", "sections")
+
+    def __init__(
+            self,
+            timestamp: float | None = None,
+            base_hash: int = 0,
+            target_hash: int = 0,
+            sections: Mapping[str, str | None] | None = None
+    ):
+        """Creates a slicer config delta package.
+
+        :param base_hash: The hash of the version the sections apply to.
+        :param target_hash: The hash of the version after applying the sections.
+        :param sections: The changed or added sections by name, each with its header line, and
+            None for removed sections. The preamble before the first section has the name ''.
+        """
+        super().__init__(timestamp)
+
+        self.base_hash = base_hash
+        self.target_hash = target_hash
+        self.sections = dict(sections or {})
+
+    def to_bytes(self) -> bytes:
+        """Converts the current package to a bytes object."""
+        names = [name.encode("utf-8") for name in self.sections]
+        encoded_sections = [b"" if content is None else content.encode("utf-8") for content in self.sections.values()]
+        lengths = [-1 if content is None else len(encoded)
+                   for content, encoded in zip(self.sections.values(), encoded_sections)]
+
+        count = len(names)
+        package_struct = frame_struct(
+            self.format, f"{count}I{count}i", sum(map(len, names)) + sum(map(len, encoded_sections))
+        )
+
+        return package_struct.pack(
+            package_struct.size,
+            self.identifier,
+            int(self.timestamp),
+            self.base_hash,
+            self.target_hash,
+            count,
+            *map(len, names),
+            *lengths,
+            b"".join(names + encoded_sections)
+        )
+
+    @classmethod
+    def to_package(cls, data: bytes):
+        """Convert a bytes object into a SlicerConfigDeltaPackage.
+
+        :param data: The data package
+        :return: The bytes object as a SlicerConfigDeltaPackage
+        """
+        identifier = data[4]
+
+        # Check if identifier matches this package
+        if identifier != cls.identifier:
+            raise ValueError(f"Package identifier for {__name__} "
+                             f"must be {cls.identifier}. Found {identifier}")
+
+        package = cls._header.unpack_from(data)
+        count = package[5]
+
+        lengths_struct = frame_struct("!", f"{count}I{count}i")
+        lengths = lengths_struct.unpack_from(data, cls._header.size)
+
+        view = memoryview(data)
+        offset = cls._header.size + lengths_struct.size
+        strings = []
+
+        for length in lengths:
+            strings.append(None if length < 0 else str(view[offset:offset + length], "utf-8"))
+            offset += max(length, 0)
+
+        return SlicerConfigDeltaPackage(
+            timestamp=package[2],
+            base_hash=package[3],
+            target_hash=package[4],
+            sections=dict(zip(strings[:count], strings[count:]))
+        )
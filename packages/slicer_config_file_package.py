@@ -1,49 +1,38 @@
-import struct
-import time
+from .fields import BYTES
+from .package import Package, payload_view
+from .registry import register_package
 
-from .package import Package
 
-
-class SlicerConfigFilePackage(Package):
+@register_package
+class SlicerConfigFilePackage(Package, identifier=0x09, fields={"_config_content": BYTES}):
     """A package for transferring the full slicer_config.ini content."""
 
-    def __init__(self, timestamp: int = time.time(), config_content: str = ""):
-        """Creates the slicer config file package."""
-        # Using 0x09 as the identifier
-        super().__init__(0x09, "!IBLI")
-
-        self.timestamp = timestamp
-        self.config_content = config_content
+    __slots__ = ("_config_content",)
 
-    def to_bytes(self) -> bytes:
-        """Converts the current package to a bytes object."""
-        content_bytes = self.config_content.encode("utf-8")
-        package_format = self.format + f"{len(content_bytes)}s"
+    def __init__(self, timestamp: float | None = None, config_content: str | bytes | memoryview = ""):
+        """Creates the slicer config file package.
 
-        return struct.pack(
-            package_format,
-            struct.calcsize(package_format),  # Item 1: Size (I)
-            self.identifier,                  # Item 2: ID (B)
-            int(self.timestamp),              # Item 3: Timestamp (L)
-            len(content_bytes),               # Item 4: Length (I)
-            content_bytes                     # Item 5: String (s)
-        )
+        :param config_content: The content of slicer_config.ini. Any bytes-like object holding
+            the UTF-8 encoded content is sent without copying it.
+        """
+        super().__init__(timestamp)
 
-    def to_package(self, data: bytes):
-        """Convert a bytes object into a SlicerConfigFilePackage."""
-        identifier = data[4]
-
-        if identifier != self.identifier:
-            raise ValueError(f"Package identifier for {__name__} "
-                             f"must be {self.identifier}. Found {identifier}")
+        self.config_content = config_content
 
-        # Read the fixed header size
-        header_size = struct.calcsize(self.format)
-        package = struct.unpack(self.format, data[0:header_size])
+    @property
+    def config_content(self) -> str:
+        """The content of slicer_config.ini, decoded on access when it was received as bytes."""
+        if isinstance(self._config_content, str):
+            return self._config_content
 
-        timestamp = package[2]
+        return str(self._config_content, "utf-8")
 
-        # Read the rest of the data as the string
-        config_content = data[header_size:].decode("utf-8")
+    @config_content.setter
+    def config_content(self, config_content: str | bytes | memoryview):
+        """Sets the content of slicer_config.ini."""
+        self._config_content = config_content
 
-        return SlicerConfigFilePackage(timestamp=timestamp, config_content=config_content)
+    @property
+    def payload(self) -> memoryview:
+        """The UTF-8 encoded content of slicer_config.ini as a flat byte view."""
+        return payload_view(self._config_content)
@@ -0,0 +1,161 @@
+from collections import OrderedDict
+import hashlib
+import re
+
+from .slicer_config_delta_package import SlicerConfigDeltaPackage
+from .slicer_config_file_package import SlicerConfigFilePackage
+
+# The hash of no known version, a receiver acknowledges it to request the full file
+UNKNOWN = 0
+
+# A section header such as [printer] at the start of a line
+SECTION_HEADER = re.compile(r"^\[([^\]\n]+)\]", re.MULTILINE)
+
+
+def config_hash(content: str) -> int:
+    """Returns the 64-bit hash that identifies a version of slicer_config.ini or one of its sections."""
+    return int.from_bytes(hashlib.blake2b(content.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def split_sections(content: str) -> dict[str, str] | None:
+    """Splits slicer_config.ini into its sections without normalizing them.
+
+    Every section keeps its header line, comments and whitespace, so joining the values gives
+    the original content. The preamble before the first section has the name ''.
+
+    :param content: The content of slicer_config.ini.
+    :return: The sections by name in file order, None when a section name appears twice.
+    """
+    headers = list(SECTION_HEADER.finditer(content))
+    names = [""] + [header.group(1) for header in headers]
+    bounds = [0] + [header.start() for header in headers] + [len(content)]
+
+    sections = {name: content[start:end] for name, start, end in zip(names, bounds, bounds[1:])}
+
+    if len(sections) != len(names):
+        return None
+
+    return sections
+
+
+class SlicerConfigSender:
+    """Sends versions of slicer_config.ini as the sections that changed since the acknowledged one.
+
+    The section hashes of the last few versions are kept, so a delta can be sent from any of them.
+    The full file is sent when the peer has no known version or a delta would not be smaller.
+    """
+
+    def __init__(self, history: int = 8):
+        """Creates a sender without a version.
+
+        :param history: The number of versions a delta can be based on.
+        """
+        self.history = history
+        self.acknowledged = UNKNOWN
+        self.content = ""
+        self.hash = config_hash("")
+
+        self._sections: dict[str, str] | None = {}
+        self._versions: OrderedDict[int, dict[str, int] | None] = OrderedDict()
+
+    def update(self, content: str) -> SlicerConfigFilePackage | SlicerConfigDeltaPackage | None:
+        """Sets a new version and returns the package that brings the peer to it.
+
+        :param content: The new content of slicer_config.ini.
+        :return: The package to send, None when the peer acknowledged this version already.
+        """
+        self.content = content
+        self.hash = config_hash(content)
+        self._sections = split_sections(content)
+
+        self._versions[self.hash] = None if self._sections is None else {
+            name: config_hash(section) for name, section in self._sections.items()
+        }
+        self._versions.move_to_end(self.hash)
+
+        while len(self._versions) > self.history:
+            self._versions.popitem(last=False)
+
+        return self._package()
+
+    def acknowledge(self, ack: SlicerConfigDeltaPackage) -> SlicerConfigFilePackage | SlicerConfigDeltaPackage | None:
+        """Stores the version the peer acknowledged.
+
+        :param ack: The acknowledgement from the receiver.
+        :return: The package to send when the peer does not have the current version, otherwise None.
+        """
+        self.acknowledged = ack.target_hash
+
+        return self._package()
+
+    def _package(self) -> SlicerConfigFilePackage | SlicerConfigDeltaPackage | None:
+        """Returns the package that brings the peer from the acknowledged to the current version."""
+        if self.acknowledged == self.hash:
+            return None
+
+        base = self._versions.get(self.acknowledged)
+        sections = self._sections
+
+        if base is None or sections is None:
+            return SlicerConfigFilePackage(config_content=self.content)
+
+        # The receiver replaces sections in place and appends new ones, other orders need the full file
+        order = [name for name in base if name in sections] + [name for name in sections if name not in base]
+        if order != list(sections):
+            return SlicerConfigFilePackage(config_content=self.content)
+
+        changed: dict[str, str | None] = {
+            name: section for name, section in sections.items() if base.get(name) != config_hash(section)
+        }
+        changed.update((name, None) for name in base if name not in sections)
+
+        if sum(len(section) for section in changed.values() if section is not None) >= len(self.content):
+            return SlicerConfigFilePackage(config_content=self.content)
+
+        return SlicerConfigDeltaPackage(base_hash=self.acknowledged, target_hash=self.hash, sections=changed)
+
+
+class SlicerConfigReceiver:
+    """Applies full files and deltas of slicer_config.ini and acknowledges the resulting version."""
+
+    def __init__(self, content: str | None = None):
+        """Creates a receiver.
+
+        :param content: The version of slicer_config.ini the receiver starts with, if any.
+        """
+        self.content = content
+        self.hash = UNKNOWN if content is None else config_hash(content)
+
+    def receive(self, package: SlicerConfigFilePackage | SlicerConfigDeltaPackage) -> SlicerConfigDeltaPackage:
+        """Applies a received package to the current version.
+
+        A delta that does not apply to the current version, or does not result in its target
+        version, is ignored and the acknowledgement makes the sender send another package.
+
+        :param package: The full file or delta from the sender.
+        :return: The acknowledgement of the version the receiver has now.
+        """
+        if isinstance(package, SlicerConfigFilePackage):
+            self.content = package.config_content
+            self.hash = config_hash(self.content)
+
+        elif self.content is not None and package.base_hash == self.hash:
+            sections = split_sections(self.content)
+
+            if sections is not None:
+                for name, section in package.sections.items():
+                    if section is None:
+                        sections.pop(name, None)
+                    else:
+                        sections[name] = section
+
+                content = "".join(sections.values())
+
+                if config_hash(content) == package.target_hash:
+                    self.content = content
+                    self.hash = package.target_hash
+                else:
+                    # The sender has a different idea of the current version, ask for the full file
+                    return SlicerConfigDeltaPackage(base_hash=UNKNOWN, target_hash=UNKNOWN)
+
+        return SlicerConfigDeltaPackage(base_hash=self.hash, target_hash=self.hash)
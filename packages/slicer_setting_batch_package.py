@@ -0,0 +1,81 @@
+from typing import Iterable, Iterator
+
+from .package import frame_struct, Package
+from .registry import register_package
+
+
+# Format: ! (Network), I (Size), B (ID), L (Timestamp), I (Setting count), followed by I (Action, Key and
+# Value length) per setting and the UTF-8 encoded strings
+@register_package
+class SlicerSettingBatchPackage(Package, identifier=0x18, struct_format="!IBLI"):
+    """A package for transferring many slicer settings updates and requests in a single frame.
+
+    Every setting is an (action, key, value) triple like the fields of a SlicerSettingPackage,
+    for example a profile switch as one frame of 'set' actions.
+    """
+
+    __slots__ = ("settings",)
+
+    def __init__(self, timestamp: float | None = None, settings: Iterable[tuple[str, str, object]] = ()):
+        """Creates a slicer setting batch package.
+
+        :param settings: The (action, key, value) triples, values are converted to strings.
+        """
+        super().__init__(timestamp)
+
+        self.settings = [(action, key, str(value)) for action, key, value in settings]
+
+    def __len__(self) -> int:
+        """The number of settings."""
+        return len(self.settings)
+
+    def __iter__(self) -> Iterator[tuple[str, str, str]]:
+        """Iterates over the (action, key, value) triples."""
+        return iter(self.settings)
+
+    def to_bytes(self) -> bytes:
+        """Converts the current package to a bytes object."""
+        encoded = [string.encode("utf-8") for setting in self.settings for string in setting]
+
+        package_struct = frame_struct(self.format, f"{len(encoded)}I", sum(map(len, encoded)))
+
+        return package_struct.pack(
+            package_struct.size,
+            self.identifier,
+            int(self.timestamp),
+            len(self.settings),
+            *map(len, encoded),
+            b"".join(encoded)
+        )
+
+    @classmethod
+    def to_package(cls, data: bytes):
+        """Convert a bytes object into a SlicerSettingBatchPackage.
+
+        :param data: The data package
+        :return: The bytes object as a SlicerSettingBatchPackage
+        """
+        identifier = data[4]
+
+        # Check if identifier matches this package
+        if identifier != cls.identifier:
+            raise ValueError(f"Package identifier for {__name__} "
+                             f"must be {cls.identifier}. Found {identifier}")
+
+        package = cls._header.unpack_from(data)
+
+        lengths_struct = frame_struct("!", f"{3 * package[3]}I")
+        lengths = lengths_struct.unpack_from(data, cls._header.size)
+
+        view = memoryview(data)
+        offset = cls._header.size + lengths_struct.size
+        strings = []
+
+        for length in lengths:
+            strings.append(str(view[offset:offset + length], "utf-8"))
+            offset += length
+
+        batch = SlicerSettingBatchPackage(timestamp=package[2])
+        batch.settings = list(zip(strings[0::3], strings[1::3], strings[2::3]))
+
+        return batch
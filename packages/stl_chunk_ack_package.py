@@ -0,0 +1,25 @@
+from .fields import U32, U64
+from .package import Package
+from .registry import register_package
+
+
+@register_package
+class STLChunkAckPackage(Package, identifier=0x13, fields={"transfer_id": U32, "offset": U64}):
+    """A package to acknowledge the received part of a chunked stl transfer.
+
+    The receiver also sends it when a transfer is resumed, so the sender continues from
+    the offset the receiver already has on disk.
+    """
+
+    __slots__ = ("transfer_id", "offset")
+
+    def __init__(self, timestamp: float | None = None, transfer_id: int = 0, offset: int = 0):
+        """Creates a stl chunk acknowledgement package.
+
+        :param transfer_id: The identifier of the acknowledged transfer.
+        :param offset: The number of bytes the receiver has stored.
+        """
+        super().__init__(timestamp)
+
+        self.transfer_id = transfer_id
+        self.offset = offset
@@ -0,0 +1,42 @@
+from .fields import BYTES, U32, U64
+from .package import Package, payload_view
+from .registry import register_package
+
+
+@register_package
+class STLChunkPackage(Package, identifier=0x12, fields={
+    "transfer_id": U32,
+    "offset": U64,
+    "total_size": U64,
+    "chunk": BYTES,
+}):
+    """A data package for transferring one chunk of a chunked stl transfer."""
+
+    __slots__ = ("transfer_id", "offset", "total_size", "chunk")
+
+    def __init__(
+            self,
+            timestamp: float | None = None,
+            transfer_id: int = 0,
+            offset: int = 0,
+            total_size: int = 0,
+            chunk: bytes | memoryview = b""
+    ):
+        """Creates a stl chunk package.
+
+        :param transfer_id: The identifier of the transfer the chunk belongs to.
+        :param offset: The position of the chunk in the STL file.
+        :param total_size: The size of the complete STL file.
+        :param chunk: The content of the chunk. Any bytes-like object is sent without copying it.
+        """
+        super().__init__(timestamp)
+
+        self.transfer_id = transfer_id
+        self.offset = offset
+        self.total_size = total_size
+        self.chunk = chunk
+
+    @property
+    def payload(self) -> memoryview:
+        """The content of the chunk as a flat byte view."""
+        return payload_view(self.chunk)
@@ -0,0 +1,146 @@
+import os
+import re
+import struct
+from typing import Sequence
+
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("packages.stl_mesh requires numpy, install it with 'pip install numpy'") from error
+
+from .stl_package import STLPackage
+
+# Binary STL: an 80 byte header and the number of triangles, followed by one 50 byte record per triangle
+HEADER_SIZE = 84
+TRIANGLE = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")])
+
+# The solid and endsolid lines with their names and the keywords of an ASCII STL file, in any case
+SOLID_LINE = re.compile(rb"^[ \t]*(?:end)?solid\b.*$", re.IGNORECASE | re.MULTILINE)
+KEYWORD = re.compile(rb"\b(?:facet|normal|outer|loop|vertex|endloop|endfacet)\b", re.IGNORECASE)
+
+
+class STLMesh:
+    """A read-only view of the triangles of a binary STL file as a NumPy structured array.
+
+    The triangles reference the STL payload or the memory mapped file, so nothing is parsed
+    or copied until a geometry query needs the coordinates. ASCII STL is converted to binary
+    once. Lengths are in the unit of the file, usually millimeters.
+    """
+
+    def __init__(self, data: bytes | bytearray | memoryview | np.ndarray):
+        """Creates a mesh from the content of a binary or ASCII STL file.
+
+        :param data: The content of the STL file.
+        """
+        if not is_binary(data):
+            data = ascii_to_binary(data)
+
+        count = struct.unpack_from("<I", data, 80)[0]
+
+        self.triangles = np.frombuffer(data, dtype=TRIANGLE, count=count, offset=HEADER_SIZE)
+
+    @classmethod
+    def from_package(cls, package: STLPackage) -> "STLMesh":
+        """Creates a mesh that references the payload of a STL package."""
+        return cls(package.payload)
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike) -> "STLMesh":
+        """Creates a mesh from a STL file, binary files are memory mapped instead of read."""
+        if os.path.getsize(path) < HEADER_SIZE:
+            with open(path, "rb") as file:
+                return cls(file.read())
+
+        return cls(np.memmap(path, dtype=np.uint8, mode="r"))
+
+    @property
+    def count(self) -> int:
+        """The number of triangles."""
+        return len(self.triangles)
+
+    @property
+    def vertices(self) -> np.ndarray:
+        """The corners of every triangle as an array of shape (count, 3, 3)."""
+        return self.triangles["vertices"]
+
+    @property
+    def normals(self) -> np.ndarray:
+        """The stored normal of every triangle as an array of shape (count, 3)."""
+        return self.triangles["normal"]
+
+    def bounding_box(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the minimum and maximum corner of the axis-aligned bounding box."""
+        if not self.count:
+            raise ValueError("The bounding box of an empty mesh is undefined")
+
+        vertices = self.vertices.reshape(-1, 3)
+
+        return vertices.min(axis=0).astype(np.float64), vertices.max(axis=0).astype(np.float64)
+
+    def surface_area(self) -> float:
+        """Returns the total area of all triangles."""
+        vertices = self.vertices.astype(np.float64)
+        cross = np.cross(vertices[:, 1] - vertices[:, 0], vertices[:, 2] - vertices[:, 0])
+
+        return float(np.linalg.norm(cross, axis=1).sum() / 2)
+
+    def volume(self) -> float:
+        """Returns the enclosed volume, only meaningful for a closed mesh."""
+        vertices = self.vertices.astype(np.float64)
+
+        # The sum of the signed volumes of the tetrahedra between the origin and every triangle
+        signed = np.einsum("ij,ij->i", vertices[:, 0], np.cross(vertices[:, 1], vertices[:, 2]))
+
+        return float(abs(signed.sum()) / 6)
+
+    def within_reach(self, reach: float, base: Sequence[float] = (0.0, 0.0, 0.0)) -> bool:
+        """Checks if every vertex lies within a distance of the robot base.
+
+        :param reach: The reach of the robot, see Robot.reach, in the unit of the mesh.
+        :param base: The position of the robot base in mesh coordinates.
+        :return: Whether the robot reaches the whole part.
+        """
+        offsets = self.vertices.reshape(-1, 3).astype(np.float64) - np.asarray(base, dtype=np.float64)
+
+        return bool(np.einsum("ij,ij->i", offsets, offsets).max(initial=0.0) <= float(reach) ** 2)
+
+    def to_bytes(self) -> bytes:
+        """Returns the mesh as the content of a binary STL file."""
+        return b"\0" * 80 + struct.pack("<I", self.count) + self.triangles.tobytes()
+
+
+def is_binary(data: bytes | bytearray | memoryview | np.ndarray) -> bool:
+    """Checks if STL content is binary, ASCII files start with "solid" in any case and do not match the binary size."""
+    size = memoryview(data).nbytes
+
+    if size >= HEADER_SIZE and size == HEADER_SIZE + TRIANGLE.itemsize * struct.unpack_from("<I", data, 80)[0]:
+        return True
+
+    if bytes(memoryview(data)[:5]).lower() == b"solid":
+        return False
+
+    raise ValueError(f"Data of {size} bytes is neither a binary nor an ASCII STL file")
+
+
+def ascii_to_binary(data: bytes | bytearray | memoryview | np.ndarray) -> bytes:
+    """Converts the content of an ASCII STL file to the content of a binary STL file.
+
+    :param data: The content of the ASCII STL file.
+    :return: The content of the equivalent binary STL file.
+    """
+    text = bytes(data)
+
+    # Without the solid lines and keywords only the numbers remain, NumPy parses them in one pass.
+    # A file may hold several solids, and some exporters write the keywords in upper case.
+    text = KEYWORD.sub(b" ", SOLID_LINE.sub(b" ", text))
+
+    numbers = np.fromstring(text, dtype=np.float32, sep=" ") if text.strip() else np.empty(0, np.float32)
+
+    if len(numbers) % 12:
+        raise ValueError(f"ASCII STL has {len(numbers)} numbers, which is not 12 per facet")
+
+    triangles = np.zeros(len(numbers) // 12, dtype=TRIANGLE)
+    triangles["normal"] = numbers.reshape(-1, 12)[:, :3]
+    triangles["vertices"] = numbers.reshape(-1, 12)[:, 3:].reshape(-1, 3, 3)
+
+    return b"\0" * 80 + struct.pack("<I", len(triangles)) + triangles.tobytes()
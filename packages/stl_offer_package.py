@@ -0,0 +1,40 @@
+import hashlib
+
+from .fields import fixed_bytes, U64
+from .package import Package
+from .registry import register_package
+from .stl_package import STLPackage
+
+
+@register_package
+class STLOfferPackage(Package, identifier=0x1A, fields={"digest": fixed_bytes(32), "size": U64}):
+    """A package that offers a STL file by its digest before its content is sent.
+
+    The receiver answers with a STLOfferReplyPackage, and the STLPackage with the content
+    follows only when the receiver does not have the file yet.
+    """
+
+    __slots__ = ("digest", "size")
+
+    def __init__(self, timestamp: float | None = None, digest: bytes = bytes(32), size: int = 0):
+        """Creates a stl offer package.
+
+        :param digest: The SHA-256 digest of the STL content.
+        :param size: The size of the STL content in bytes.
+        """
+        super().__init__(timestamp)
+
+        self.digest = digest
+        self.size = size
+
+    @classmethod
+    def from_package(cls, package: STLPackage, timestamp: float | None = None):
+        """Creates the offer of the content of a stl package.
+
+        :param package: The stl package to offer.
+        :param timestamp: The timestamp of the package, defaults to the package clock.
+        :return: The STLOfferPackage with the digest and size of the content
+        """
+        payload = package.payload
+
+        return cls(timestamp=timestamp, digest=hashlib.sha256(payload).digest(), size=payload.nbytes)
@@ -0,0 +1,21 @@
+from .fields import BOOL, fixed_bytes
+from .package import Package
+from .registry import register_package
+
+
+@register_package
+class STLOfferReplyPackage(Package, identifier=0x1B, fields={"digest": fixed_bytes(32), "present": BOOL}):
+    """A package that answers a STLOfferPackage with whether the receiver already has the file."""
+
+    __slots__ = ("digest", "present")
+
+    def __init__(self, timestamp: float | None = None, digest: bytes = bytes(32), present: bool = False):
+        """Creates a stl offer reply package.
+
+        :param digest: The SHA-256 digest of the offered STL content.
+        :param present: Whether the receiver has the content, otherwise it must be sent.
+        """
+        super().__init__(timestamp)
+
+        self.digest = digest
+        self.present = present
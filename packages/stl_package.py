@@ -1,60 +1,40 @@
-import struct
-import time
+import mmap
+import os
 
-from .package import Package
+from .fields import BYTES
+from .package import Package, payload_view
+from .registry import register_package
 
 
-class STLPackage(Package):
+@register_package
+class STLPackage(Package, identifier=0x03, fields={"stl": BYTES}):
     """A data package for transferring stl information."""
 
-    def __init__(self, timestamp: int = time.time(), stl: bytes = b""):
+    __slots__ = ("stl",)
+
+    def __init__(self, timestamp: float | None = None, stl: bytes | memoryview | str = b""):
         """Creates a stl package.
 
-        :param stl: The binary content of the STL file.
+        :param stl: The binary content of the STL file. Any bytes-like object is sent without copying it.
         """
-        super().__init__(0x03, "!IBLI")
+        super().__init__(timestamp)
 
-        self.timestamp = timestamp
         self.stl = stl
 
-    def to_bytes(self) -> bytes:
-        """Converts the current package to a bytes object."""
-        # Ensure stl is bytes
-        if isinstance(self.stl, str):
-            stl_bytes = self.stl.encode("utf-8")
-        else:
-            stl_bytes = self.stl
-
-        package_format = self.format + f"{len(stl_bytes)}s"
-
-        return struct.pack(
-            package_format,
-            struct.calcsize(package_format),
-            self.identifier,
-            int(self.timestamp),
-            len(stl_bytes),
-            stl_bytes
-        )
-
-    def to_package(self, data: bytes):
-        """Convert a bytes object into a STLPackage.
-
-        :param data: The data package
-        :return: The bytes object as a STLPackage
-        """
-        identifier = data[4]
-
-        # Check if identifier matches this package
-        if identifier != self.identifier:
-            raise ValueError(f"Package identifier for {__name__} "
-                             f"must be {self.identifier}. Found {identifier}")
+    @classmethod
+    def from_file(cls, path: str | os.PathLike, timestamp: float | None = None):
+        """Creates a stl package that maps the STL file into memory instead of reading it.
 
-        package = struct.unpack(self.format, data[0:struct.calcsize(self.format)])
-
-        # Convert bytes to correct data
-        timestamp = package[2]
+        :param path: The path of the STL file.
+        :param timestamp: The timestamp of the package, defaults to the package clock.
+        :return: The STLPackage with the mapped file as content
+        """
+        with open(path, "rb") as file:
+            stl = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(file.fileno()).st_size else b""
 
-        # Extract the remaining data as bytes (do not decode)
-        stl_data = data[struct.calcsize(self.format):]
+        return cls(timestamp=timestamp, stl=stl)
 
-        return STLPackage(timestamp=timestamp, stl=stl_data)
+    @property
+    def payload(self) -> memoryview:
+        """The content of the STL file as a flat byte view."""
+        return payload_view(self.stl)
@@ -0,0 +1,144 @@
+from collections import OrderedDict
+import hashlib
+import os
+import pathlib
+from typing import Callable
+
+from .package import Package, payload_view
+from .package_stream import PackageStream
+from .stl_offer_package import STLOfferPackage
+from .stl_offer_reply_package import STLOfferReplyPackage
+from .stl_package import STLPackage
+
+
+class STLStore:
+    """A content-addressed directory of STL files with least recently used eviction.
+
+    Files are stored as ``<SHA-256 digest>.stl``. The modification time of a file is its last
+    use, so the eviction order survives restarts. When the files exceed max_size, the least
+    recently used ones are deleted, the most recently used file is always kept.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_size: int = 1 << 30):
+        """Creates a store in a directory and indexes the files already in it.
+
+        :param directory: The directory of the stored files.
+        :param max_size: The maximum total size of the stored files in bytes.
+        """
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.size = 0
+
+        # The size of every stored file by digest, from the least to the most recently used
+        self._files: OrderedDict[bytes, int] = OrderedDict()
+
+        for path in sorted(self.directory.glob("*.stl"), key=lambda path: path.stat().st_mtime):
+            try:
+                digest = bytes.fromhex(path.stem)
+            except ValueError:
+                # Not a file of the store
+                continue
+
+            self._files[digest] = path.stat().st_size
+            self.size += self._files[digest]
+
+    def __len__(self) -> int:
+        """The number of stored files."""
+        return len(self._files)
+
+    def __contains__(self, digest: bytes) -> bool:
+        """Whether a file with the digest is stored, it counts as a use."""
+        if digest not in self._files:
+            return False
+
+        try:
+            os.utime(self.path(digest))
+        except FileNotFoundError:
+            # Deleted by someone else
+            self.size -= self._files.pop(digest)
+            return False
+
+        self._files.move_to_end(digest)
+
+        return True
+
+    def path(self, digest: bytes) -> pathlib.Path:
+        """The path of the file with a digest."""
+        return self.directory / f"{digest.hex()}.stl"
+
+    def get(self, digest: bytes) -> STLPackage | None:
+        """Returns a stl package that maps the stored file with a digest, None when it is not stored."""
+        if digest not in self:
+            return None
+
+        return STLPackage.from_file(self.path(digest))
+
+    def put(self, stl: bytes | memoryview) -> bytes:
+        """Stores STL content unless a file with the same content is stored already.
+
+        :param stl: The binary content of the STL file.
+        :return: The digest of the content.
+        """
+        payload = payload_view(stl)
+        digest = hashlib.sha256(payload).digest()
+
+        if digest not in self:
+            # Write under another name first, so an interrupted write is never taken for the file
+            path = self.path(digest)
+            part_path = path.with_suffix(".stl.part")
+            part_path.write_bytes(payload)
+            os.replace(part_path, path)
+
+            self._files[digest] = payload.nbytes
+            self.size += payload.nbytes
+            self._evict()
+
+        return digest
+
+    def answer(self, offer: STLOfferPackage) -> STLOfferReplyPackage:
+        """Returns the reply to an offer, telling the sender whether to send the content."""
+        return STLOfferReplyPackage(digest=offer.digest, present=offer.digest in self)
+
+    def receive(self, package: STLPackage) -> pathlib.Path:
+        """Stores the content of a received stl package and returns the path of the file."""
+        return self.path(self.put(package.payload))
+
+    def _evict(self):
+        """Deletes the least recently used files until the store fits into max_size."""
+        while self.size > self.max_size and len(self._files) > 1:
+            digest, size = self._files.popitem(last=False)
+            self.size -= size
+            self.path(digest).unlink(missing_ok=True)
+
+
+async def send_stl(
+        stream: PackageStream,
+        package: STLPackage,
+        on_package: Callable[[Package], None] | None = None
+) -> bool:
+    """Offers a STL file to the peer and sends its content only when the peer does not have it.
+
+    The peer answers the STLOfferPackage with a STLOfferReplyPackage, for example from an STLStore.
+
+    :param stream: The stream to the peer.
+    :param package: The stl package to send.
+    :param on_package: Called with every other package received while waiting for the reply.
+    :return: Whether the content was sent.
+    """
+    offer = STLOfferPackage.from_package(package)
+    await stream.send(offer)
+
+    while True:
+        reply = await stream.receive()
+
+        if isinstance(reply, STLOfferReplyPackage) and reply.digest == offer.digest:
+            break
+
+        if on_package is not None:
+            on_package(reply)
+
+    if not reply.present:
+        await stream.send(package)
+
+    return not reply.present
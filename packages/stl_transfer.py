@@ -0,0 +1,151 @@
+import mmap
+import os
+import pathlib
+import secrets
+from typing import BinaryIO, Iterator
+
+from .progress_package import ProgressPackage
+from .stl_chunk_ack_package import STLChunkAckPackage
+from .stl_chunk_package import STLChunkPackage
+
+
+class STLTransferSender:
+    """Sends a STL file in chunks and resumes from the last acknowledged offset.
+
+    The file is memory mapped and every chunk references it, so the file is never read
+    into memory as a whole. Progress is derived from the acknowledged byte counts.
+    """
+
+    def __init__(self, path: str | os.PathLike, transfer_id: int | None = None, chunk_size: int = 1 << 20):
+        """Creates a sender for a STL file.
+
+        :param path: The path of the STL file.
+        :param transfer_id: The identifier of the transfer, pass the same one to resume a transfer
+            after a restart. Defaults to a random identifier.
+        :param chunk_size: The maximum number of bytes per chunk.
+        """
+        self.path = pathlib.Path(path)
+        self.transfer_id = secrets.randbits(32) if transfer_id is None else transfer_id
+        self.chunk_size = chunk_size
+        self.acknowledged = 0
+
+        with open(self.path, "rb") as file:
+            self.total_size = os.fstat(file.fileno()).st_size
+            self._content = memoryview(
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if self.total_size else b""
+            )
+
+    @property
+    def done(self) -> bool:
+        """Whether the receiver acknowledged the complete file."""
+        return self.acknowledged >= self.total_size
+
+    def chunks(self) -> Iterator[STLChunkPackage]:
+        """Yields the chunks from the last acknowledged offset to the end of the file."""
+        # An empty file is still sent as a single empty chunk, so the receiver completes it
+        for offset in range(self.acknowledged, max(self.total_size, 1), self.chunk_size):
+            yield STLChunkPackage(
+                transfer_id=self.transfer_id,
+                offset=offset,
+                total_size=self.total_size,
+                chunk=self._content[offset:offset + self.chunk_size]
+            )
+
+    def acknowledge(self, ack: STLChunkAckPackage) -> ProgressPackage:
+        """Stores the offset the receiver acknowledged and returns the resulting progress.
+
+        The receiver is authoritative, an offset lower than a previous one means it lost data
+        and the next call to chunks continues from there.
+
+        :param ack: The acknowledgement from the receiver.
+        :return: The progress of the transfer in percent.
+        """
+        if ack.transfer_id != self.transfer_id:
+            raise ValueError(f"Acknowledgement for transfer {ack.transfer_id} "
+                             f"does not belong to transfer {self.transfer_id}")
+
+        self.acknowledged = min(ack.offset, self.total_size)
+
+        return self.progress()
+
+    def progress(self) -> ProgressPackage:
+        """Returns the acknowledged part of the transfer in percent."""
+        return ProgressPackage(
+            progress=100.0 * self.acknowledged / self.total_size if self.total_size else 100.0
+        )
+
+    def close(self):
+        """Releases the STL file, it is unmapped once no chunk references it anymore."""
+        self._content.release()
+
+
+class STLTransferReceiver:
+    """Appends received STL chunks straight to disk and acknowledges them.
+
+    Incomplete transfers are stored as ``<transfer id>.stl.part`` and renamed to
+    ``<transfer id>.stl`` once complete, so a restarted receiver can resume them.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        """Creates a receiver that stores transfers in the given directory."""
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._files: dict[int, BinaryIO] = {}
+
+    def path(self, transfer_id: int) -> pathlib.Path:
+        """The path of the completed STL file of a transfer."""
+        return self.directory / f"{transfer_id:08x}.stl"
+
+    def offset(self, transfer_id: int) -> int:
+        """The number of bytes of a transfer that are stored on disk."""
+        for path in (self.path(transfer_id), self.path(transfer_id).with_suffix(".stl.part")):
+            if path.exists():
+                return path.stat().st_size
+
+        return 0
+
+    def resume(self, transfer_id: int) -> STLChunkAckPackage:
+        """Returns the acknowledgement that tells the sender where to continue a transfer."""
+        return STLChunkAckPackage(transfer_id=transfer_id, offset=self.offset(transfer_id))
+
+    def receive(self, chunk: STLChunkPackage) -> STLChunkAckPackage:
+        """Appends a chunk to its transfer and returns the acknowledgement for the sender.
+
+        Chunks that were already stored are skipped. A chunk after a gap is not stored, the
+        acknowledgement then makes the sender continue from the end of the stored data.
+
+        :param chunk: The received chunk.
+        :return: The acknowledgement with the number of stored bytes.
+        """
+        transfer_id = chunk.transfer_id
+
+        if transfer_id not in self._files and self.path(transfer_id).exists():
+            return self.resume(transfer_id)
+
+        part_file = self._files.get(transfer_id)
+        if part_file is None:
+            part_file = self._files[transfer_id] = open(self.path(transfer_id).with_suffix(".stl.part"), "ab")
+
+        offset = part_file.tell()
+        payload = chunk.payload
+        stored = offset - chunk.offset
+
+        if 0 <= stored < payload.nbytes:
+            part_file.write(payload[stored:])
+            part_file.flush()
+            offset += payload.nbytes - stored
+
+        if offset >= chunk.total_size:
+            del self._files[transfer_id]
+            part_file.close()
+            os.replace(part_file.name, self.path(transfer_id))
+
+        return STLChunkAckPackage(transfer_id=transfer_id, offset=offset)
+
+    def close(self):
+        """Closes the files of all incomplete transfers, they can be resumed later."""
+        for part_file in self._files.values():
+            part_file.close()
+
+        self._files.clear()
@@ -0,0 +1,149 @@
+try:
+    import numpy as np
+except ImportError as error:
+    raise ImportError("packages.telemetry requires numpy, install it with 'pip install numpy'") from error
+
+from .batch import decode_many, dtype, FIELDS
+from .package import Package
+
+
+class TelemetryRing:
+    """A preallocated ring buffer with the most recent packages of one fixed-size package type.
+
+    Packages are stored as records of the frame dtype of packages.batch, so the memory use
+    depends only on the capacity. Once full, new packages overwrite the oldest ones.
+    """
+
+    def __init__(self, package_type: type[Package], capacity: int = 1 << 16):
+        """Creates an empty ring buffer.
+
+        :param package_type: One of the package types in packages.batch.FIELDS.
+        :param capacity: The maximum number of stored packages.
+        """
+        self.package_type = package_type
+        self.capacity = capacity
+        self.value_field = FIELDS[package_type][3]
+
+        self._records = np.zeros(capacity, dtype=dtype(package_type))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """The number of stored packages."""
+        return self._count
+
+    def append(self, package: Package):
+        """Stores a decoded package."""
+        self._records[self._next] = (
+            self._records.dtype.itemsize,
+            package.identifier,
+            int(package.timestamp),
+            *(getattr(package, name) for name in FIELDS[self.package_type][3:])
+        )
+
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def extend(self, records: np.ndarray):
+        """Stores many records of the frame dtype, see packages.batch.decode_many."""
+        records = records[-self.capacity:]
+        first = min(len(records), self.capacity - self._next)
+
+        self._records[self._next:self._next + first] = records[:first]
+        self._records[:len(records) - first] = records[first:]
+
+        self._next = (self._next + len(records)) % self.capacity
+        self._count = min(self._count + len(records), self.capacity)
+
+    def extend_frames(self, data: bytes | bytearray | memoryview):
+        """Stores consecutive raw frames of the package type without decoding them one by one."""
+        self.extend(decode_many(self.package_type, data))
+
+    def records(self) -> np.ndarray:
+        """Returns a copy of the stored records from the oldest to the newest."""
+        return np.concatenate(self._segments())
+
+    def query(self, start: float, end: float) -> np.ndarray:
+        """Returns the stored records with a timestamp in [start, end) from the oldest to the newest.
+
+        Packages are expected in the order of their timestamps, so both parts of the ring are
+        sorted and only the records in the range are copied.
+        """
+        matches = []
+        for segment in self._segments():
+            timestamps = segment["timestamp"]
+            matches.append(segment[np.searchsorted(timestamps, start):np.searchsorted(timestamps, end)])
+
+        return np.concatenate(matches)
+
+    def _segments(self) -> tuple[np.ndarray, ...]:
+        """Returns views of the stored records from the oldest to the newest, the second part wrapped around."""
+        if self._count < self.capacity:
+            return (self._records[:self._count],)
+
+        return self._records[self._next:], self._records[:self._next]
+
+    def downsample(self, start: float, end: float, buckets: int, field: str | None = None) -> dict[str, np.ndarray]:
+        """Reduces the values in [start, end) to the minimum, maximum and mean of equally long buckets.
+
+        :param start: The start of the time range, inclusive.
+        :param end: The end of the time range, exclusive.
+        :param buckets: The number of buckets, for example the width of a chart in pixels.
+        :param field: The field to reduce, defaults to the value of the package type.
+        :return: Arrays of length buckets with the start time, count, min, max and mean of every
+            bucket. Empty buckets have a count of 0 and NaN values.
+        """
+        records = self.query(start, end)
+        values = records[field or self.value_field].astype(np.float64)
+
+        width = (end - start) / buckets
+        index = np.minimum(((records["timestamp"] - start) / width).astype(np.intp), buckets - 1)
+
+        count = np.bincount(index, minlength=buckets)
+        minimum = np.full(buckets, np.inf)
+        maximum = np.full(buckets, -np.inf)
+        np.minimum.at(minimum, index, values)
+        np.maximum.at(maximum, index, values)
+
+        empty = count == 0
+        minimum[empty] = maximum[empty] = np.nan
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.bincount(index, weights=values, minlength=buckets) / count
+
+        return {
+            "time": start + width * np.arange(buckets),
+            "count": count,
+            "min": minimum,
+            "max": maximum,
+            "mean": mean
+        }
+
+
+class TelemetryStore:
+    """Keeps one telemetry ring buffer per package type, for example for one robot."""
+
+    def __init__(self, capacity: int = 1 << 16):
+        """Creates an empty store.
+
+        :param capacity: The number of packages kept per package type.
+        """
+        self.capacity = capacity
+
+        self._rings: dict[type[Package], TelemetryRing] = {}
+
+    def __getitem__(self, package_type: type[Package]) -> TelemetryRing:
+        """Returns the ring buffer of a package type, creating it on first use."""
+        ring = self._rings.get(package_type)
+        if ring is None:
+            ring = self._rings[package_type] = TelemetryRing(package_type, self.capacity)
+
+        return ring
+
+    def add(self, package: Package):
+        """Stores a decoded or frozen package in the ring buffer of its type."""
+        self[package.package_type].append(package)
+
+    def add_frames(self, package_type: type[Package], data: bytes | bytearray | memoryview):
+        """Stores consecutive raw frames of one package type."""
+        self[package_type].extend_frames(data)
@@ -0,0 +1,33 @@
+from packages import ConfirmationPackage, RollPackage, TemperaturePackage
+import pytest
+
+np = pytest.importorskip("numpy")
+batch = pytest.importorskip("packages.batch")
+
+
+def test_decode_many_matches_single_packages():
+    """Tests if a buffer of frames decodes to the same values as single packages."""
+    data = b"".join(RollPackage(1762330645 + index, index - 50).to_bytes() for index in range(100))
+
+    frames = batch.decode_many(RollPackage, data)
+
+    assert frames["degrees"].tolist() == list(range(-50, 50))
+    assert frames["timestamp"][-1] == 1762330744
+
+
+def test_encode_many_matches_single_packages():
+    """Tests if encoded columns are byte-identical to single packages."""
+    data = batch.encode_many(TemperaturePackage, {
+        "timestamp": np.array([1762330645, 1762330646]),
+        "temperature": np.array([43.8, 21.5])
+    })
+
+    assert data == TemperaturePackage(1762330645, 43.8).to_bytes() + TemperaturePackage(1762330646, 21.5).to_bytes()
+
+
+def test_decode_many_rejects_other_packages():
+    """Tests if frames of another type are rejected."""
+    data = ConfirmationPackage(1762330645, 8, 1762330645).to_bytes()
+
+    with pytest.raises(ValueError):
+        batch.decode_many(ConfirmationPackage, data + RollPackage(1762330645, 90).to_bytes() + b"\x00")
@@ -0,0 +1,62 @@
+import asyncio
+
+from packages import BroadcastHub, ConsolePackage, PackageStream, STLPackage
+import pytest
+
+
+def test_frozen_package_encodes_once():
+    """Tests if a frozen package reuses its bytes and rejects changes."""
+    package = ConsolePackage(timestamp=1, console_msg="G1 X10")
+    frozen = package.freeze()
+
+    assert frozen.to_bytes() is frozen.to_bytes()
+    assert frozen.to_bytes() == package.to_bytes()
+    assert (frozen.identifier, frozen.console_msg, frozen.freeze()) == (package.identifier, "G1 X10", frozen)
+
+    with pytest.raises(AttributeError):
+        frozen.timestamp = 2
+
+
+def test_broadcast_hub_sends_to_every_subscriber():
+    """Tests if every subscriber receives the broadcast packages and slow ones are skipped."""
+    async def run():
+        hub = BroadcastHub(high_water=1 << 16)
+        subscribed = asyncio.Event()
+        streams = []
+
+        async def subscribe(stream: PackageStream):
+            hub.subscribe(stream)
+            streams.append(stream)
+            if len(hub) == 3:
+                subscribed.set()
+
+            # Keep the connection until the client closes it
+            async for _ in stream:
+                pass
+
+        server = await PackageStream.start_server(subscribe, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            clients = [await PackageStream.connect("127.0.0.1", port) for _ in range(3)]
+            await subscribed.wait()
+
+            delivered = [hub.broadcast(ConsolePackage(timestamp=1, console_msg=f"line {index}").freeze())
+                         for index in range(10)]
+            received = [[str((await client.receive()).payload, "utf-8") for _ in range(10)] for client in clients]
+
+            # Nobody reads the large package, so the next broadcast finds every buffer above the mark
+            hub.broadcast(STLPackage(timestamp=1, stl=bytes(16 << 20)))
+            skipped = hub.broadcast(ConsolePackage(timestamp=1, console_msg="late"))
+            dropped = [hub.dropped(stream) for stream in streams]
+
+            for client in clients:
+                await client.close()
+
+        return delivered, received, skipped, dropped
+
+    delivered, received, skipped, dropped = asyncio.run(run())
+
+    assert delivered == [3] * 10
+    assert received == [[f"line {index}" for index in range(10)]] * 3
+    assert skipped == 0 and dropped == [1, 1, 1]
@@ -0,0 +1,95 @@
+import asyncio
+
+from packages import ButtonPackage, CoalescingQueue, PackageStream, RollPackage, TemperaturePackage
+
+
+def test_coalescing_queue_keeps_latest_state():
+    """Tests if newer state updates replace pending ones while other packages stay in order."""
+    queue = CoalescingQueue()
+
+    for degrees in range(100):
+        queue.put(RollPackage(timestamp=1, degrees=degrees))
+    queue.put(ButtonPackage(timestamp=1, button_name="start"))
+    queue.put(ButtonPackage(timestamp=1, button_name="stop"))
+    queue.put(TemperaturePackage(timestamp=1, temperature=20.0))
+
+    packages = [queue.get_nowait() for _ in range(len(queue))]
+
+    assert [type(package) for package in packages] == [RollPackage, ButtonPackage, ButtonPackage, TemperaturePackage]
+    assert packages[0].degrees == 99
+    assert (queue.merged, queue.sent, queue.get_nowait()) == (99, 4, None)
+
+
+def test_coalescing_queue_applies_deadband():
+    """Tests if changes within the deadband of the last sent value are dropped."""
+    queue = CoalescingQueue(deadbands={TemperaturePackage: 0.1})
+
+    assert queue.put(TemperaturePackage(timestamp=1, temperature=20.0))
+    assert queue.get_nowait().temperature == 20.0
+
+    assert queue.put(TemperaturePackage(timestamp=2, temperature=20.5))
+    assert not queue.put(TemperaturePackage(timestamp=3, temperature=20.05))
+
+    assert queue.dropped == 2 and len(queue) == 0
+
+
+def test_coalescing_queue_applies_deadband_to_frozen_packages():
+    """Tests if a frozen package is looked up by the type it wraps."""
+    queue = CoalescingQueue(deadbands={TemperaturePackage: 0.1})
+
+    assert queue.put(TemperaturePackage(timestamp=1, temperature=20.0).freeze())
+    assert queue.get_nowait().temperature == 20.0
+    assert not queue.put(TemperaturePackage(timestamp=2, temperature=20.05).freeze())
+
+
+def test_coalescing_queue_limits_rate():
+    """Tests if an identifier is sent at most max_rate times per second."""
+    now = [0.0]
+    queue = CoalescingQueue(max_rate=10, clock=lambda: now[0])
+
+    queue.put(RollPackage(timestamp=1, degrees=1))
+    assert queue.get_nowait().degrees == 1
+
+    queue.put(RollPackage(timestamp=1, degrees=2))
+    queue.put(ButtonPackage(timestamp=1, button_name="start"))
+    assert type(queue.get_nowait()) is ButtonPackage
+    assert queue.get_nowait() is None and queue.next_ready() == 0.1
+
+    now[0] = 0.1
+    assert queue.get_nowait().degrees == 2
+
+
+def test_coalescing_queue_sends_to_stream():
+    """Tests if a slow stream receives the latest state instead of every update."""
+    async def run():
+        received = []
+
+        async def collect(stream: PackageStream):
+            async for package in stream:
+                received.append(package.degrees)
+
+        server = await PackageStream.start_server(collect, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        queue = CoalescingQueue()
+
+        async with server, await PackageStream.connect("127.0.0.1", port) as stream:
+            sender = asyncio.create_task(queue.send_to(stream))
+
+            for degrees in range(1000):
+                queue.put(RollPackage(timestamp=1, degrees=degrees))
+                if degrees % 100 == 0:
+                    await asyncio.sleep(0)
+
+            while len(queue):
+                await asyncio.sleep(0.01)
+
+            sender.cancel()
+
+        await asyncio.sleep(0.01)
+
+        return queue, received
+
+    queue, received = asyncio.run(run())
+
+    assert received[-1] == 999
+    assert queue.sent + queue.merged == 1000 and queue.sent < 1000
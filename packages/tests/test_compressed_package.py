@@ -0,0 +1,147 @@
+import asyncio
+import struct
+import tracemalloc
+import zlib
+
+from packages import (
+    Codec, compress, CompressedPackage, ConsolePackage, FragmentPackage, FragmentReassembler, get_package, LZMA,
+    PackageFrameDecoder, SlicerConfigFilePackage, STLPackage, TracedPackage, ZLIB
+)
+from packages.codec import FRAGMENTS, LZMA_COMPRESSION, TRACING, ZLIB_COMPRESSION
+import pytest
+
+
+def test_compressed_package_round_trip():
+    """Tests if both codecs return the wrapped package on decoding."""
+    config = "[print]\nlayer_height = 0.2\ninfill = 20\n" * 500
+
+    for codec in (ZLIB, LZMA):
+        package = CompressedPackage(SlicerConfigFilePackage(timestamp=1, config_content=config), codec)
+        data = package.to_bytes()
+
+        decoded = get_package(data)
+
+        assert len(data) == package.compressed_size < len(config)
+        assert type(decoded) is SlicerConfigFilePackage
+        assert decoded.config_content == config
+
+
+def test_compress_uses_threshold_and_ratio():
+    """Tests if small and incompressible packages are sent unchanged."""
+    small = ConsolePackage(timestamp=1, console_msg="G1 X10")
+    noise = STLPackage(timestamp=1, stl=bytes(range(256)) * 32)
+    text = ConsolePackage(timestamp=1, console_msg="G1 X10 Y10 Z0.2 F1500\n" * 1000)
+
+    assert compress(small) is small
+    assert compress(text, threshold=1 << 30) is text
+    assert type(compress(text)) is CompressedPackage
+    assert type(compress(noise, level=0)) is STLPackage
+
+
+def test_compressed_package_through_frame_decoder():
+    """Tests if compressed and uncompressed frames can be mixed on one connection."""
+    stl = b"solid part\n" + b"facet normal 0 0 1\n outer loop\n  vertex 0 0 0\n endloop\nendfacet\n" * 2000
+    data = compress(STLPackage(timestamp=1, stl=stl)).to_bytes()
+    data += ConsolePackage(timestamp=1, console_msg="ok").to_bytes()
+
+    stl_package, console = PackageFrameDecoder().feed(data)
+
+    assert bytes(stl_package.payload) == stl
+    assert bytes(console.payload) == b"ok"
+
+
+def test_compressed_package_rejects_wrong_size():
+    """Tests if a frame that decompresses to another size than announced is rejected."""
+    data = bytearray(CompressedPackage(ConsolePackage(timestamp=1, console_msg="x" * 100)).to_bytes())
+    data[13] += 1
+
+    with pytest.raises(ValueError):
+        get_package(data)
+
+
+def test_compressed_package_bounds_decompression():
+    """Tests if announced and actual sizes beyond the limits are rejected before the memory is used."""
+    for codec in (ZLIB, LZMA):
+        bomb = bytearray(CompressedPackage(STLPackage(timestamp=1, stl=bytes(1 << 24)), codec).to_bytes())
+        struct.pack_into("!Q", bomb, 6, 1 << 10)
+
+        with pytest.raises(ValueError):
+            get_package(bomb)
+
+    with pytest.raises(ValueError):
+        get_package(struct.pack("!IBBQ", 24, CompressedPackage.identifier, ZLIB, 1 << 31) + bytes(10))
+
+
+def test_compressed_package_allocates_with_the_output():
+    """Tests if a forged decompressed size neither allocates that size nor passes the receiver's limit."""
+    forged = struct.pack("!IBBQ", 22, CompressedPackage.identifier, ZLIB, 1 << 29) + zlib.compress(b"")[:8]
+
+    tracemalloc.start()
+
+    try:
+        with pytest.raises(ValueError):
+            get_package(forged)
+
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    data = CompressedPackage(ConsolePackage(timestamp=1, console_msg="x" * 100)).to_bytes()
+
+    with pytest.raises(ValueError):
+        CompressedPackage.to_package(data, max_frame_size=100)
+
+    assert peak < 1 << 20
+    assert bytes(CompressedPackage.to_package(data, max_frame_size=1 << 10).payload) == b"x" * 100
+
+
+def test_compressed_package_rejects_nested_compression_at_any_depth():
+    """Tests if a compressed frame is rejected inside a decompressed one, also behind a traced header."""
+    console = ConsolePackage(timestamp=1, console_msg="x" * 100)
+
+    for inner in (CompressedPackage(console), TracedPackage(TracedPackage(CompressedPackage(console)))):
+        with pytest.raises(ValueError):
+            get_package(CompressedPackage(inner).to_bytes())
+
+    assert bytes(get_package(CompressedPackage(TracedPackage(console)).to_bytes()).package.payload) == b"x" * 100
+
+
+def test_codec_refuses_compressed_frames_without_capability():
+    """Tests if a connection only decodes compressed frames with a negotiated codec."""
+    data = CompressedPackage(ConsolePackage(timestamp=1, console_msg="x" * 100)).to_bytes()
+
+    with pytest.raises(ValueError):
+        Codec().decode(data)
+
+    assert bytes(Codec(capabilities=ZLIB_COMPRESSION).decode(data).payload) == b"x" * 100
+
+
+def test_codec_checks_nested_frames_against_capabilities():
+    """Tests if traced, compressed and fragment frames are refused at any depth unless negotiated."""
+    console = ConsolePackage(timestamp=1, console_msg="x" * 100)
+    traced = TracedPackage(CompressedPackage(console, LZMA)).to_bytes()
+    fragment = FragmentPackage(timestamp=1, total_size=1, fragment=b"x").to_bytes()
+
+    for data, capabilities in ((traced, ZLIB_COMPRESSION), (traced, TRACING), (fragment, TRACING)):
+        with pytest.raises(ValueError):
+            Codec(capabilities=capabilities).decode(data)
+
+    assert bytes(Codec(capabilities=TRACING | LZMA_COMPRESSION).decode(traced).package.payload) == b"x" * 100
+    assert Codec(capabilities=FRAGMENTS).decode(fragment).total_size == 1
+
+    frame = CompressedPackage(console, LZMA).to_bytes()
+    reassembler = FragmentReassembler(decoder=Codec(capabilities=FRAGMENTS | ZLIB_COMPRESSION).decode)
+
+    with pytest.raises(ValueError):
+        reassembler.receive(FragmentPackage(timestamp=1, total_size=len(frame), fragment=frame))
+
+
+def test_codec_compresses_large_frames_off_the_event_loop():
+    """Tests if frames above the compression limit are compressed in a worker thread instead of inline."""
+    codec = Codec(capabilities=ZLIB_COMPRESSION, compress_limit=1 << 16)
+    large = STLPackage(timestamp=1, stl=bytes(1 << 20))
+
+    assert codec.encode(large) is large
+    assert type(codec.encode(STLPackage(timestamp=1, stl=bytes(1 << 15)))) is CompressedPackage
+    assert type(asyncio.run(codec.encode_async(large))) is CompressedPackage
+    assert asyncio.run(Codec().encode_async(large)) is large
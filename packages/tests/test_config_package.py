@@ -1,4 +1,7 @@
-from packages import ConfigPackage
+import struct
+
+from packages import ConfigPackage, get_package
+import pytest
 
 
 def test_config_package_initializes():
@@ -97,3 +100,33 @@ def test_bytes_converts_to_config_package_str():
     assert package.section == "server"
     assert package.option == "host"
     assert package.value == "127.0.0.1"
+
+
+def test_bytes_converts_to_config_package_typed():
+    """Tests if received values are decoded as the type the sender used."""
+    values = {"port": 8000, "interval": 25.5, "enabled": True, "host": "127.0.0.1"}
+
+    packages = {
+        option: get_package(ConfigPackage(1762330645, "server", option, value).to_bytes())
+        for option, value in values.items()
+    }
+
+    assert {option: package.typed_value(type(values[option])) for option, package in packages.items()} == values
+    assert packages["host"].value == "127.0.0.1"
+    assert packages["interval"].to_bytes() == ConfigPackage(1762330645, "server", "interval", 25.5).to_bytes()
+
+    with pytest.raises(ValueError):
+        packages["host"].typed_value(int)
+
+
+def test_config_package_value_keeps_binary_values_as_bytes():
+    """Tests if a received value that is not UTF-8 is read as bytes and subclasses decode to themselves."""
+    class LabeledConfigPackage(ConfigPackage):
+        """A config package type that only changes the Python class."""
+
+    data = ConfigPackage(1762330645, "server", "interval", 0.2).to_bytes()
+    package = LabeledConfigPackage.to_package(data)
+
+    assert type(package) is LabeledConfigPackage
+    assert package.value == struct.pack("!f", 0.2)
+    assert package.typed_value(float) == pytest.approx(0.2)
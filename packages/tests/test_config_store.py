@@ -0,0 +1,58 @@
+from packages import ConfigPackage, ConfigStore, get_package
+import pytest
+
+
+def received(section: str, option: str, value: int | str | bool | float) -> ConfigPackage:
+    """Returns a config package as it arrives from a peer."""
+    return get_package(ConfigPackage(1762330645, section, option, value).to_bytes())
+
+
+def test_config_store_applies_typed_values():
+    """Tests if values are stored as the type of the schema or of the current value, else as bytes."""
+    store = ConfigStore(schema={"server": {"port": int, "enabled": bool}})
+
+    store.apply_many([received("server", "port", 8000), received("server", "enabled", True),
+                      received("server", "host", "127.0.0.1")])
+    store.apply(ConfigPackage(section="printer", option="speed", value=2.5))
+    store.apply(received("printer", "speed", 3.25))
+
+    assert store.get("server", "port") == 8000
+    assert store.get("server", "enabled") is True
+    assert store.get("server", "host") == b"127.0.0.1"
+    assert store.get("printer", "speed") == 3.25
+    assert store.get("printer", "nozzle", 0.4) == 0.4
+
+
+def test_config_store_notifies_and_snapshots():
+    """Tests if subscribers get one call per batch and snapshots keep their version."""
+    store = ConfigStore(schema={"server": {"port": int}})
+    calls = []
+    store.subscribe("server", lambda section, changed: calls.append((section, dict(changed))))
+
+    store.apply_many([received("server", "port", 8000), received("server", "host", "localhost")])
+    snapshot = store.snapshot()
+
+    assert not store.apply(received("server", "port", 8000))
+    store.apply_many([received("server", "port", 9000), received("printer", "speed", "fast")])
+
+    assert calls == [("server", {"port": 8000, "host": b"localhost"}), ("server", {"port": 9000})]
+    assert (snapshot.version, snapshot.get("server", "port")) == (1, 8000)
+    assert (store.version, store.get("server", "port")) == (2, 9000)
+    assert "printer" not in snapshot
+
+
+def test_config_store_applies_batches_atomically():
+    """Tests if a batch with a value that can not be decoded changes nothing."""
+    store = ConfigStore(schema={"printer": {"speed": float, "name": str}})
+    calls = []
+    store.subscribe("printer", lambda section, changed: calls.append(dict(changed)))
+
+    with pytest.raises(ValueError):
+        store.apply_many([received("printer", "speed", 25.5), received("printer", "name", 25.5),
+                          received("printer", "speed", 30)])
+
+    assert (store.version, "printer" in store, calls) == (0, False, [])
+
+    store.apply_many([received("printer", "speed", 25.5), received("printer", "offset", 7)])
+
+    assert (store.get("printer", "speed"), store.get("printer", "offset")) == (25.5, b"\x00\x00\x00\x07")
@@ -0,0 +1,64 @@
+import struct
+
+from packages import Package
+from packages.fields import BOOL, BYTES, F32, F64, fixed_bytes, I32, STR, U32, U64, U8
+import pytest
+
+
+class SamplePackage(Package, identifier=0xF0, fields={
+    "name": STR,
+    "count": U8,
+    "offset": I32,
+    "total": U64,
+    "ratio": F32,
+    "value": F64,
+    "enabled": BOOL,
+    "digest": fixed_bytes(4),
+    "content": BYTES,
+    "size": U32,
+}):
+    """A package with every field type."""
+
+    __slots__ = ("name", "count", "offset", "total", "ratio", "value", "enabled", "digest", "content", "size")
+
+
+class ExtendedPackage(SamplePackage, identifier=0xF1, fields={"note": STR}):
+    """A package that appends a field to the fields of its base class."""
+
+    __slots__ = ("note",)
+
+
+def make_sample(package_type: type[SamplePackage]) -> SamplePackage:
+    """Returns a package of the given type with all sample fields set."""
+    package = package_type(timestamp=1762330645)
+    package.name, package.count, package.offset, package.total = "nözzle", 3, -7, 1 << 40
+    package.ratio, package.value, package.enabled = 0.5, 21.25, True
+    package.digest, package.content, package.size = b"abcd", "payload", 9
+
+    return package
+
+
+def test_fields_generate_header_and_codec():
+    """Tests if the fields produce the expected layout and survive encoding."""
+    data = make_sample(SamplePackage).to_bytes()
+    package = SamplePackage.to_package(data)
+
+    assert SamplePackage.format == "!IBLIBlQfd?4sII"
+    assert len(data) == struct.calcsize(SamplePackage.format) + len("nözzle".encode("utf-8")) + len("payload")
+    assert (package.name, package.count, package.offset, package.total) == ("nözzle", 3, -7, 1 << 40)
+    assert (package.ratio, package.value, package.enabled, package.digest) == (0.5, 21.25, True, b"abcd")
+    assert (bytes(package.content), package.size) == (b"payload", 9)
+
+    with pytest.raises(ValueError):
+        ExtendedPackage.to_package(data)
+
+
+def test_fields_extend_base_class():
+    """Tests if the fields of a subclass follow the fields of its base class."""
+    package = make_sample(ExtendedPackage)
+    package.note = "extended"
+
+    decoded = ExtendedPackage.to_package(b"".join(package.to_buffers()))
+
+    assert list(ExtendedPackage.fields)[-2:] == ["size", "note"]
+    assert (decoded.name, decoded.note, decoded.identifier) == ("nözzle", "extended", 0xF1)
@@ -0,0 +1,102 @@
+import socket
+import struct
+import threading
+import tracemalloc
+
+from packages import ButtonPackage, PackageFrameDecoder, RollPackage, STLPackage
+import pytest
+
+
+def test_frame_decoder_handles_short_reads():
+    """Tests if a package split over many chunks is decoded once it is complete."""
+    decoder = PackageFrameDecoder()
+    data = ButtonPackage(1762330645, "emergency_stop").to_bytes()
+
+    packages = []
+    for index in range(len(data)):
+        packages += decoder.feed(data[index:index + 1])
+
+    assert len(packages) == 1
+    assert packages[0].button_name == "emergency_stop"
+    assert decoder.pending == 0
+
+
+def test_frame_decoder_drains_many_frames_from_one_chunk():
+    """Tests if every package in a single chunk is decoded in order."""
+    decoder = PackageFrameDecoder()
+    data = b"".join(RollPackage(1762330645, degrees).to_bytes() for degrees in range(-500, 500))
+
+    packages = list(decoder.feed(data + data[:7]))
+
+    assert [package.degrees for package in packages] == list(range(-500, 500))
+    assert decoder.pending == 7
+
+
+def test_frame_decoder_keeps_retained_frames_intact():
+    """Tests if frames referenced by a decoder are not overwritten by new data."""
+    decoder = PackageFrameDecoder(decoder=lambda frame: frame)
+    first = STLPackage(1762330645, b"first").to_bytes()
+    second = STLPackage(1762330645, b"second").to_bytes()
+
+    frames = list(decoder.feed(first)) + list(decoder.feed(second * 100))
+
+    assert frames[0] == first
+    assert all(frame == second for frame in frames[1:])
+
+
+def test_frame_decoder_receives_from_socket():
+    """Tests if packages are received directly from a socket."""
+    sender, receiver = socket.socketpair()
+    decoder = PackageFrameDecoder()
+
+    with sender, receiver:
+        sender.sendall(RollPackage(1762330645, 90).to_bytes() + RollPackage(1762330645, 180).to_bytes())
+
+        packages = []
+        while len(packages) < 2:
+            packages += decoder.receive(receiver)
+
+    assert [package.degrees for package in packages] == [90, 180]
+
+
+def test_frame_decoder_rejects_oversized_frames():
+    """Tests if a size prefix above the maximum is rejected without reserving the announced size."""
+    decoder = PackageFrameDecoder(max_frame_size=1 << 20)
+    tracemalloc.start()
+
+    try:
+        with pytest.raises(ValueError):
+            list(decoder.feed(struct.pack("!I", 0xFFFFFFF0) + b"\x02"))
+
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert peak < 1 << 20
+
+
+def test_frame_decoder_receives_large_frames_in_one_allocation():
+    """Tests if a large frame received from a socket peaks at about the memory of one payload."""
+    size = 16 << 20
+    data = STLPackage(1762330645, bytes(size)).to_bytes()
+    sender, receiver = socket.socketpair()
+    decoder = PackageFrameDecoder()
+
+    with sender, receiver:
+        thread = threading.Thread(target=sender.sendall, args=(data,))
+        tracemalloc.start()
+
+        try:
+            thread.start()
+
+            packages = []
+            while not packages:
+                packages += decoder.receive(receiver)
+
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            thread.join()
+
+    assert packages[0].payload.nbytes == size
+    assert peak < size * 1.1
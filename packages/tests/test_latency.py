@@ -0,0 +1,58 @@
+from packages import (
+    ConfirmationPackage, get_package, LatencyTracker, RobotDataPackage, TemperaturePackage, TracedPackage
+)
+
+
+def test_traced_package_wraps_frame():
+    """Tests if a traced package carries the send time, sequence and the unchanged wrapped package."""
+    robot = RobotDataPackage(timestamp=1, model="Meca500", brand="Mecademic", material="PLA", axis=6)
+    data = TracedPackage(robot, sequence=7, send_ns=1762330645123456789).to_bytes()
+
+    package = get_package(data)
+
+    assert data[-len(robot.to_bytes()):] == robot.to_bytes()
+    assert package.send_ns == 1762330645123456789
+    assert package.sequence == 7
+    assert package.package.model == "Meca500"
+    assert package.package.axis == 6
+
+
+def test_latency_tracker_measures_one_way_and_round_trip():
+    """Tests if the tracker measures latencies with its clock."""
+    now = [1_000]
+    sender = LatencyTracker(clock=lambda: now[0])
+    receiver = LatencyTracker(clock=lambda: now[0])
+
+    traced = sender.trace(TemperaturePackage(timestamp=1762330645, temperature=21.5))
+    now[0] += 250
+
+    temperature = receiver.received(get_package(traced.to_bytes()))
+    now[0] += 750
+
+    sender.received(ConfirmationPackage(
+        confirmed_request_id=temperature.identifier,
+        confirmed_request_timestamp=temperature.timestamp
+    ))
+
+    assert traced.sequence == 0 and sender.trace(temperature).sequence == 1
+    assert temperature.temperature == 21.5
+    assert receiver.one_way(TemperaturePackage.identifier) == {50: 250, 90: 250, 99: 250}
+    assert sender.round_trip(TemperaturePackage.identifier, (50,)) == {50: 1000}
+    assert sender.round_trip(ConfirmationPackage.identifier) == {}
+
+
+def test_latency_tracker_bounds_unconfirmed_sends():
+    """Tests if sends of one package type and timestamp without confirmation are capped at samples."""
+    now = [0]
+    tracker = LatencyTracker(clock=lambda: now[0], samples=8)
+
+    for send_ns in range(1000):
+        tracker.sent(TemperaturePackage(timestamp=1762330645, temperature=21.5), send_ns)
+
+    # Only the last 8 sends are left to match, the oldest of them was sent at 992
+    now[0] = 1000
+    for _ in range(10):
+        tracker.received(ConfirmationPackage(confirmed_request_id=TemperaturePackage.identifier,
+                                             confirmed_request_timestamp=1762330645))
+
+    assert tracker.round_trip(TemperaturePackage.identifier, (0, 100)) == {0: 1, 100: 8}
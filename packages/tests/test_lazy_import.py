@@ -0,0 +1,52 @@
+import pathlib
+import subprocess
+import sys
+
+import packages
+import pytest
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def imported_modules(statement: str) -> set[str]:
+    """Returns the modules a fresh interpreter has imported after running the statement."""
+    output = subprocess.run(
+        [sys.executable, "-c", f"{statement}; import sys; print(' '.join(sys.modules))"],
+        cwd=ROOT, check=True, capture_output=True, text=True
+    ).stdout
+
+    return set(output.split())
+
+
+def test_import_packages_is_lazy():
+    """Tests if importing packages does not import the package modules or heavy dependencies."""
+    modules = imported_modules("import packages") - imported_modules("pass")
+
+    assert {"packages", "packages.package", "packages.registry"} <= modules
+    assert not {"packages.temperature_package", "packages.package_stream", "asyncio", "lzma", "mmap"} & modules
+
+
+def test_get_package_imports_package_module_on_first_use():
+    """Tests if decoding a frame imports only the module of its package type."""
+    modules = imported_modules("import packages; packages.get_package(b'\\0\\0\\0\\x11\\x01' + bytes(12))")
+
+    assert "packages.progress_package" in modules
+    assert "packages.temperature_package" not in modules
+
+
+def test_lazy_names():
+    """Tests if every public name resolves and unknown names still fail."""
+    assert all(getattr(packages, name) is not None for name in packages.__all__)
+    assert set(packages.__all__) <= set(dir(packages))
+    assert packages.load_packages()[0x02] is packages.TemperaturePackage
+
+    with pytest.raises(AttributeError):
+        packages.UnknownPackage
+
+
+def test_register_package_reserves_builtin_identifiers():
+    """Tests if a custom package cannot take the identifier of a built-in one that is not imported yet."""
+    with pytest.raises(ValueError):
+        @packages.register_package
+        class ReservedPackage(packages.Package, identifier=0x16, struct_format="!IB"):
+            pass
@@ -1,8 +1,41 @@
-from packages import Package
+from packages import Package, set_clock, TemperaturePackage
+from packages.package import frame_struct
+import pytest
 
 
 def test_package_initializes():
     """Tests if the base package class initializes."""
     assert Package() is not None
-    assert Package(0x01) is not None
-    assert Package(struct_format="!IBI") is not None
+    assert Package(timestamp=1).timestamp == 1
+    assert Package().identifier == 0
+
+
+def test_frame_struct_is_cached():
+    """Tests if the frame struct of a variable-length tail is compiled once."""
+    assert frame_struct("!IBLI", 9) is frame_struct("!IBLI", 9)
+    assert frame_struct("!IBLI", 9).format == "!IBLI9s"
+    assert frame_struct("!", 2, "l").size == 6
+
+
+def test_package_timestamp_uses_clock():
+    """Tests if packages without a timestamp are stamped by the clock when they are created."""
+    ticks = iter([10.0, 20.0])
+    previous = set_clock(lambda: next(ticks))
+
+    try:
+        assert TemperaturePackage().timestamp == 10.0
+        assert TemperaturePackage().timestamp == 20.0
+        assert TemperaturePackage(timestamp=5).timestamp == 5
+    finally:
+        set_clock(previous)
+
+
+def test_package_has_no_instance_dict():
+    """Tests if packages only store their slots and keep identifier and format on the class."""
+    package = TemperaturePackage(timestamp=1, temperature=21.5)
+
+    assert not hasattr(package, "__dict__")
+    assert package.identifier == TemperaturePackage.identifier == 0x02
+
+    with pytest.raises(AttributeError):
+        package.unknown = 1
@@ -0,0 +1,149 @@
+import asyncio
+
+from packages import (
+    ButtonPackage,
+    CompressedPackage,
+    LatencyTracker,
+    PackageStream,
+    PackageStreamPool,
+    RollPackage,
+    STLPackage,
+)
+from packages.codec import CAPABILITIES, LEGACY_VERSION, PROTOCOL_VERSION, TRACING, ZLIB_COMPRESSION
+
+
+async def echo(stream: PackageStream):
+    """Sends every received package back to the peer."""
+    async for package in stream:
+        await stream.send(package)
+
+
+def test_package_stream_sends_and_receives():
+    """Tests if packages sent over a stream are received in order."""
+    async def run():
+        server = await PackageStream.start_server(echo, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server, await PackageStream.connect("127.0.0.1", port) as stream:
+            await stream.send(ButtonPackage(1762330645, "emergency_stop"))
+            await stream.send_many(RollPackage(1762330645, degrees) for degrees in range(1000))
+
+            button = await stream.receive()
+            rolls = [await stream.receive() for _ in range(1000)]
+
+        return button, rolls
+
+    button, rolls = asyncio.run(run())
+
+    assert button.button_name == "emergency_stop"
+    assert [package.degrees for package in rolls] == list(range(1000))
+
+
+def test_package_stream_pool_reuses_connections():
+    """Tests if the pool keeps a single connection per peer."""
+    connections = []
+
+    async def run():
+        async def handler(stream: PackageStream):
+            connections.append(stream)
+            await echo(stream)
+
+        server = await PackageStream.start_server(handler, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        pool = PackageStreamPool()
+
+        async with server:
+            for degrees in range(10):
+                await pool.send("127.0.0.1", port, RollPackage(1762330645, degrees))
+
+            stream = await pool.get("127.0.0.1", port)
+            received = [(await stream.receive()).degrees for _ in range(10)]
+
+            await pool.close()
+
+        return received
+
+    assert asyncio.run(run()) == list(range(10))
+    assert len(connections) == 1
+
+
+def test_package_stream_traces_packages():
+    """Tests if a stream with a tracker traces packages only after negotiating it and records their latency."""
+    async def run():
+        server = await PackageStream.start_server(echo, "127.0.0.1", 0, capabilities=CAPABILITIES)
+        port = server.sockets[0].getsockname()[1]
+        tracker = LatencyTracker()
+
+        async with server:
+            async with await PackageStream.connect("127.0.0.1", port, tracker=tracker) as stream:
+                await stream.send(RollPackage(1762330645, -1))
+                untraced = await stream.receive()
+
+            async with await PackageStream.connect("127.0.0.1", port, tracker, CAPABILITIES) as stream:
+                await stream.send_many(RollPackage(1762330645, degrees) for degrees in range(10))
+                rolls = [await stream.receive() for _ in range(10)]
+
+        return tracker, untraced, rolls
+
+    tracker, untraced, rolls = asyncio.run(run())
+
+    assert untraced.degrees == -1
+    assert [package.degrees for package in rolls] == list(range(10))
+    assert tracker.sequence == 10
+    assert tracker.one_way(RollPackage.identifier).keys() == {50, 90, 99}
+
+
+def test_package_stream_negotiates_codec():
+    """Tests if a handshake selects the common capabilities and peers without one keep the original layout."""
+    codecs = []
+
+    async def run():
+        async def handler(stream: PackageStream):
+            codecs.append(stream.codec)
+            await echo(stream)
+
+        server = await PackageStream.start_server(handler, "127.0.0.1", 0, capabilities=ZLIB_COMPRESSION | TRACING)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            async with await PackageStream.connect("127.0.0.1", port, capabilities=CAPABILITIES) as stream:
+                await stream.send(STLPackage(1762330645, bytes(1 << 16)))
+                stl = await stream.receive()
+                compressed = stream.codec.encode(STLPackage(1762330645, bytes(1 << 16)))
+
+            async with await PackageStream.connect("127.0.0.1", port) as stream:
+                await stream.send(ButtonPackage(1762330645, "start"))
+                button = await stream.receive()
+
+        return stl, compressed, button
+
+    stl, compressed, button = asyncio.run(run())
+
+    assert (codecs[0].version, codecs[0].capabilities) == (PROTOCOL_VERSION, ZLIB_COMPRESSION | TRACING)
+    assert isinstance(compressed, CompressedPackage) and stl.payload == bytes(1 << 16)
+    assert (codecs[1].version, codecs[1].compression, button.button_name) == (LEGACY_VERSION, None, "start")
+
+
+def test_package_stream_server_ignores_early_disconnects():
+    """Tests if a client that closes before its handshake does not reach the handler or raise."""
+    handled = []
+
+    async def run(loop_errors: list):
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: loop_errors.append(context))
+
+        async def handler(stream: PackageStream):
+            handled.append(stream)
+
+        server = await PackageStream.start_server(handler, "127.0.0.1", 0, capabilities=CAPABILITIES)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            await writer.wait_closed()
+            await asyncio.sleep(0.1)
+
+    errors = []
+    asyncio.run(run(errors))
+
+    assert (handled, errors) == ([], [])
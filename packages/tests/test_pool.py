@@ -0,0 +1,47 @@
+from packages import (
+    ButtonPackage,
+    ConfigPackage,
+    PackageFrameDecoder,
+    PackagePool,
+    RobotDataPackage,
+    RollPackage,
+    TemperaturePackage,
+)
+
+
+def test_decode_into_overwrites_package():
+    """Tests if decode_into replaces every field of an existing package, including hand-coded types."""
+    package = TemperaturePackage(timestamp=1, temperature=20.0)
+    config = ConfigPackage(timestamp=1, section="server", option="port", value="8000")
+    robot = RobotDataPackage()
+
+    assert TemperaturePackage.decode_into(package, TemperaturePackage(2, 21.5).to_bytes()) is package
+    assert (package.timestamp, package.temperature) == (2, 21.5)
+
+    ConfigPackage.decode_into(config, ConfigPackage(3, "client", "name", "arm").to_bytes())
+    assert (config.timestamp, config.section, config.option, config.value) == (3, "client", "name", "arm")
+
+    RobotDataPackage.decode_into(robot, RobotDataPackage(4, "KR 6", accuracy=0.0312).to_bytes())
+    assert (robot.model, robot.accuracy) == ("KR 6", 0.03)
+
+
+def test_package_pool_reuses_released_packages():
+    """Tests if released packages are decoded into again while other types are decoded as usual."""
+    pool = PackagePool((TemperaturePackage, RollPackage), size=1)
+    decoder = PackageFrameDecoder(decoder=pool.decode)
+    frames = b"".join(package.to_bytes() for package in (
+        TemperaturePackage(1, 20.0), ButtonPackage(1, "start"), TemperaturePackage(2, 21.0)
+    ))
+
+    first, button, second = decoder.feed(frames)
+    assert (first.temperature, second.temperature, button.button_name) == (20.0, 21.0, "start")
+
+    pool.release(first)
+    pool.release(button)
+    pool.release(second)
+
+    third = pool.decode(TemperaturePackage(3, 22.0).to_bytes())
+
+    assert third is first and third.temperature == 22.0
+    assert pool.created == 2
+    assert pool.decode(RollPackage(4, 90).to_bytes()).degrees == 90
@@ -0,0 +1,27 @@
+from packages import ConsolePackage, get_package, Package, register_package, TemperaturePackage
+import pytest
+
+
+def test_get_package_decodes_by_identifier():
+    """Tests if packages are decoded by the type registered for their identifier."""
+    temperature = get_package(TemperaturePackage(timestamp=1, temperature=21.5).to_bytes())
+    console = get_package(ConsolePackage(timestamp=1, console_msg="Hello").to_bytes())
+
+    assert type(temperature) is TemperaturePackage
+    assert temperature.temperature == 21.5
+    assert type(console) is ConsolePackage
+    assert bytes(console.payload) == b"Hello"
+
+
+def test_register_package_rejects_duplicate_identifier():
+    """Tests if registering a second package type with a used identifier fails."""
+    with pytest.raises(ValueError):
+        @register_package
+        class DuplicatePackage(Package, identifier=TemperaturePackage.identifier, struct_format="!IBL"):
+            pass
+
+
+def test_get_package_rejects_unknown_identifier():
+    """Tests if data with an unregistered identifier is rejected."""
+    with pytest.raises(ValueError):
+        get_package(b"\x00\x00\x00\x05\xff")
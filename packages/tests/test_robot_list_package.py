@@ -0,0 +1,55 @@
+import struct
+
+from packages import get_package, RobotListPackage
+from packages.robot import Robot
+import pytest
+
+
+def make_robot(model: str, brand: str, reach: int) -> Robot:
+    """Creates a robot with the given model, brand and reach."""
+    robot = Robot()
+    robot.model = model
+    robot.brand = brand
+    robot.material = "PLA"
+    robot.axis = 6
+    robot.reach = reach
+    robot.payload = 500
+    robot.weight = 4500
+    robot.accuracy = 0.01
+
+    return robot
+
+
+def test_robot_list_package_round_trip():
+    """Tests if a catalog survives encoding with every robot and a deduplicated string table."""
+    robots = [make_robot("Meca500", "Mecademic", 330), make_robot("UR5e", "Universal Robots", 850),
+              make_robot("Meca500", "Mecademic", 331)]
+
+    package = get_package(RobotListPackage(timestamp=1, robots=robots).to_bytes())
+
+    assert type(package) is RobotListPackage
+    assert len(package) == 3
+    assert package.strings == ["Meca500", "UR5e", "Mecademic", "Universal Robots", "PLA"]
+    assert [(robot.model, robot.brand, robot.reach) for robot in package] == [
+        ("Meca500", "Mecademic", 330), ("UR5e", "Universal Robots", 850), ("Meca500", "Mecademic", 331)
+    ]
+    assert (package[-1].axis, package[-1].payload, package[-1].weight, package[-1].accuracy) == (6, 500, 4500, 0.01)
+    assert package.to_bytes() == RobotListPackage(timestamp=1, robots=robots).to_bytes()
+
+
+def test_robot_list_package_empty():
+    """Tests if an empty catalog is a header-only frame."""
+    data = RobotListPackage(timestamp=1).to_bytes()
+
+    assert len(data) == struct.calcsize(RobotListPackage.format)
+    assert list(get_package(data)) == []
+
+
+@pytest.mark.parametrize("offset", [9, 13, 57], ids=["robots", "strings", "string length"])
+def test_robot_list_package_forged_counts(offset: int):
+    """Tests if forged robot, string or string length counts are rejected with a ValueError."""
+    data = bytearray(RobotListPackage(timestamp=1, robots=[make_robot("UR5e", "Universal Robots", 850)]).to_bytes())
+    struct.pack_into("!I", data, offset, 1 << 20)
+
+    with pytest.raises(ValueError):
+        get_package(bytes(data))
@@ -0,0 +1,137 @@
+import asyncio
+import tracemalloc
+
+from packages import (
+    ButtonPackage,
+    FragmentPackage,
+    FragmentReassembler,
+    PackageFrameDecoder,
+    PackageStream,
+    SendScheduler,
+    STLPackage,
+    TemperaturePackage,
+)
+from packages.scheduler import BULK, CONTROL, NORMAL
+import pytest
+
+
+async def echo(stream: PackageStream):
+    """Sends every received package back to the peer."""
+    async for package in stream:
+        await stream.send(package)
+
+
+def test_scheduler_interleaves_control_packages_between_fragments():
+    """Tests if a control package overtakes the rest of a split bulk package, which is restored intact."""
+    times = iter(range(0, 10 ** 6, 10))
+    scheduler = SendScheduler(fragment_size=1024, clock=lambda: next(times))
+    stl = bytes(range(256)) * 16
+
+    scheduler.put(STLPackage(timestamp=1, stl=stl))
+    scheduler.put(TemperaturePackage(timestamp=1, temperature=20.0))
+    sent = [scheduler.get_nowait(), scheduler.get_nowait()]
+
+    scheduler.put(ButtonPackage(timestamp=1, button_name="stop"))
+    assert (scheduler.depth(CONTROL), scheduler.depth(NORMAL), scheduler.depth(BULK)) == (1, 0, 1)
+
+    while len(scheduler):
+        sent.append(scheduler.get_nowait())
+
+    assert [type(package) for package in sent[:4]] == [
+        TemperaturePackage, FragmentPackage, ButtonPackage, FragmentPackage
+    ]
+    assert scheduler.get_nowait() is None
+    assert scheduler.sent == [1, 1, 5]
+    assert scheduler.wait(CONTROL, (50,)) == {50: 10}
+
+    decoder = PackageFrameDecoder()
+    reassembler = FragmentReassembler()
+    received = [reassembler.receive(package) for package in decoder.feed(b"".join(
+        package.to_bytes() for package in sent
+    ))]
+
+    assert [package for package in received if package is not None][-1].payload == stl
+    assert reassembler.pending == 0
+
+
+def test_reassembler_rejects_invalid_fragments():
+    """Tests if fragments out of order or of oversized frames are rejected."""
+    reassembler = FragmentReassembler(max_size=100)
+
+    with pytest.raises(ValueError):
+        reassembler.receive(FragmentPackage(timestamp=1, message_id=1, total_size=101, fragment=b"x"))
+
+    assert reassembler.receive(FragmentPackage(timestamp=1, message_id=2, total_size=10, fragment=b"abc")) is None
+
+    with pytest.raises(ValueError):
+        reassembler.receive(FragmentPackage(timestamp=1, message_id=2, offset=4, total_size=10, fragment=b"d"))
+
+
+def test_reassembler_evicts_the_oldest_pending_package():
+    """Tests if the package that received no fragment for the longest time is dropped when too many are pending."""
+    reassembler = FragmentReassembler(max_messages=2)
+    data = ButtonPackage(timestamp=1, button_name="stop").to_bytes()
+
+    def fragment(message_id: int, offset: int, size: int) -> FragmentPackage:
+        """Returns the fragment of the button package at offset."""
+        return FragmentPackage(timestamp=1, message_id=message_id, offset=offset, total_size=len(data),
+                               fragment=data[offset:offset + size])
+
+    # Message 2 received no fragment for the longest time when message 3 starts
+    assert reassembler.receive(fragment(1, 0, 4)) is None
+    assert reassembler.receive(fragment(2, 0, 4)) is None
+    assert reassembler.receive(fragment(1, 4, 4)) is None
+    assert reassembler.receive(fragment(3, 0, 4)) is None
+
+    assert (reassembler.pending, reassembler.evicted) == (2, 1)
+
+    with pytest.raises(ValueError):
+        reassembler.receive(fragment(2, 4, 4))
+
+    assert reassembler.receive(fragment(1, 8, len(data))).button_name == "stop"
+
+
+def test_reassembler_memory_follows_received_fragments():
+    """Tests if forged sizes do not allocate and the pending bytes of all packages are bounded."""
+    reassembler = FragmentReassembler()
+    tracemalloc.start()
+
+    try:
+        for message_id in range(8):
+            reassembler.receive(FragmentPackage(timestamp=1, message_id=message_id, total_size=1 << 28, fragment=b"x"))
+
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert reassembler.pending == 8 and peak < 1 << 20
+
+    reassembler = FragmentReassembler(max_pending=10)
+    reassembler.receive(FragmentPackage(timestamp=1, message_id=1, total_size=10, fragment=b"abcdef"))
+    reassembler.receive(FragmentPackage(timestamp=1, message_id=2, total_size=10, fragment=b"abcdef"))
+
+    assert (reassembler.pending, reassembler.pending_bytes, reassembler.evicted) == (1, 6, 1)
+
+    with pytest.raises(ValueError):
+        reassembler.receive(FragmentPackage(timestamp=1, message_id=3, total_size=11, fragment=b"x"))
+
+
+def test_scheduler_fragments_only_for_negotiated_streams():
+    """Tests if send_to keeps large packages whole for peers without FRAGMENTS."""
+    async def run():
+        server = await PackageStream.start_server(echo, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server, await PackageStream.connect("127.0.0.1", port) as stream:
+            scheduler = SendScheduler(fragment_size=1024)
+            scheduler.put(STLPackage(timestamp=1, stl=bytes(4096)))
+            task = asyncio.create_task(scheduler.send_to(stream))
+
+            received = await stream.receive()
+            task.cancel()
+
+        return received
+
+    received = asyncio.run(run())
+
+    assert type(received) is STLPackage and received.payload == bytes(4096)
@@ -0,0 +1,55 @@
+from packages import (get_package, SlicerConfigDeltaPackage, SlicerConfigFilePackage, SlicerConfigReceiver,
+                      SlicerConfigSender, SlicerSettingBatchPackage)
+
+CONFIG = "; generated\n[printer]\nnozzle = 0.4\n\n[layer]\nheight = 0.2\n\n[infill]\ndensity = 20\n"
+
+
+def test_slicer_setting_batch_package_round_trip():
+    """Tests if many settings survive encoding in a single frame."""
+    settings = [("set", "layer_height", 0.2), ("set", "infill", "gyroïd"), ("get", "nozzle", "")]
+
+    package = get_package(SlicerSettingBatchPackage(timestamp=1, settings=settings).to_bytes())
+
+    assert type(package) is SlicerSettingBatchPackage
+    assert list(package) == [("set", "layer_height", "0.2"), ("set", "infill", "gyroïd"), ("get", "nozzle", "")]
+
+
+def test_slicer_config_sync_sends_changed_sections():
+    """Tests if only the changed, added and removed sections are sent after an acknowledgement."""
+    sender = SlicerConfigSender()
+    receiver = SlicerConfigReceiver()
+
+    full = sender.update(CONFIG)
+    assert type(full) is SlicerConfigFilePackage
+    assert sender.acknowledge(get_package(receiver.receive(get_package(full.to_bytes())).to_bytes())) is None
+
+    changed = CONFIG.replace("height = 0.2", "height = 0.1").replace("[infill]\ndensity = 20\n", "[skirt]\nloops = 2\n")
+    delta = get_package(sender.update(changed).to_bytes())
+
+    assert type(delta) is SlicerConfigDeltaPackage
+    assert delta.sections == {"layer": "[layer]\nheight = 0.1\n\n", "skirt": "[skirt]\nloops = 2\n", "infill": None}
+
+    assert sender.acknowledge(receiver.receive(delta)) is None
+    assert receiver.content == changed
+
+
+def test_slicer_config_sync_falls_back_to_full_file():
+    """Tests if the full file is sent when the receiver does not have the base version of a delta."""
+    sender = SlicerConfigSender()
+    receiver = SlicerConfigReceiver()
+
+    sender.acknowledge(receiver.receive(sender.update(CONFIG)))
+    # The copy of the receiver was edited locally and no longer matches the acknowledged version
+    receiver.content = CONFIG.replace("0.4", "0.6")
+
+    delta = sender.update(CONFIG.replace("20", "30"))
+    ack = receiver.receive(delta)
+
+    assert type(delta) is SlicerConfigDeltaPackage
+    assert ack.target_hash == 0
+
+    full = sender.acknowledge(ack)
+    receiver.receive(full)
+
+    assert type(full) is SlicerConfigFilePackage
+    assert receiver.content == CONFIG.replace("20", "30")
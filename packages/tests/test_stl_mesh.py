@@ -0,0 +1,69 @@
+from packages import STLPackage
+import pytest
+
+np = pytest.importorskip("numpy")
+stl_mesh = pytest.importorskip("packages.stl_mesh")
+
+# A closed tetrahedron with the corners at the origin and 10 mm on every axis
+CUBE_CORNER = [
+    ((0, 0, -1), (0, 0, 0), (0, 10, 0), (10, 0, 0)),
+    ((0, -1, 0), (0, 0, 0), (10, 0, 0), (0, 0, 10)),
+    ((-1, 0, 0), (0, 0, 0), (0, 0, 10), (0, 10, 0)),
+    ((0.577, 0.577, 0.577), (10, 0, 0), (0, 10, 0), (0, 0, 10)),
+]
+
+
+def ascii_stl() -> bytes:
+    """Returns the tetrahedron as an ASCII STL file."""
+    lines = ["solid corner"]
+    for normal, *vertices in CUBE_CORNER:
+        lines += ["facet normal {} {} {}".format(*normal), "outer loop"]
+        lines += ["vertex {} {} {}".format(*vertex) for vertex in vertices]
+        lines += ["endloop", "endfacet"]
+
+    return ("\n".join(lines) + "\nendsolid corner\n").encode("ascii")
+
+
+def test_stl_mesh_geometry():
+    """Tests the vectorized geometry queries on a converted ASCII STL."""
+    mesh = stl_mesh.STLMesh(ascii_stl())
+
+    minimum, maximum = mesh.bounding_box()
+
+    assert mesh.count == 4
+    assert minimum.tolist() == [0, 0, 0] and maximum.tolist() == [10, 10, 10]
+    assert mesh.volume() == pytest.approx(1000 / 6)
+    assert mesh.surface_area() == pytest.approx(150 + 50 * 3 ** 0.5)
+    assert mesh.within_reach(10) and not mesh.within_reach(9.9)
+    assert mesh.within_reach(15, base=(5, 5, 5))
+
+
+def test_stl_mesh_references_package_and_file(tmp_path):
+    """Tests if binary STL from a package or a file is viewed instead of parsed."""
+    binary = stl_mesh.ascii_to_binary(ascii_stl())
+    path = tmp_path / "corner.stl"
+    path.write_bytes(binary)
+
+    from_package = stl_mesh.STLMesh.from_package(STLPackage(stl=binary))
+    from_file = stl_mesh.STLMesh.from_file(path)
+
+    assert len(binary) == stl_mesh.HEADER_SIZE + 4 * 50
+    assert np.shares_memory(from_package.triangles, np.frombuffer(binary, dtype=np.uint8))
+    assert from_file.to_bytes() == binary
+    assert from_file.normals[0].tolist() == [0, 0, -1]
+
+
+def test_stl_mesh_parses_multiple_solids_and_upper_case():
+    """Tests if every solid of an ASCII STL file is converted, whatever the case of the keywords."""
+    solids = ascii_stl().replace(b"endfacet\nfacet", b"endfacet\nendsolid corner\nsolid second\nfacet", 1)
+    upper = ascii_stl().upper()
+
+    assert solids.count(b"endsolid") == 2
+    assert stl_mesh.ascii_to_binary(solids) == stl_mesh.ascii_to_binary(ascii_stl())
+    assert stl_mesh.STLMesh(upper).to_bytes() == stl_mesh.ascii_to_binary(ascii_stl())
+
+
+def test_stl_mesh_rejects_other_data():
+    """Tests if data that is no STL file is rejected."""
+    with pytest.raises(ValueError):
+        stl_mesh.STLMesh(b"not an stl file")
@@ -18,3 +18,23 @@ def test_stl_package_converts_to_bytes():
         0x00, 0x00, 0x00, 0x09,  # Stl length (9)
         0x2f, 0x64, 0x65, 0x76, 0x2f, 0x6e, 0x75, 0x6c, 0x6c  # Stl (/dev/null)
     ])
+
+
+def test_stl_package_payload_is_not_copied():
+    """Tests if the stl content of a decoded package references the received bytes."""
+    data = bytearray(STLPackage(1762330645, b"solid cube").to_bytes())
+    package = STLPackage().to_package(data)
+
+    data[-4:] = b"cone"
+
+    assert isinstance(package.stl, memoryview)
+    assert package.stl == b"solid cone"
+
+
+def test_stl_package_converts_to_buffers():
+    """Tests if the header and the stl content are returned as separate buffers."""
+    stl = bytearray(b"solid cube")
+    header, payload = STLPackage(1762330645, stl).to_buffers()
+
+    assert header + payload == STLPackage(1762330645, bytes(stl)).to_bytes()
+    assert payload.obj is stl
@@ -0,0 +1,53 @@
+import asyncio
+import os
+
+from packages import get_package, PackageStream, send_stl, STLOfferPackage, STLPackage, STLStore
+
+
+def test_stl_store_evicts_least_recently_used(tmp_path):
+    """Tests if the least recently used files are deleted once the store exceeds its size."""
+    store = STLStore(tmp_path, max_size=3000)
+
+    first = store.put(os.urandom(1000))
+    second = store.put(os.urandom(1000))
+    third = store.put(os.urandom(1000))
+
+    assert first in store
+    fourth = store.put(os.urandom(1000))
+
+    assert len(store) == 3
+    assert second not in store
+    assert not store.path(second).exists()
+
+    # The order survives a restart
+    store = STLStore(tmp_path, max_size=2000)
+    store.put(os.urandom(1000))
+
+    assert third not in store
+    assert first not in store and fourth in store
+
+
+def test_send_stl_sends_content_only_once(tmp_path):
+    """Tests if a STL file already in the store of the peer is only offered."""
+    stl = os.urandom(100000)
+    stored = []
+
+    async def receive(stream: PackageStream):
+        store = STLStore(tmp_path)
+
+        async for package in stream:
+            if isinstance(package, STLOfferPackage):
+                await stream.send(store.answer(package))
+            else:
+                stored.append(store.receive(package).read_bytes())
+
+    async def run():
+        server = await PackageStream.start_server(receive, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server, await PackageStream.connect("127.0.0.1", port) as stream:
+            return [await send_stl(stream, STLPackage(stl=stl)) for _ in range(2)]
+
+    assert asyncio.run(run()) == [True, False]
+    assert stored == [stl]
+    assert get_package(STLOfferPackage.from_package(STLPackage(stl=stl)).to_bytes()).size == 100000
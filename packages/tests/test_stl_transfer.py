@@ -0,0 +1,53 @@
+import os
+
+from packages import get_package, STLTransferReceiver, STLTransferSender
+
+
+def test_stl_transfer_resumes_after_interruption(tmp_path):
+    """Tests if an interrupted transfer continues from the acknowledged offset."""
+    path = tmp_path / "part.stl"
+    path.write_bytes(os.urandom(10000))
+
+    sender = STLTransferSender(path, transfer_id=7, chunk_size=4096)
+    receiver = STLTransferReceiver(tmp_path / "received")
+
+    # The connection drops after the first chunk was acknowledged
+    chunks = sender.chunks()
+    progress = sender.acknowledge(receiver.receive(get_package(next(chunks).to_bytes())))
+    next(chunks)
+    receiver.close()
+
+    assert progress.progress == 40.96
+
+    receiver = STLTransferReceiver(tmp_path / "received")
+    sender.acknowledge(get_package(receiver.resume(7).to_bytes()))
+
+    offsets = []
+    for chunk in sender.chunks():
+        offsets.append(chunk.offset)
+        progress = sender.acknowledge(receiver.receive(get_package(chunk.to_bytes())))
+
+    sender.close()
+
+    assert offsets == [4096, 8192]
+    assert progress.progress == 100.0
+    assert sender.done
+    assert receiver.path(7).read_bytes() == path.read_bytes()
+
+
+def test_stl_transfer_skips_duplicate_chunks(tmp_path):
+    """Tests if chunks that were already stored are not appended twice."""
+    path = tmp_path / "part.stl"
+    path.write_bytes(b"solid cube\nendsolid cube\n")
+
+    sender = STLTransferSender(path, chunk_size=8)
+    receiver = STLTransferReceiver(tmp_path / "received")
+
+    chunks = list(sender.chunks())
+    for chunk in chunks[:2] + chunks[:2] + chunks[2:]:
+        ack = receiver.receive(chunk)
+
+    sender.close()
+
+    assert ack.offset == sender.total_size
+    assert receiver.path(sender.transfer_id).read_bytes() == path.read_bytes()
@@ -0,0 +1,56 @@
+from packages import RollPackage, TemperaturePackage
+import pytest
+
+np = pytest.importorskip("numpy")
+telemetry = pytest.importorskip("packages.telemetry")
+
+
+def test_telemetry_ring_keeps_newest_packages():
+    """Tests if the ring buffer overwrites the oldest packages once full."""
+    store = telemetry.TelemetryStore(capacity=100)
+
+    for index in range(150):
+        store.add(TemperaturePackage(timestamp=1000 + index, temperature=index / 2))
+
+    records = store[TemperaturePackage].records()
+
+    assert len(store[TemperaturePackage]) == 100
+    assert records["timestamp"].tolist() == list(range(1050, 1150))
+    assert store[TemperaturePackage].query(1100, 1103)["temperature"].tolist() == [50.0, 50.5, 51.0]
+    assert store[TemperaturePackage].query(1098, 1102)["timestamp"].tolist() == [1098, 1099, 1100, 1101]
+    assert len(store[TemperaturePackage].query(0, 1000)) == 0
+
+
+def test_telemetry_store_accepts_frozen_packages():
+    """Tests if a frozen package is stored in the ring buffer of the type it wraps."""
+    store = telemetry.TelemetryStore(capacity=10)
+    store.add(TemperaturePackage(timestamp=1, temperature=21.5).freeze())
+
+    assert store[TemperaturePackage].records()["temperature"].tolist() == [21.5]
+
+
+def test_telemetry_ring_ingests_frames():
+    """Tests if raw frames wrap around the ring buffer like decoded packages."""
+    ring = telemetry.TelemetryRing(RollPackage, capacity=8)
+    ring.append(RollPackage(timestamp=1, degrees=1))
+
+    ring.extend_frames(b"".join(RollPackage(timestamp=index, degrees=index).to_bytes() for index in range(2, 12)))
+
+    assert ring.records()["degrees"].tolist() == list(range(4, 12))
+
+
+def test_telemetry_ring_downsamples():
+    """Tests if values are reduced to min, max and mean per bucket."""
+    ring = telemetry.TelemetryRing(TemperaturePackage, capacity=1000)
+    ring.extend_frames(b"".join(
+        TemperaturePackage(timestamp=index, temperature=index).to_bytes() for index in range(60)
+    ))
+
+    buckets = ring.downsample(0, 80, 4)
+
+    assert buckets["time"].tolist() == [0, 20, 40, 60]
+    assert buckets["count"].tolist() == [20, 20, 20, 0]
+    assert buckets["min"][:3].tolist() == [0, 20, 40]
+    assert buckets["max"][:3].tolist() == [19, 39, 59]
+    assert buckets["mean"][:3].tolist() == [9.5, 29.5, 49.5]
+    assert np.isnan(buckets["mean"][3]) and np.isnan(buckets["min"][3])
@@ -13,7 +13,7 @@ def test_temperature_package_converts_to_bytes():
     package = TemperaturePackage(1762330645, 43.8)
     assert package.to_bytes() == bytes([
         0x00, 0x00, 0x00, 0x11,  # Package Size
-        0x01,  # Identifier
+        0x02,  # Identifier
         0x69, 0x0B, 0x08, 0x15,  # Timestamp (1762330645)
         0x40, 0x45, 0xE6, 0x66, 0x66, 0x66, 0x66, 0x66  # Temperature (43.8)
     ])
@@ -24,7 +24,7 @@ def test_bytes_converts_to_temperature_package():
     to the object temperature package."""
     data = bytes([
         0x00, 0x00, 0x00, 0x11,  # Package Size
-        0x01,  # Identifier
+        0x02,  # Identifier
         0x69, 0x0B, 0x08, 0x15,  # Timestamp (1762330645)
         0x40, 0x45, 0xE6, 0x66, 0x66, 0x66, 0x66, 0x66  # Temperature (43.8)
     ])
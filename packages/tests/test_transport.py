@@ -0,0 +1,75 @@
+import socket
+import threading
+
+from packages import (ButtonPackage, ConfigPackage, PackageFrameDecoder, PackageWriter, RollPackage, send_package,
+                      STLPackage)
+
+
+def test_send_package_sends_large_payload():
+    """Tests if a payload larger than the socket buffers arrives intact."""
+    stl = bytes(range(256)) * 16384
+    sender, receiver = socket.socketpair()
+
+    with sender, receiver:
+        thread = threading.Thread(target=send_package, args=(sender, STLPackage(1762330645, stl)))
+        thread.start()
+
+        decoder = PackageFrameDecoder()
+        packages = []
+        while not packages:
+            packages += decoder.receive(receiver)
+
+        thread.join()
+
+    assert packages[0].stl == stl
+
+
+def test_pack_into_matches_to_bytes():
+    """Tests if packing into a buffer writes the same bytes as to_bytes at the hinted size."""
+    packages = [RollPackage(1762330645, -45), ButtonPackage(1762330645, "nötstop"), STLPackage(1762330645, b"solid"),
+                ConfigPackage(1762330645, "server", "port", 8000)]
+    buffer = bytearray(256)
+
+    for package in packages:
+        end = package.pack_into(buffer, 3)
+
+        assert package.size_hint() == len(package.to_bytes()) == end - 3
+        assert buffer[3:end] == package.to_bytes()
+
+
+def test_package_writer_reuses_buffer():
+    """Tests if batches of small packages and large ones by reference arrive as the frames of the packages."""
+    stl = bytes(range(256)) * 256
+    writer = PackageWriter(capacity=64, copy_limit=1024)
+    batches = [
+        [*(RollPackage(1762330645, degrees) for degrees in range(10)), STLPackage(1762330645, stl),
+         RollPackage(1762330645, 10)],
+        [RollPackage(1762330645, degrees) for degrees in range(11, 20)],
+    ]
+    sender, receiver = socket.socketpair()
+    received = b""
+
+    with sender, receiver:
+        for batch in batches:
+            expected = b"".join(package.to_bytes() for package in batch)
+            writer.add_many(batch)
+
+            assert len(writer) == len(expected)
+
+            thread = threading.Thread(target=writer.send, args=(sender,))
+            thread.start()
+
+            data = b""
+            while len(data) < len(expected):
+                data += receiver.recv(1 << 16)
+
+            thread.join()
+
+            assert data == expected
+            assert len(writer) == 0
+            received += data
+
+    packages = list(PackageFrameDecoder().feed(received))
+
+    assert [package.degrees for package in packages if type(package) is RollPackage] == list(range(20))
+    assert bytes(packages[10].stl) == stl
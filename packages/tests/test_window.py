@@ -0,0 +1,113 @@
+import asyncio
+
+from packages import (
+    get_package, PackageStream, send_windowed, SequencedConfirmationPackage, SlicerSettingPackage, WindowReceiver,
+    WindowSender
+)
+from packages.codec import CAPABILITIES
+import pytest
+
+
+def test_window_sender_matches_out_of_order_and_cumulative_confirmations():
+    """Tests if the sender keeps its window full and removes confirmed requests in any order."""
+    sender = WindowSender(window=3, timeout=1.0, clock=lambda: 0.0)
+    for value in range(5):
+        sender.submit(SlicerSettingPackage(timestamp=1, action="set", key="layer_height", value=value))
+
+    assert [traced.sequence for traced in sender.ready()] == [0, 1, 2]
+
+    assert [package.value for package in sender.acknowledge(SequencedConfirmationPackage(sequence=2))] == ["2"]
+    assert [traced.sequence for traced in sender.ready()] == [3]
+
+    confirmed = sender.acknowledge(SequencedConfirmationPackage(sequence=3, cumulative=4))
+    assert [package.value for package in confirmed] == ["0", "1", "3"]
+    assert [traced.sequence for traced in sender.ready()] == [4]
+    assert not sender.done
+
+
+def test_window_sender_retransmits_expired_requests():
+    """Tests if requests without confirmation are sent again with the same sequence number."""
+    now = [0.0]
+    sender = WindowSender(window=2, timeout=1.0, clock=lambda: now[0])
+    sender.submit(SlicerSettingPackage(timestamp=1, action="set", key="infill", value=20))
+
+    assert [traced.sequence for traced in sender.ready()] == [0]
+    assert sender.ready() == [] and sender.next_timeout() == 1.0
+
+    now[0] = 1.5
+    assert [traced.sequence for traced in sender.ready()] == [0]
+    assert sender.retransmits == 1
+
+
+def test_window_receiver_confirms_duplicates_without_applying_them():
+    """Tests if the receiver confirms cumulatively and reports a request only once."""
+    sender = WindowSender(window=3)
+    receiver = WindowReceiver()
+    for value in range(3):
+        sender.submit(SlicerSettingPackage(timestamp=1, action="set", key="infill", value=value))
+
+    first, second, third = sender.ready()
+
+    assert receiver.receive(third)[1].cumulative == 0
+    assert receiver.receive(first)[1].cumulative == 1
+    package, confirmation = receiver.receive(second)
+    assert package.value == "1" and confirmation.cumulative == 3
+    assert receiver.receive(first)[0] is None
+
+
+def test_send_windowed_over_stream():
+    """Tests if a bulk change over a stream is applied once and in full."""
+    applied = []
+
+    async def apply(stream: PackageStream):
+        receiver = WindowReceiver()
+
+        async for traced in stream:
+            package, confirmation = receiver.receive(traced)
+            if package is not None:
+                applied.append(package.value)
+
+            await stream.send(confirmation)
+
+    async def run():
+        server = await PackageStream.start_server(apply, "127.0.0.1", 0, capabilities=CAPABILITIES)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server, await PackageStream.connect("127.0.0.1", port, capabilities=CAPABILITIES) as stream:
+            settings = [SlicerSettingPackage(action="set", key=f"key_{index}", value=index) for index in range(100)]
+
+            return await send_windowed(stream, settings, window=16)
+
+    sender = asyncio.run(run())
+
+    assert sender.done and sender.sequence == 100
+    assert applied == [str(index) for index in range(100)]
+
+
+def test_send_windowed_requires_negotiated_tracing():
+    """Tests if requests are not sent as traced frames to a peer that did not negotiate them."""
+    async def drain(stream: PackageStream):
+        async for _ in stream:
+            pass
+
+    async def run():
+        server = await PackageStream.start_server(drain, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async with server, await PackageStream.connect("127.0.0.1", port) as stream:
+            with pytest.raises(ValueError):
+                await send_windowed(stream, [SlicerSettingPackage(action="set", key="infill", value=20)])
+
+    asyncio.run(run())
+
+    with pytest.raises(ValueError):
+        WindowReceiver().receive(SlicerSettingPackage(action="set", key="infill", value=20))
+
+
+def test_sequenced_confirmation_round_trip():
+    """Tests if a sequenced confirmation survives encoding."""
+    package = get_package(SequencedConfirmationPackage(
+        timestamp=1, confirmed_request_id=0x0A, confirmed_request_timestamp=2, sequence=2 ** 40, cumulative=7
+    ).to_bytes())
+
+    assert (package.confirmed_request_id, package.sequence, package.cumulative) == (0x0A, 2 ** 40, 7)
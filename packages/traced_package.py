@@ -0,0 +1,71 @@
+import time
+from typing import Callable
+
+from .package import Package
+from .registry import get_package, register_package
+
+
+# Format: ! (Network), I (Size), B (ID), Q (Send time in ns), Q (Sequence), followed by the wrapped frame
+@register_package
+class TracedPackage(Package, identifier=0x14, struct_format="!IBQQ"):
+    """An optional header extension that wraps a package with a high-resolution send time.
+
+    The wrapped frame is sent unchanged after the extension, so peers that use tracing
+    unwrap it and get the original package. Only send it to peers that know it.
+    """
+
+    __slots__ = ("package", "send_ns", "sequence")
+
+    def __init__(self, package: Package, sequence: int = 0, send_ns: int | None = None):
+        """Creates a traced package.
+
+        :param package: The wrapped package.
+        :param sequence: The sequence number of the package on its connection.
+        :param send_ns: The send time in nanoseconds since the epoch, defaults to now.
+        """
+        self.send_ns = time.time_ns() if send_ns is None else send_ns
+
+        super().__init__(self.send_ns / 1e9)
+
+        self.package = package
+        self.sequence = sequence
+
+    def to_buffers(self) -> list[bytes | memoryview]:
+        """Converts the current package to the extension header and the buffers of the wrapped package."""
+        buffers = self.package.to_buffers()
+
+        return [
+            self._header.pack(
+                self._header.size + sum(memoryview(buffer).nbytes for buffer in buffers),
+                self.identifier,
+                self.send_ns,
+                self.sequence
+            ),
+            *buffers
+        ]
+
+    def to_bytes(self) -> bytes:
+        """Converts the current package to a bytes object."""
+        return b"".join(self.to_buffers())
+
+    @classmethod
+    def to_package(cls, data: bytes, decoder: Callable[[memoryview], Package] = get_package):
+        """Convert a bytes object into a TracedPackage.
+
+        :param data: The data package
+        :param decoder: The function that converts the wrapped frame into a package, defaults to get_package.
+        :return: The bytes object as a TracedPackage
+        """
+        identifier = data[4]
+
+        # Check if identifier matches this package
+        if identifier != cls.identifier:
+            raise ValueError(f"Package identifier for {__name__} "
+                             f"must be {cls.identifier}. Found {identifier}")
+
+        package = cls._header.unpack_from(data)
+
+        # Decode the wrapped frame in place, variable-length payloads reference data
+        wrapped = decoder(memoryview(data)[cls._header.size:package[0]])
+
+        return TracedPackage(package=wrapped, sequence=package[3], send_ns=package[2])
@@ -0,0 +1,136 @@
+import socket
+from typing import Iterable
+
+from .package import Package
+
+# The number of buffers a single sendmsg call accepts on common platforms
+IOV_MAX = 1024
+
+
+def send_buffers(sock: socket.socket, buffers: Iterable[bytes | memoryview]):
+    """Sends a list of buffers as one contiguous stream with scatter writes.
+
+    Partial writes continue from the first unsent byte, so no buffer is ever joined or copied.
+
+    :param sock: A connected stream socket.
+    :param buffers: The buffers to send in order.
+    """
+    views = [view for view in (memoryview(buffer).cast("B") for buffer in buffers) if view.nbytes]
+
+    if not hasattr(sock, "sendmsg"):
+        for view in views:
+            sock.sendall(view)
+        return
+
+    index = 0
+    while index < len(views):
+        sent = sock.sendmsg(views[index:index + IOV_MAX])
+
+        # Skip the buffers that were sent completely and trim the one that was sent partially
+        while index < len(views) and sent >= views[index].nbytes:
+            sent -= views[index].nbytes
+            index += 1
+
+        if sent:
+            views[index] = views[index][sent:]
+
+
+def send_package(sock: socket.socket, package: Package):
+    """Sends a package without copying its payload.
+
+    :param sock: A connected stream socket.
+    :param package: The package to send.
+    """
+    send_buffers(sock, package.to_buffers())
+
+
+class PackageWriter:
+    """Packs many packages into one reusable buffer, so steady-state sending does not allocate frames.
+
+    Packages are packed back to back into a bytearray that is kept between batches and only
+    grows when a batch does not fit. Packages larger than copy_limit are not copied, their
+    buffers are referenced instead, so buffers() interleaves views of the bytearray with them.
+    """
+
+    def __init__(self, capacity: int = 1 << 16, copy_limit: int = 1 << 14):
+        """Creates an empty writer.
+
+        :param capacity: The initial size of the buffer in bytes.
+        :param copy_limit: The size above which a package is referenced instead of copied.
+        """
+        self.copy_limit = copy_limit
+
+        self._buffer = bytearray(capacity)
+        self._end = 0
+
+        # The buffers of large packages and the position in the buffer they belong to
+        self._external: list[tuple[int, list[bytes | memoryview]]] = []
+
+    def __len__(self) -> int:
+        """The number of bytes in the batch."""
+        return self._end + sum(memoryview(data).nbytes for _, buffers in self._external for data in buffers)
+
+    def add(self, package: Package):
+        """Appends a package to the batch."""
+        self.add_many((package,))
+
+    def add_many(self, packages: Iterable[Package]):
+        """Appends many packages to the batch."""
+        buffer = self._buffer
+        capacity = len(buffer)
+        copy_limit = self.copy_limit
+        end = self._end
+
+        for package in packages:
+            size = package.size_hint()
+
+            if size > copy_limit:
+                self._external.append((end, package.to_buffers()))
+                continue
+
+            if end + size > capacity:
+                buffer.extend(bytes(max(size, capacity)))
+                capacity = len(buffer)
+
+            end = package.pack_into(buffer, end)
+
+        self._end = end
+
+    def buffers(self) -> list[memoryview]:
+        """Returns the batch as buffers for socket.sendmsg or a transport.
+
+        The views refer to the buffer of the writer, release them before the writer is cleared.
+        """
+        view = memoryview(self._buffer)
+        views = []
+        start = 0
+
+        for offset, buffers in self._external:
+            if offset > start:
+                views.append(view[start:offset])
+                start = offset
+
+            views += (memoryview(data).cast("B") for data in buffers)
+
+        if self._end > start:
+            views.append(view[start:self._end])
+
+        return views
+
+    def clear(self):
+        """Empties the batch and keeps the buffer for the next one."""
+        self._end = 0
+        self._external.clear()
+
+    def detach(self):
+        """Empties the batch and replaces the buffer, for when something still refers to the old one."""
+        self._buffer = bytearray(len(self._buffer))
+        self.clear()
+
+    def send(self, sock: socket.socket):
+        """Sends the batch with scatter writes and empties it.
+
+        :param sock: A connected stream socket.
+        """
+        send_buffers(sock, self.buffers())
+        self.clear()
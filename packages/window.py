@@ -0,0 +1,193 @@
+import asyncio
+import collections
+import time
+from typing import Callable, Deque, Iterable
+
+from .codec import TRACING
+from .package import Package
+from .package_stream import PackageStream
+from .sequenced_confirmation_package import SequencedConfirmationPackage
+from .traced_package import TracedPackage
+
+
+class WindowSender:
+    """Keeps up to a window of numbered requests in flight until they are confirmed.
+
+    Every request is sent as a TracedPackage with the next sequence number. Confirmations
+    may arrive in any order, and each one also confirms every request below its cumulative
+    sequence number. Requests that are not confirmed in time are sent again with the same
+    sequence number. The sender does no I/O itself, see send_windowed for a stream.
+    """
+
+    def __init__(self, window: int = 32, timeout: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        """Creates a sender.
+
+        :param window: The maximum number of unconfirmed requests.
+        :param timeout: The number of seconds after which an unconfirmed request is sent again.
+        :param clock: A monotonic clock in seconds.
+        """
+        self.window = window
+        self.timeout = timeout
+        self.clock = clock
+        self.sequence = 0
+        self.retransmits = 0
+
+        self._queue: Deque[Package] = collections.deque()
+        self._in_flight: dict[int, tuple[Package, float]] = {}
+
+    @property
+    def done(self) -> bool:
+        """Whether every submitted request was confirmed."""
+        return not self._queue and not self._in_flight
+
+    @property
+    def in_flight(self) -> int:
+        """The number of sent requests that are not confirmed yet."""
+        return len(self._in_flight)
+
+    def submit(self, package: Package):
+        """Queues a request, it is sent by ready once the window has room."""
+        self._queue.append(package)
+
+    def ready(self) -> list[TracedPackage]:
+        """Returns the requests to send now, new ones while the window has room and expired ones again.
+
+        :return: The numbered requests in the order they should be sent.
+        """
+        now = self.clock()
+        deadline = now + self.timeout
+        outgoing = []
+
+        for sequence, (package, expires) in self._in_flight.items():
+            if expires <= now:
+                self._in_flight[sequence] = (package, deadline)
+                self.retransmits += 1
+                outgoing.append(TracedPackage(package, sequence=sequence))
+
+        while self._queue and len(self._in_flight) < self.window:
+            package = self._queue.popleft()
+            self._in_flight[self.sequence] = (package, deadline)
+            outgoing.append(TracedPackage(package, sequence=self.sequence))
+            self.sequence += 1
+
+        return outgoing
+
+    def acknowledge(self, confirmation: SequencedConfirmationPackage) -> list[Package]:
+        """Removes the requests a confirmation covers from the window.
+
+        :param confirmation: The received confirmation.
+        :return: The requests that were confirmed for the first time.
+        """
+        confirmed = []
+
+        # Sequence numbers are inserted in ascending order, so the oldest requests come first
+        for sequence in list(self._in_flight):
+            if sequence >= confirmation.cumulative:
+                break
+
+            confirmed.append(self._in_flight.pop(sequence)[0])
+
+        if confirmation.sequence in self._in_flight:
+            confirmed.append(self._in_flight.pop(confirmation.sequence)[0])
+
+        return confirmed
+
+    def next_timeout(self) -> float | None:
+        """The number of seconds until the next request expires, None when nothing is in flight."""
+        if not self._in_flight:
+            return None
+
+        return max(min(expires for _, expires in self._in_flight.values()) - self.clock(), 0.0)
+
+
+class WindowReceiver:
+    """Confirms numbered requests and recognizes the ones that were sent again."""
+
+    def __init__(self):
+        """Creates a receiver that expects the first sequence number."""
+        self.cumulative = 0
+
+        self._received: set[int] = set()
+
+    def receive(self, traced: TracedPackage) -> tuple[Package | None, SequencedConfirmationPackage]:
+        """Registers a numbered request and returns it with its confirmation.
+
+        :param traced: The received request, from a stream without a tracker, which would unwrap it.
+        :return: The request, or None when it was already received, and the confirmation to send back.
+        :raises ValueError: When the package is not a numbered request.
+        """
+        if not isinstance(traced, TracedPackage):
+            raise ValueError(f"Expected a numbered request, received {type(traced).__name__}. "
+                             f"The receiving stream must not have a tracker")
+
+        sequence = traced.sequence
+        package = traced.package
+        duplicate = sequence < self.cumulative or sequence in self._received
+
+        if not duplicate:
+            self._received.add(sequence)
+
+            # Only sequence numbers after a gap are kept, the rest is covered by the cumulative one
+            while self.cumulative in self._received:
+                self._received.remove(self.cumulative)
+                self.cumulative += 1
+
+        confirmation = SequencedConfirmationPackage(
+            confirmed_request_id=package.identifier,
+            confirmed_request_timestamp=int(package.timestamp),
+            sequence=sequence,
+            cumulative=self.cumulative
+        )
+
+        return None if duplicate else package, confirmation
+
+
+async def send_windowed(
+        stream: PackageStream,
+        packages: Iterable[Package],
+        window: int = 32,
+        timeout: float = 1.0,
+        on_package: Callable[[Package], None] | None = None
+) -> WindowSender:
+    """Sends requests over a stream with a sliding window and waits until all are confirmed.
+
+    The peer answers every request with a SequencedConfirmationPackage, for example from a
+    WindowReceiver, so a bulk change takes about one round trip instead of one per request.
+    Requests are numbered with TracedPackages, so the handshake of the stream must have
+    negotiated TRACING.
+
+    :param stream: The stream to the peer, it must not have a tracker, which would trace the requests again.
+    :param packages: The requests to send.
+    :param window: The maximum number of unconfirmed requests.
+    :param timeout: The number of seconds after which an unconfirmed request is sent again.
+    :param on_package: Called with every other package received while waiting.
+    :return: The sender, for its statistics.
+    :raises ValueError: When the stream did not negotiate TRACING or has a tracker.
+    """
+    if not stream.codec.supports(TRACING):
+        raise ValueError("Windowed requests are numbered with TracedPackages, but the stream did not negotiate TRACING")
+
+    if stream.tracker is not None:
+        raise ValueError("Windowed requests are traced by send_windowed, the stream must not have a tracker")
+
+    sender = WindowSender(window, timeout)
+
+    for package in packages:
+        sender.submit(package)
+
+    while not sender.done:
+        outgoing = sender.ready()
+        if outgoing:
+            await stream.send_many(outgoing)
+
+        try:
+            package = await asyncio.wait_for(stream.receive(), sender.next_timeout())
+        except asyncio.TimeoutError:
+            continue
+
+        if isinstance(package, SequencedConfirmationPackage):
+            sender.acknowledge(package)
+        elif on_package is not None:
+            on_package(package)
+
+    return sender